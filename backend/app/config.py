@@ -5,3 +5,101 @@ load_dotenv()
 
 PROJECT_NAME = os.getenv("PROJECT_NAME", "SkillRoute")
 ENV = os.getenv("ENV", "development")
+LOG_LEVEL = os.getenv("LOG_LEVEL", "INFO")
+# Build clients and load lookup data in the lifespan hook; when false they
+# are built on first use, which boots faster but slows the first requests
+STARTUP_WARMUP = os.getenv("STARTUP_WARMUP", "true").lower() == "true"
+
+GROQ_API_KEY = os.getenv("GROQ_API_KEY")
+GROQ_BASE_URL = os.getenv("GROQ_BASE_URL")
+LLM_MAX_CONCURRENCY = int(os.getenv("LLM_MAX_CONCURRENCY", "8"))
+LLM_TIMEOUT_SECONDS = float(os.getenv("LLM_TIMEOUT_SECONDS", "120"))
+LLM_BACKOFF_BASE_SECONDS = float(os.getenv("LLM_BACKOFF_BASE_SECONDS", "1"))
+LLM_BACKOFF_MAX_SECONDS = float(os.getenv("LLM_BACKOFF_MAX_SECONDS", "10"))
+# Calls waiting for a concurrency slot beyond this are rejected (0: unbounded)
+LLM_MAX_QUEUE_DEPTH = int(os.getenv("LLM_MAX_QUEUE_DEPTH", "32"))
+# Circuit breaker over the last LLM_BREAKER_WINDOW calls
+LLM_BREAKER_WINDOW = int(os.getenv("LLM_BREAKER_WINDOW", "20"))
+LLM_BREAKER_MIN_CALLS = int(os.getenv("LLM_BREAKER_MIN_CALLS", "5"))
+LLM_BREAKER_FAILURE_RATE = float(os.getenv("LLM_BREAKER_FAILURE_RATE", "0.5"))
+LLM_BREAKER_SLOW_CALL_SECONDS = float(os.getenv("LLM_BREAKER_SLOW_CALL_SECONDS", "60"))
+LLM_BREAKER_SLOW_CALL_RATE = float(os.getenv("LLM_BREAKER_SLOW_CALL_RATE", "0.8"))
+LLM_BREAKER_OPEN_SECONDS = float(os.getenv("LLM_BREAKER_OPEN_SECONDS", "30"))
+
+# "delta" sends completed phases as a summary and regenerates only the rest;
+# "full" sends and regenerates the whole roadmap.
+ADAPT_MODE = os.getenv("ADAPT_MODE", "delta")
+
+# Completion budget for re-asking the model for one malformed roadmap section
+ROADMAP_REPAIR_MAX_TOKENS = int(os.getenv("ROADMAP_REPAIR_MAX_TOKENS", "2000"))
+
+# Catalog careers with a template get a small LLM patch instead of a full roadmap
+ROADMAP_TEMPLATES_ENABLED = os.getenv("ROADMAP_TEMPLATES_ENABLED", "true").lower() == "true"
+ROADMAP_TEMPLATE_DIR = os.getenv(
+    "ROADMAP_TEMPLATE_DIR",
+    os.path.join(os.path.dirname(__file__), "data", "roadmap_templates")
+)
+# Minimum catalog ranking score (0-100) for a career's template to be offered
+ROADMAP_TEMPLATE_MIN_SCORE = float(os.getenv("ROADMAP_TEMPLATE_MIN_SCORE", "15"))
+
+ROADMAP_CACHE_SIZE = int(os.getenv("ROADMAP_CACHE_SIZE", "512"))
+ROADMAP_CACHE_TTL_SECONDS = float(os.getenv("ROADMAP_CACHE_TTL_SECONDS", "86400"))
+
+TOKEN_CACHE_SIZE = int(os.getenv("TOKEN_CACHE_SIZE", "10000"))
+TOKEN_CACHE_MAX_TTL_SECONDS = float(os.getenv("TOKEN_CACHE_MAX_TTL_SECONDS", "3600"))
+
+ACTIVE_ROADMAP_CACHE_SIZE = int(os.getenv("ACTIVE_ROADMAP_CACHE_SIZE", "1000"))
+ACTIVE_ROADMAP_CACHE_TTL_SECONDS = float(os.getenv("ACTIVE_ROADMAP_CACHE_TTL_SECONDS", "300"))
+# "local" invalidates on this worker's writes only; "snapshot" also listens to
+# Firestore so writes from other workers evict the cached copy.
+ACTIVE_ROADMAP_CACHE_MODE = os.getenv("ACTIVE_ROADMAP_CACHE_MODE", "local")
+
+SKILL_TAXONOMY_PATH = os.getenv(
+    "SKILL_TAXONOMY_PATH",
+    os.path.join(os.path.dirname(__file__), "data", "skill_taxonomy.json")
+)
+CAREER_CATALOG_PATH = os.getenv(
+    "CAREER_CATALOG_PATH",
+    os.path.join(os.path.dirname(__file__), "data", "career_catalog.json")
+)
+INDUSTRY_DEMAND_PATH = os.getenv(
+    "INDUSTRY_DEMAND_PATH",
+    os.path.join(os.path.dirname(__file__), "data", "industry_demand.json")
+)
+# Built by `python -m app.services.career_catalog`
+CAREER_INDEX_PATH = os.getenv(
+    "CAREER_INDEX_PATH",
+    os.path.join(os.path.dirname(__file__), "data", "career_index.npy")
+)
+
+# firestore | sqlite | memory
+STORAGE_BACKEND = os.getenv("STORAGE_BACKEND", "firestore")
+SQLITE_PATH = os.getenv("SQLITE_PATH", "skillroute.db")
+
+# Background roadmap jobs (backend: memory | sqlite)
+JOB_QUEUE_BACKEND = os.getenv("JOB_QUEUE_BACKEND", "memory")
+JOB_QUEUE_MAX_SIZE = int(os.getenv("JOB_QUEUE_MAX_SIZE", "100"))
+JOB_WORKERS = int(os.getenv("JOB_WORKERS", "4"))
+JOB_RESULT_TTL_SECONDS = float(os.getenv("JOB_RESULT_TTL_SECONDS", "3600"))
+# A process owns its unfinished SQLite jobs for this long after its last
+# heartbeat; then another process may take them over
+JOB_LEASE_SECONDS = float(os.getenv("JOB_LEASE_SECONDS", "60"))
+
+# Per-user token bucket on LLM-backed endpoints (0 per minute disables it).
+# "sqlite" shares buckets between workers through SQLITE_PATH.
+RATE_LIMIT_BACKEND = os.getenv("RATE_LIMIT_BACKEND", "memory")
+RATE_LIMIT_PER_MINUTE = float(os.getenv("RATE_LIMIT_PER_MINUTE", "6"))
+RATE_LIMIT_BURST = float(os.getenv("RATE_LIMIT_BURST", "5"))
+RATE_LIMIT_MAX_KEYS = int(os.getenv("RATE_LIMIT_MAX_KEYS", "100000"))
+
+# Admins are users with an `admin: true` custom claim or listed here
+ADMIN_UIDS = {uid.strip() for uid in os.getenv("ADMIN_UIDS", "").split(",") if uid.strip()}
+
+# Bulk cohort generation. Workers default to the LLM concurrency allowance.
+COHORT_WORKERS = int(os.getenv("COHORT_WORKERS", str(LLM_MAX_CONCURRENCY)))
+COHORT_MAX_STUDENTS = int(os.getenv("COHORT_MAX_STUDENTS", "2000"))
+# Results are persisted in batches of up to this many students
+COHORT_BATCH_SIZE = int(os.getenv("COHORT_BATCH_SIZE", "50"))
+COHORT_FLUSH_SECONDS = float(os.getenv("COHORT_FLUSH_SECONDS", "2"))
+# Distinct profiles whose roadmap is kept for reuse within a cohort
+COHORT_DEDUPE_WINDOW = int(os.getenv("COHORT_DEDUPE_WINDOW", "256"))
@@ -1,14 +1,57 @@
+from app.utils import startup
+from contextlib import asynccontextmanager
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
-from app.config import PROJECT_NAME, ENV
+from fastapi.responses import PlainTextResponse
+from app.config import PROJECT_NAME, ENV, STARTUP_WARMUP
+from app.routes.admin import router as admin_router
 from app.routes.career import router as career_router
 from app.routes.students import router as students_router
 from app.routes.progress import router as progress_router
+from app.services import job_queue, llm_gateway, roadmap_cache, roadmap_service
+from app.services.career_catalog import get_career_index
+from app.services.industry_demand import get_demand_index
+from app.services.roadmap_templates import get_templates
+from app.services.skill_taxonomy import get_taxonomy
+from app.services.storage_backends import get_async_backend
+from app.services.storage_service import get_active_roadmap_cache_stats
+from app.utils.auth import get_token_cache_stats
+from app.utils.firebase import get_firebase_app
+from app.utils.log import setup_logging, stop_logging
+from app.utils import rate_limit
+from app.utils.metrics import CallbackMetric, MetricsMiddleware, render_prometheus
+from app.utils.responses import ORJSONResponse
+
+setup_logging()
+startup.mark_imported()
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    setup_logging()
+    if STARTUP_WARMUP:
+        # Build clients and load lookup data before the first request rather
+        # than during it
+        startup.warm("skill_taxonomy", get_taxonomy)
+        startup.warm("career_index", get_career_index)
+        startup.warm("industry_demand", get_demand_index)
+        startup.warm("roadmap_templates", get_templates)
+        startup.warm("llm_client", llm_gateway.get_client)
+        startup.warm("storage_backend", get_async_backend)
+        startup.warm("firebase_app", get_firebase_app)
+    await job_queue.start()
+    startup.mark_ready()
+    yield
+    await job_queue.stop()
+    stop_logging()
+
 
 app = FastAPI(
     title=PROJECT_NAME,
     description="SkillRoute – AI-powered career path & learning roadmap agent",
-    version="1.0.0"
+    version="1.0.0",
+    default_response_class=ORJSONResponse,
+    lifespan=lifespan
 )
 
 origins = [
@@ -28,9 +71,34 @@ app.add_middleware(
     max_age=3600,
 )
 
+app.add_middleware(MetricsMiddleware)
+
 app.include_router(career_router)
 app.include_router(students_router)
 app.include_router(progress_router)
+app.include_router(admin_router)
+
+CACHE_STATS = {
+    "roadmap": roadmap_cache.get_stats,
+    "token": get_token_cache_stats,
+    "active_roadmap": get_active_roadmap_cache_stats,
+}
+
+CallbackMetric(
+    "skillroute_cache_hits_total", "Cache hits",
+    lambda: {(name,): stats()["hits"] for name, stats in CACHE_STATS.items()},
+    labelnames=("cache",), kind="counter"
+)
+CallbackMetric(
+    "skillroute_cache_misses_total", "Cache misses",
+    lambda: {(name,): stats()["misses"] for name, stats in CACHE_STATS.items()},
+    labelnames=("cache",), kind="counter"
+)
+CallbackMetric(
+    "skillroute_cache_size", "Entries currently cached",
+    lambda: {(name,): stats()["size"] for name, stats in CACHE_STATS.items()},
+    labelnames=("cache",)
+)
 
 @app.get("/")
 def root():
@@ -42,5 +110,18 @@ def root():
 
 @app.get("/health")
 def health():
-    return {"status": "healthy"}
+    return {
+        "status": "healthy",
+        "llm": llm_gateway.get_stats(),
+        "roadmap_cache": roadmap_cache.get_stats(),
+        "token_cache": get_token_cache_stats(),
+        "active_roadmap_cache": get_active_roadmap_cache_stats(),
+        "jobs": job_queue.get_stats(),
+        "single_flight": roadmap_service.get_stats(),
+        "rate_limit": rate_limit.get_stats(),
+        "startup": startup.report()
+    }
 
+@app.get("/metrics", response_class=PlainTextResponse)
+def metrics():
+    return PlainTextResponse(render_prometheus(), media_type="text/plain; version=0.0.4")
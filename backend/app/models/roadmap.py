@@ -0,0 +1,54 @@
+from pydantic import BaseModel, Field
+from typing import List, Union
+
+# Schema of the roadmap agent's output (see SYSTEM_PROMPT in roadmap_agent).
+# Enum-like fields stay plain strings, so "Trending" vs "trending" doesn't
+# cost a repair call; numbers may come back quoted and are coerced.
+
+
+class Alternative(BaseModel):
+    career: str
+    match_score: float = Field(0, ge=0, le=100)
+    reason: str = ""
+
+
+class CareerDecision(BaseModel):
+    career: str
+    reasoning: str
+    confidence: float = Field(..., ge=0, le=100)
+    skill_match_percentage: float = Field(0, ge=0, le=100)
+    market_readiness: float = Field(0, ge=0, le=100)
+    industry_demand: str = "stable"
+    key_strengths: List[str] = []
+    skill_gaps: List[str] = []
+    time_to_job_ready: Union[str, float] = ""
+    alternatives: List[Alternative] = []
+
+
+class Resource(BaseModel):
+    type: str = ""
+    title: str
+    url: str = ""
+    duration: Union[str, float] = ""
+
+
+class Milestone(BaseModel):
+    name: str
+    description: str = ""
+    estimated_hours: float = Field(0, ge=0)
+    resources: List[Resource] = []
+
+
+class Phase(BaseModel):
+    phase: str
+    duration: Union[str, float]
+    difficulty: str = "beginner"
+    focus_skills: List[str] = []
+    outcomes: List[str] = []
+    milestones: List[Milestone] = []
+    prerequisites: List[str] = []
+
+
+class LearningRoadmap(BaseModel):
+    duration_months: float = Field(..., gt=0)
+    roadmap: List[Phase]
@@ -11,6 +11,11 @@ class StudentProfile(BaseModel):
     experience: Optional[str] = Field(None, example="2 years as Junior Developer")
 
 
+class CohortStudent(BaseModel):
+    user_id: str = Field(..., example="firebase-uid-123")
+    profile: StudentProfile
+
+
 class CareerAnalysisProfile(BaseModel):
     interests: List[str] = Field(
         ..., example=["backend", "problem-solving"]
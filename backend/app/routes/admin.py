@@ -0,0 +1,38 @@
+from fastapi import APIRouter, HTTPException, Depends, Request
+from fastapi.responses import StreamingResponse
+from app.services.cohort_service import CohortTooLarge, generate_cohort, parse_cohort
+from app.utils.auth import verify_admin_token
+from app.utils.responses import dumps
+
+router = APIRouter(
+    prefix="/api/admin",
+    tags=["Admin"]
+)
+
+
+async def _ndjson(events):
+    async for event in events:
+        yield dumps(event) + b"\n"
+
+
+@router.post("/cohorts/roadmaps")
+async def generate_cohort_roadmaps(request: Request, admin_id: str = Depends(verify_admin_token)):
+    """
+    Generates and saves roadmaps for a cohort. The body is a JSON list of
+    {"user_id", "profile"} objects (or {"students": [...]}), or the same
+    objects as NDJSON with Content-Type application/x-ndjson. Progress and
+    per-student results stream back as NDJSON.
+    """
+    body = await request.body()
+    try:
+        entries = parse_cohort(body, request.headers.get("content-type", ""))
+    except CohortTooLarge as e:
+        raise HTTPException(status_code=413, detail=str(e))
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+    return StreamingResponse(
+        _ndjson(generate_cohort(entries)),
+        media_type="application/x-ndjson",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+    )
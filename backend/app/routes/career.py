@@ -1,10 +1,17 @@
-from fastapi import APIRouter, HTTPException, Depends
-from fastapi.concurrency import run_in_threadpool
+import math
+import time
+from fastapi import APIRouter, HTTPException, Depends, WebSocket, WebSocketDisconnect
+from fastapi.responses import StreamingResponse
 from app.models.student import StudentProfile
-from app.services.roadmap_agent import generate_roadmap
-from app.services.storage_service import save_career_analysis, get_active_roadmap
-from app.services.matching_service import generate_career_insights, calculate_skill_match
-from app.utils.auth import verify_firebase_token
+from app.services.roadmap_agent import stream_roadmap
+from app.services.roadmap_service import generate_and_save_roadmap
+from app.services.storage_service import save_career_analysis, get_active_roadmap, get_student_profile, delete_active_roadmap
+from app.services.matching_service import generate_career_insights, calculate_skill_match, catalog_alternatives
+from app.services.job_queue import QueueFullError, enqueue_roadmap_job, get_job, public_job, wait_for_update
+from app.utils.auth import verify_firebase_token, verify_id_token_cached
+from app.utils.circuit_breaker import CircuitOpenError, llm_unavailable
+from app.utils.rate_limit import llm_rate_limit
+from app.utils.responses import ORJSONResponse, dumps
 
 router = APIRouter(
     prefix="/api/career",
@@ -12,91 +19,180 @@ router = APIRouter(
 )
 
 @router.get("/roadmap")
-def get_current_roadmap(user_id: str = Depends(verify_firebase_token)):
-    roadmap = get_active_roadmap(user_id)
+async def get_current_roadmap(user_id: str = Depends(verify_firebase_token)):
+    roadmap = await get_active_roadmap(user_id)
     if not roadmap:
         return {"message": "No active roadmap found"}
-    return roadmap
+    # Returned as a response so the stored document is serialized once,
+    # without FastAPI's jsonable_encoder pass over it first
+    return ORJSONResponse(roadmap)
 
 
 @router.post("/roadmap")
 async def generate_career_roadmap(
     profile: StudentProfile,
-    user_id: str = Depends(verify_firebase_token)
+    use_cache: bool = True,
+    background: bool = False,
+    user_id: str = Depends(llm_rate_limit)
 ):
-    try:
-        profile_dict = profile.dict()
-        
-        result = await generate_roadmap(profile_dict)
-        
-        career_decision = result.get("career_decision", {})
-        learning_roadmap = result.get("learning_roadmap", {})
-
-        await run_in_threadpool(
-            save_career_analysis,
-            user_id=user_id,
-            profile=profile_dict,
-            career_decision=career_decision,
-            roadmap=learning_roadmap
-        )
-
-        return {
-            "status": "success",
-            "user_id": user_id,
-            "career_decision": career_decision,
-            "learning_roadmap": learning_roadmap
-        }
-
+    if background:
+        try:
+            job = await enqueue_roadmap_job(user_id, profile.dict(), use_cache=use_cache)
+        except QueueFullError:
+            raise HTTPException(
+                status_code=429,
+                detail="Roadmap queue is full, please retry shortly",
+                headers={"Retry-After": "30"}
+            )
+        return ORJSONResponse(public_job(job), status_code=202)
 
+    try:
+        return ORJSONResponse(await generate_and_save_roadmap(user_id, profile.dict(), use_cache=use_cache))
+    except CircuitOpenError as e:
+        raise llm_unavailable(e)
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
 
+def _sse(event: str, data: dict) -> str:
+    return f"event: {event}\ndata: {dumps(data).decode()}\n\n"
+
+
+@router.post("/roadmap/stream")
+async def stream_career_roadmap(
+    profile: StudentProfile,
+    use_cache: bool = True,
+    user_id: str = Depends(llm_rate_limit)
+):
+    profile_dict = profile.dict()
+
+    async def event_stream():
+        started = time.perf_counter()
+        time_to_first_phase_ms = None
+
+        try:
+            async for event, data in stream_roadmap(profile_dict, use_cache=use_cache):
+                if event == "result":
+                    career_decision = data.get("career_decision", {})
+                    learning_roadmap = data.get("learning_roadmap", {})
+
+                    await save_career_analysis(
+                        user_id=user_id,
+                        profile=profile_dict,
+                        career_decision=career_decision,
+                        roadmap=learning_roadmap
+                    )
+
+                    yield _sse("complete", {
+                        "status": "success",
+                        "user_id": user_id,
+                        "career_decision": career_decision,
+                        "learning_roadmap": learning_roadmap,
+                        "degraded": data.get("degraded", False),
+                        "time_to_first_phase_ms": time_to_first_phase_ms
+                    })
+                else:
+                    if event == "phase" and time_to_first_phase_ms is None:
+                        time_to_first_phase_ms = int((time.perf_counter() - started) * 1000)
+                    yield _sse(event, data)
+        except CircuitOpenError as e:
+            yield _sse("error", {"detail": str(e), "retry_after": math.ceil(e.retry_after)})
+        except Exception as e:
+            yield _sse("error", {"detail": str(e)})
+
+    return StreamingResponse(
+        event_stream(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+    )
+
+
+@router.get("/jobs/{job_id}")
+async def get_roadmap_job(job_id: str, user_id: str = Depends(verify_firebase_token)):
+    job = await get_job(job_id)
+    if not job or job["user_id"] != user_id:
+        raise HTTPException(status_code=404, detail="Job not found")
+    return ORJSONResponse(public_job(job))
+
+
+@router.websocket("/jobs/{job_id}/ws")
+async def watch_roadmap_job(websocket: WebSocket, job_id: str, token: str):
+    # Browsers can't set headers on WebSockets, so the ID token is a query param
+    try:
+        user_id = (await verify_id_token_cached(token))["uid"]
+    except HTTPException:
+        await websocket.close(code=1008)
+        return
+
+    job = await get_job(job_id)
+    if not job or job["user_id"] != user_id:
+        await websocket.close(code=1008)
+        return
+
+    await websocket.accept()
+    try:
+        last_sent = None
+        while True:
+            if job["updated_at"] != last_sent:
+                await websocket.send_text(dumps(public_job(job)).decode())
+                last_sent = job["updated_at"]
+            if job["status"] in ("succeeded", "failed"):
+                break
+            job = await wait_for_update(job_id, job["updated_at"], timeout=15)
+            if job is None:
+                break
+        await websocket.close()
+    except WebSocketDisconnect:
+        pass
+
+
 @router.get("/insights")
-def get_career_insights(user_id: str = Depends(verify_firebase_token)):
+async def get_career_insights(user_id: str = Depends(verify_firebase_token)):
     try:
-        roadmap = get_active_roadmap(user_id)
+        roadmap = await get_active_roadmap(user_id)
         if not roadmap:
             return {"message": "No career decision found. Please generate a roadmap first."}
         
         career_decision = roadmap.get("career_decision", {})
         
-        profile = roadmap.get("profile", {})
-        insights = generate_career_insights(profile, career_decision)
+        profile = roadmap.get("profile") or await get_student_profile(user_id) or {}
+        insights = generate_career_insights(profile, career_decision, roadmap.get("learning_roadmap"))
         
-        return {
+        return ORJSONResponse({
             "status": "success",
             "insights": insights
-        }
+        })
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
 
 @router.get("/alternatives")
-def get_alternative_careers(user_id: str = Depends(verify_firebase_token)):
+async def get_alternative_careers(user_id: str = Depends(verify_firebase_token)):
     try:
-        roadmap = get_active_roadmap(user_id)
+        roadmap = await get_active_roadmap(user_id)
         if not roadmap:
             return {"message": "No career decision found"}
         
         career_decision = roadmap.get("career_decision", {})
         alternatives = career_decision.get("alternatives", [])
+        if not alternatives:
+            profile = roadmap.get("profile") or await get_student_profile(user_id)
+            if profile:
+                alternatives = catalog_alternatives(profile, career_decision.get("career"))
         
-        return {
+        return ORJSONResponse({
             "status": "success",
             "current_career": career_decision.get("career"),
             "alternatives": alternatives
-        }
+        })
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
 
 @router.delete("/roadmap")
-def delete_roadmap(user_id: str = Depends(verify_firebase_token)):
+async def delete_roadmap(user_id: str = Depends(verify_firebase_token)):
     try:
-        from app.services.storage_service import delete_active_roadmap
-        
-        success = delete_active_roadmap(user_id)
+        success = await delete_active_roadmap(user_id)
         if success:
             return {
                 "status": "success",
@@ -1,9 +1,12 @@
 from fastapi import APIRouter, HTTPException, Depends
-from fastapi.concurrency import run_in_threadpool
 from pydantic import BaseModel
-from app.services.storage_service import update_phase_status, get_active_roadmap, save_active_roadmap
-from app.services.roadmap_agent import adapt_roadmap
+from app.services.storage_service import update_phase_status
+from app.services.roadmap_service import adapt_and_save_roadmap
+from app.services.roadmap_output import RoadmapOutputError
 from app.utils.auth import verify_firebase_token
+from app.utils.circuit_breaker import CircuitOpenError, llm_unavailable
+from app.utils.rate_limit import llm_rate_limit
+from app.utils.responses import ORJSONResponse
 
 router = APIRouter(
     prefix="/api/progress",
@@ -15,11 +18,11 @@ class ProgressUpdate(BaseModel):
     status: str
 
 @router.post("/update")
-def update_progress(
+async def update_progress(
     update: ProgressUpdate,
     user_id: str = Depends(verify_firebase_token)
 ):
-    success = update_phase_status(user_id, update.phase_index, update.status)
+    success = await update_phase_status(user_id, update.phase_index, update.status)
     if not success:
         raise HTTPException(status_code=404, detail="Roadmap or phase not found")
     
@@ -27,26 +30,20 @@ def update_progress(
 
 @router.post("/adapt")
 async def adapt_roadmap_route(
-    user_id: str = Depends(verify_firebase_token)
+    user_id: str = Depends(llm_rate_limit)
 ):
-    current_data = await run_in_threadpool(get_active_roadmap, user_id)
-    if not current_data:
+    try:
+        updated_data = await adapt_and_save_roadmap(user_id)
+    except CircuitOpenError as e:
+        raise llm_unavailable(e)
+    except RoadmapOutputError as e:
+        raise HTTPException(status_code=502, detail=str(e))
+    if not updated_data:
         raise HTTPException(status_code=404, detail="No active roadmap found")
-    
-    new_roadmap = await adapt_roadmap(current_data)
-    
-    await run_in_threadpool(
-        save_active_roadmap,
-        user_id, 
-        current_data["career_decision"], 
-        new_roadmap,
-        preserve_progress=True
-    )
-    
-    updated_data = await run_in_threadpool(get_active_roadmap, user_id)
-    return {
+
+    return ORJSONResponse({
         "status": "success",
         "career_decision": updated_data.get("career_decision"),
         "learning_roadmap": updated_data.get("learning_roadmap"),
         "progress": updated_data.get("progress")
-    }
+    })
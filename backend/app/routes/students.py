@@ -1,7 +1,11 @@
+import logging
 from fastapi import APIRouter, HTTPException, Depends
 from app.models.student import StudentProfile
 from app.services.storage_service import get_student_profile, save_student_profile
 from app.utils.auth import verify_firebase_token
+from app.utils.responses import ORJSONResponse
+
+logger = logging.getLogger(__name__)
 
 router = APIRouter(
     prefix="/api/students",
@@ -9,24 +13,21 @@ router = APIRouter(
 )
 
 @router.get("/profile")
-def get_profile(user_id: str = Depends(verify_firebase_token)):
+async def get_profile(user_id: str = Depends(verify_firebase_token)):
     try:
-        profile = get_student_profile(user_id)
+        profile = await get_student_profile(user_id)
         if not profile:
             return {"message": "No profile found"}
-        return profile
+        return ORJSONResponse(profile)
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
 @router.post("/profile")
-def save_profile(
+async def save_profile(
     profile: StudentProfile,
     user_id: str = Depends(verify_firebase_token)
 ):
     try:
-        print(f"Saving profile for user: {user_id}")
-        print(f"Profile data: {profile.dict()}")
-        
         if not profile.name or not profile.name.strip():
             raise HTTPException(status_code=400, detail="Name is required")
         if not profile.education or not profile.education.strip():
@@ -38,18 +39,17 @@ def save_profile(
         if not profile.goals or not profile.goals.strip():
             raise HTTPException(status_code=400, detail="Career goals are required")
         
-        save_student_profile(user_id, profile.dict())
-        print(f"Profile saved successfully for user: {user_id}")
+        profile_dict = profile.dict()
+        await save_student_profile(user_id, profile_dict)
+        logger.debug("Profile saved for user %s", user_id)
         
-        return {
+        return ORJSONResponse({
             "status": "success",
             "message": "Profile saved successfully",
-            "profile": profile.dict()
-        }
+            "profile": profile_dict
+        })
     except HTTPException:
         raise
     except Exception as e:
-        print(f"Error saving profile for user {user_id}: {str(e)}")
-        import traceback
-        traceback.print_exc()
+        logger.exception("Error saving profile for user %s", user_id)
         raise HTTPException(status_code=500, detail=f"Failed to save profile: {str(e)}")
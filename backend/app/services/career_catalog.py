@@ -0,0 +1,225 @@
+"""
+Local career catalog and a hashed TF-IDF index over it.
+
+The index is built offline and memory-mapped at startup:
+
+    python -m app.services.career_catalog
+
+If the index files are missing or were built from a different catalog, it is
+rebuilt in memory on first use. numpy is imported by the functions that need
+it, so importing the app doesn't pay for it.
+"""
+import hashlib
+import json
+import logging
+import re
+import threading
+import zlib
+from app.config import CAREER_CATALOG_PATH, CAREER_INDEX_PATH
+from app.services.skill_taxonomy import get_taxonomy, parse_skills, skill_key
+
+logger = logging.getLogger(__name__)
+
+FEATURE_DIMS = 2 ** 12
+
+SKILL_WEIGHT = 1.0
+WORD_WEIGHT = 0.5
+# Related skills from the taxonomy, scaled by transfer strength
+RELATED_SKILL_WEIGHT = 0.3
+LEVEL_WEIGHTS = {"beginner": 0.5, "intermediate": 0.75, "advanced": 1.0}
+
+STOP_WORDS = {"a", "an", "and", "as", "at", "be", "for", "in", "of", "on", "or", "the", "to", "with", "my", "i", "want", "become"}
+_WORD = re.compile(r"[a-z0-9+#]+")
+
+
+def _index_paths(index_path: str):
+    base = index_path[:-4] if index_path.endswith(".npy") else index_path
+    return base + ".npy", base + ".idf.npy", base + ".json"
+
+
+def _words(text) -> list:
+    if not isinstance(text, str):
+        text = " ".join(text or [])
+    return [word for word in _WORD.findall(text.lower()) if len(word) > 1 and word not in STOP_WORDS]
+
+
+def _skill_feature(skill: str) -> str:
+    taxonomy = get_taxonomy()
+    index = taxonomy.resolve(skill)
+    return "s:" + (taxonomy.ids[index] if index is not None else skill_key(skill))
+
+
+def _add(features: dict, feature: str, weight: float):
+    features[feature] = max(features.get(feature, 0.0), weight)
+
+
+def career_features(career: dict) -> dict:
+    features = {}
+    for skill in career.get("skills", []):
+        _add(features, _skill_feature(skill), SKILL_WEIGHT)
+    for word in _words(career.get("title", "")) + _words(career.get("keywords", [])):
+        _add(features, "w:" + word, WORD_WEIGHT)
+    return features
+
+
+def profile_features(profile: dict) -> dict:
+    """Works for both StudentProfile and CareerAnalysisProfile dicts."""
+    import numpy as np
+
+    taxonomy = get_taxonomy()
+    features = {}
+
+    skills = profile.get("skills")
+    levels = skills if isinstance(skills, dict) else {}
+    for skill in parse_skills(skills):
+        weight = SKILL_WEIGHT * LEVEL_WEIGHTS.get(str(levels.get(skill, "")).lower(), 1.0)
+        _add(features, _skill_feature(skill), weight)
+
+        index = taxonomy.resolve(skill)
+        if index is not None:
+            for related in np.flatnonzero(taxonomy.transfer[index]):
+                if related != index:
+                    strength = float(taxonomy.transfer[index, related])
+                    _add(features, "s:" + taxonomy.ids[related], weight * RELATED_SKILL_WEIGHT * strength)
+
+    interests = parse_skills(profile.get("interests"))
+    for interest in interests:
+        if taxonomy.resolve(interest) is not None:
+            _add(features, _skill_feature(interest), WORD_WEIGHT)
+
+    text = " ".join(interests + [profile.get("goals") or profile.get("goal") or ""])
+    for word in _words(text):
+        _add(features, "w:" + word, WORD_WEIGHT)
+    return features
+
+
+def _column(feature: str, dims: int) -> int:
+    # crc32 rather than hash(), which is salted per process
+    return zlib.crc32(feature.encode("utf-8")) % dims
+
+
+def _vectorize(features: dict, idf):
+    import numpy as np
+
+    vector = np.zeros(len(idf), dtype=np.float32)
+    for feature, weight in features.items():
+        column = _column(feature, len(idf))
+        vector[column] = max(vector[column], weight * idf[column])
+    norm = np.linalg.norm(vector)
+    return vector / norm if norm else vector
+
+
+def load_catalog(path: str = CAREER_CATALOG_PATH):
+    with open(path, "rb") as f:
+        raw = f.read()
+    return json.loads(raw)["careers"], hashlib.sha256(raw).hexdigest()
+
+
+def build_index(careers: list, dims: int = FEATURE_DIMS):
+    """Returns the L2-normalized (careers x dims) matrix and the IDF vector."""
+    import numpy as np
+
+    rows = [career_features(career) for career in careers]
+
+    df = np.zeros(dims, dtype=np.float32)
+    for features in rows:
+        df[list({_column(feature, dims) for feature in features})] += 1
+    idf = (np.log((1 + len(rows)) / (1 + df)) + 1).astype(np.float32)
+
+    matrix = np.zeros((len(rows), dims), dtype=np.float32)
+    for i, features in enumerate(rows):
+        matrix[i] = _vectorize(features, idf)
+    return matrix, idf
+
+
+def write_index(catalog_path: str = CAREER_CATALOG_PATH, index_path: str = CAREER_INDEX_PATH) -> dict:
+    import numpy as np
+
+    careers, digest = load_catalog(catalog_path)
+    matrix, idf = build_index(careers)
+    matrix_path, idf_path, meta_path = _index_paths(index_path)
+    np.save(matrix_path, matrix)
+    np.save(idf_path, idf)
+    meta = {"catalog_sha256": digest, "careers": len(careers), "dims": int(matrix.shape[1])}
+    with open(meta_path, "w") as f:
+        json.dump(meta, f)
+    return meta
+
+
+class CareerIndex:
+
+    def __init__(self, careers: list, matrix, idf):
+        self.careers = careers
+        self.matrix = matrix
+        self.idf = idf
+        self._position = {career["title"].lower(): i for i, career in enumerate(careers)}
+
+    @classmethod
+    def load(cls, catalog_path: str = CAREER_CATALOG_PATH, index_path: str = CAREER_INDEX_PATH) -> "CareerIndex":
+        import numpy as np
+
+        careers, digest = load_catalog(catalog_path)
+        matrix_path, idf_path, meta_path = _index_paths(index_path)
+        try:
+            with open(meta_path) as f:
+                meta = json.load(f)
+            if meta["catalog_sha256"] != digest:
+                raise ValueError("catalog changed since the index was built")
+            # Memory-mapped, so workers share the pages instead of each
+            # holding a copy
+            matrix = np.load(matrix_path, mmap_mode="r")
+            idf = np.load(idf_path)
+        except (OSError, ValueError, KeyError) as e:
+            logger.warning("Career index unavailable (%s); building it in memory", e)
+            matrix, idf = build_index(careers)
+        return cls(careers, matrix, idf)
+
+    def __len__(self):
+        return len(self.careers)
+
+    def get(self, title: str):
+        position = self._position.get((title or "").lower())
+        return self.careers[position] if position is not None else None
+
+    def rank(self, profile: dict, top_k: int = 5, exclude=()) -> list:
+        """Top-k careers by cosine similarity to the profile, best first."""
+        import numpy as np
+
+        query = _vectorize(profile_features(profile), self.idf)
+        scores = self.matrix @ query
+
+        excluded = [self._position[title.lower()] for title in exclude if title and title.lower() in self._position]
+        scores[excluded] = -1
+
+        top_k = min(top_k, len(scores))
+        if top_k <= 0:
+            return []
+        top = np.argpartition(-scores, top_k - 1)[:top_k]
+        top = top[np.argsort(-scores[top], kind="stable")]
+        return [
+            {
+                "career": self.careers[i]["title"],
+                "score": round(float(scores[i]) * 100, 1),
+                "demand": self.careers[i].get("demand"),
+                "skills": self.careers[i].get("skills", [])
+            }
+            for i in top if scores[i] > 0
+        ]
+
+
+_index = None
+_index_lock = threading.Lock()
+
+
+def get_career_index() -> CareerIndex:
+    global _index
+    if _index is None:
+        with _index_lock:
+            if _index is None:
+                _index = CareerIndex.load()
+    return _index
+
+
+if __name__ == "__main__":
+    meta = write_index()
+    print(f"Indexed {meta['careers']} careers ({meta['dims']} features) into {CAREER_INDEX_PATH}")
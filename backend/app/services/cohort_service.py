@@ -0,0 +1,214 @@
+"""
+Bulk roadmap generation for a cohort of students.
+
+Entries flow through bounded queues: a feeder, COHORT_WORKERS generators and
+one writer that persists results in batches. Each stage waits on the next,
+so a slow reader or a slow database throttles the whole pipeline instead of
+piling up roadmaps in memory. Identical canonical profiles are generated
+once: concurrent duplicates join the in-flight call, and later ones reuse
+the result from a bounded window.
+"""
+import asyncio
+import copy
+import orjson
+from pydantic import ValidationError
+from app.config import (
+    COHORT_WORKERS,
+    COHORT_MAX_STUDENTS,
+    COHORT_BATCH_SIZE,
+    COHORT_FLUSH_SECONDS,
+    COHORT_DEDUPE_WINDOW,
+)
+from app.models.student import CohortStudent
+from app.services.roadmap_agent import generate_roadmap
+from app.services.roadmap_cache import profile_cache_key
+from app.services.storage_service import save_career_analyses
+from app.utils.cache import TTLCache
+from app.utils.singleflight import SingleFlight
+
+# Shared by all cohorts, so two uploads containing the same student coalesce too
+_flights = SingleFlight("cohort_roadmap")
+
+
+class CohortTooLarge(ValueError):
+    pass
+
+
+def _ndjson_lines(body: bytes):
+    start = 0
+    while start < len(body):
+        end = body.find(b"\n", start)
+        if end == -1:
+            end = len(body)
+        line = body[start:end].strip()
+        start = end + 1
+        if line:
+            yield line
+
+
+def parse_cohort(body: bytes, content_type: str):
+    """
+    Yields (index, CohortStudent or error message) for a JSON list (or
+    {"students": [...]}) or an NDJSON upload. Raises ValueError if the
+    upload as a whole is unusable.
+    """
+    if "ndjson" in content_type:
+        if sum(1 for _ in _ndjson_lines(body)) > COHORT_MAX_STUDENTS:
+            raise CohortTooLarge(f"A cohort is limited to {COHORT_MAX_STUDENTS} students")
+        documents = _decoded_lines(body)
+    else:
+        try:
+            payload = orjson.loads(body)
+        except orjson.JSONDecodeError as e:
+            raise ValueError(f"Invalid JSON: {e}")
+        if isinstance(payload, dict):
+            payload = payload.get("students")
+        if not isinstance(payload, list):
+            raise ValueError('Expected a list of students or {"students": [...]}')
+        if len(payload) > COHORT_MAX_STUDENTS:
+            raise CohortTooLarge(f"A cohort is limited to {COHORT_MAX_STUDENTS} students")
+        documents = iter(payload)
+    return _validated(documents)
+
+
+def _decoded_lines(body: bytes):
+    for line in _ndjson_lines(body):
+        try:
+            yield orjson.loads(line)
+        except orjson.JSONDecodeError as e:
+            yield ValueError(f"Invalid JSON: {e}")
+
+
+def _validated(documents):
+    for index, document in enumerate(documents):
+        if isinstance(document, ValueError):
+            yield index, str(document)
+            continue
+        try:
+            yield index, CohortStudent.parse_obj(document)
+        except ValidationError as e:
+            yield index, "; ".join(f"{'.'.join(map(str, error['loc']))}: {error['msg']}" for error in e.errors())
+
+
+async def _roadmap_for(profile: dict, recent: TTLCache):
+    """Returns (result, deduped)."""
+    key = profile_cache_key(profile)
+    result = recent.get(key)
+    if result is not None:
+        return result, True
+
+    deduped = _flights.running(key)
+    result = await _flights.do(key, generate_roadmap, profile)
+    # Degraded roadmaps aren't reused, so later duplicates try the LLM again
+    if not result.get("degraded"):
+        recent.set(key, result)
+    return result, deduped
+
+
+async def generate_cohort(entries):
+    """
+    Generates and saves a roadmap for every (index, CohortStudent) in
+    `entries` and yields NDJSON-ready events: "result" or "error" per
+    student, "progress" after each saved batch and a final "summary".
+    """
+    stats = {"received": 0, "invalid": 0, "failed": 0, "saved": 0, "deduped": 0}
+    recent = TTLCache(maxsize=COHORT_DEDUPE_WINDOW, ttl=float("inf"))
+    work = asyncio.Queue(maxsize=COHORT_WORKERS)
+    generated = asyncio.Queue(maxsize=COHORT_BATCH_SIZE)
+    events = asyncio.Queue(maxsize=COHORT_BATCH_SIZE)
+
+    async def feed():
+        for index, entry in entries:
+            stats["received"] += 1
+            if isinstance(entry, str):
+                stats["invalid"] += 1
+                await events.put({"type": "error", "index": index, "detail": entry})
+            else:
+                await work.put((index, entry))
+        for _ in range(COHORT_WORKERS):
+            await work.put(None)
+
+    async def generate():
+        while (item := await work.get()) is not None:
+            index, entry = item
+            profile = entry.profile.dict()
+            try:
+                result, deduped = await _roadmap_for(profile, recent)
+            except Exception as e:
+                stats["failed"] += 1
+                await events.put({"type": "error", "index": index, "user_id": entry.user_id, "detail": str(e)})
+                continue
+            await generated.put((index, entry.user_id, profile, result, deduped))
+
+    async def save_batch(batch: list):
+        try:
+            await save_career_analyses([
+                {
+                    "user_id": user_id,
+                    "profile": profile,
+                    "career_decision": result.get("career_decision", {}),
+                    # Deduped students share one result; each gets its own phases
+                    "roadmap": copy.deepcopy(result.get("learning_roadmap", {}))
+                }
+                for _, user_id, profile, result, _ in batch
+            ])
+        except Exception as e:
+            stats["failed"] += len(batch)
+            for index, user_id, _, _, _ in batch:
+                await events.put({"type": "error", "index": index, "user_id": user_id, "detail": f"Failed to save: {e}"})
+            return
+
+        for index, user_id, _, result, deduped in batch:
+            stats["saved"] += 1
+            stats["deduped"] += deduped
+            await events.put({
+                "type": "result",
+                "index": index,
+                "user_id": user_id,
+                "career_decision": result.get("career_decision", {}),
+                "degraded": result.get("degraded", False),
+                "deduped": deduped
+            })
+        await events.put({"type": "progress", **stats})
+
+    async def write():
+        loop = asyncio.get_running_loop()
+        finished = False
+        while not finished:
+            item = await generated.get()
+            if item is None:
+                break
+            batch = [item]
+            # Fill the batch, but don't hold finished students back for long
+            deadline = loop.time() + COHORT_FLUSH_SECONDS
+            while len(batch) < COHORT_BATCH_SIZE:
+                try:
+                    item = await asyncio.wait_for(generated.get(), timeout=max(0.0, deadline - loop.time()))
+                except asyncio.TimeoutError:
+                    break
+                if item is None:
+                    finished = True
+                    break
+                batch.append(item)
+            await save_batch(batch)
+
+    async def run():
+        try:
+            async with asyncio.TaskGroup() as group:
+                group.create_task(feed())
+                writer = group.create_task(write())
+                await asyncio.gather(*(group.create_task(generate()) for _ in range(COHORT_WORKERS)))
+                await generated.put(None)
+                await writer
+            await events.put({"type": "summary", **stats})
+        except Exception as e:
+            await events.put({"type": "error", "detail": str(e)})
+        await events.put(None)
+
+    runner = asyncio.create_task(run())
+    try:
+        while (event := await events.get()) is not None:
+            yield event
+    finally:
+        # The client went away: stop generating for it
+        runner.cancel()
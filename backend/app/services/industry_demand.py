@@ -0,0 +1,95 @@
+import json
+import re
+import threading
+from app.config import INDUSTRY_DEMAND_PATH
+
+DEMAND_FIELDS = ("demand_level", "growth_projection", "job_openings_estimate", "avg_salary_range")
+
+_TOKEN = re.compile(r"[a-z0-9+#]+")
+
+
+def title_tokens(title: str) -> tuple:
+    return tuple(_TOKEN.findall((title or "").lower()))
+
+
+class DemandIndex:
+    """
+    Job-title demand data with a token index. Every title and alias is a
+    token phrase filed under its first token, so a lookup only checks the
+    phrases that start with one of the query's own tokens. Lookup cost tracks
+    the length of the query, not the size of the dataset.
+    """
+
+    def __init__(self, document: dict):
+        self.default = {field: document["default"][field] for field in DEMAND_FIELDS}
+        self.entries = []
+        self._exact = {}
+        self._phrases = {}
+
+        for entry in document["titles"]:
+            position = len(self.entries)
+            self.entries.append({"title": entry["title"], **{field: entry[field] for field in DEMAND_FIELDS}})
+            for name in [entry["title"], *entry.get("aliases", [])]:
+                tokens = title_tokens(name)
+                if not tokens or tokens in self._exact:
+                    continue
+                self._exact[tokens] = position
+                self._phrases.setdefault(tokens[0], []).append((tokens, position))
+
+        # Longest phrase first, so the most specific title wins
+        for phrases in self._phrases.values():
+            phrases.sort(key=lambda phrase: -len(phrase[0]))
+
+    @classmethod
+    def from_file(cls, path: str) -> "DemandIndex":
+        with open(path, encoding="utf-8") as f:
+            return cls(json.load(f))
+
+    def __len__(self):
+        return len(self.entries)
+
+    def match(self, career: str):
+        """Index of the best-matching entry, or None."""
+        tokens = title_tokens(career)
+        exact = self._exact.get(tokens)
+        if exact is not None:
+            return exact
+
+        best, best_length = None, 0
+        for start, token in enumerate(tokens):
+            for phrase, position in self._phrases.get(token, ()):
+                if len(phrase) <= best_length:
+                    break
+                if tokens[start:start + len(phrase)] == phrase:
+                    best, best_length = position, len(phrase)
+                    break
+        return best
+
+    def lookup(self, career: str) -> dict:
+        position = self.match(career)
+        if position is None:
+            return {**self.default, "matched_title": None}
+        entry = self.entries[position]
+        return {**{field: entry[field] for field in DEMAND_FIELDS}, "matched_title": entry["title"]}
+
+    def lookup_many(self, careers: list) -> list:
+        # Repeated titles are common in a batch; match each distinct one once
+        results = {}
+        for career in careers:
+            key = title_tokens(career)
+            if key not in results:
+                results[key] = self.lookup(career)
+        return [dict(results[title_tokens(career)]) for career in careers]
+
+
+_index = None
+_index_lock = threading.Lock()
+
+
+def get_demand_index() -> DemandIndex:
+    global _index
+    if _index is None:
+        with _index_lock:
+            if _index is None:
+                _index = DemandIndex.from_file(INDUSTRY_DEMAND_PATH)
+    return _index
@@ -0,0 +1,357 @@
+import asyncio
+import json
+import logging
+import sqlite3
+import threading
+import time
+import uuid
+from fastapi.concurrency import run_in_threadpool
+from app.config import (
+    JOB_QUEUE_BACKEND,
+    JOB_QUEUE_MAX_SIZE,
+    JOB_WORKERS,
+    JOB_RESULT_TTL_SECONDS,
+    JOB_LEASE_SECONDS,
+    SQLITE_PATH,
+)
+from app.services.roadmap_service import generate_and_save_roadmap
+from app.utils.cache import TTLCache
+
+logger = logging.getLogger(__name__)
+
+TERMINAL_STATUSES = ("succeeded", "failed")
+
+
+class QueueFullError(Exception):
+    pass
+
+
+class MemoryJobStore:
+
+    def __init__(self):
+        # Unfinished jobs are bounded by the queue size and worker count and
+        # are never evicted; finished jobs are kept for JOB_RESULT_TTL_SECONDS.
+        self._unfinished = {}
+        self._finished = TTLCache(maxsize=max(1000, JOB_QUEUE_MAX_SIZE * 10), ttl=JOB_RESULT_TTL_SECONDS)
+        self._active_by_user = {}
+        self._lock = threading.Lock()
+
+    def create(self, job: dict, owner: str, lease_seconds: float):
+        with self._lock:
+            self._unfinished[job["id"]] = job
+            self._active_by_user[job["user_id"]] = job["id"]
+
+    def update(self, job_id: str, **fields):
+        with self._lock:
+            job = self._unfinished.get(job_id)
+            if job is None:
+                return
+            job.update(fields, updated_at=time.time())
+            if job["status"] in TERMINAL_STATUSES:
+                del self._unfinished[job_id]
+                self._finished.set(job_id, job)
+                if self._active_by_user.get(job["user_id"]) == job_id:
+                    del self._active_by_user[job["user_id"]]
+
+    def get(self, job_id: str):
+        job = self._unfinished.get(job_id) or self._finished.get(job_id)
+        return dict(job) if job is not None else None
+
+    def active_job_for_user(self, user_id: str):
+        job_id = self._active_by_user.get(user_id)
+        return self.get(job_id) if job_id else None
+
+    # Jobs live and die with this process, so there is nothing to hand over
+    def renew_leases(self, owner: str, lease_seconds: float):
+        pass
+
+    def release_leases(self, owner: str):
+        pass
+
+    def claim_expired(self, owner: str, lease_seconds: float, limit: int) -> list:
+        return []
+
+
+class SQLiteJobStore:
+    """
+    Persists jobs so queued work survives a restart of the worker process.
+    Several processes can share the file: each unfinished job is leased to
+    the process that queued or claimed it, and only jobs whose lease has
+    run out (their owner stopped heartbeating) are taken over.
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        self._local = threading.local()
+        self._connection().execute(
+            "CREATE TABLE IF NOT EXISTS roadmap_jobs ("
+            "id TEXT PRIMARY KEY, user_id TEXT NOT NULL, status TEXT NOT NULL, "
+            "data TEXT NOT NULL, updated_at REAL NOT NULL, "
+            "owner TEXT, lease_expires REAL NOT NULL DEFAULT 0)"
+        )
+        columns = {row[1] for row in self._connection().execute("PRAGMA table_info(roadmap_jobs)")}
+        if "owner" not in columns:
+            # Tables created before leases existed
+            self._connection().execute("ALTER TABLE roadmap_jobs ADD COLUMN owner TEXT")
+            self._connection().execute("ALTER TABLE roadmap_jobs ADD COLUMN lease_expires REAL NOT NULL DEFAULT 0")
+        self._connection().execute(
+            "CREATE INDEX IF NOT EXISTS roadmap_jobs_user_status ON roadmap_jobs (user_id, status)"
+        )
+
+    def _connection(self) -> sqlite3.Connection:
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = sqlite3.connect(self.path, timeout=10, isolation_level=None)
+            conn.execute("PRAGMA journal_mode=WAL")
+            self._local.conn = conn
+        return conn
+
+    def create(self, job: dict, owner: str, lease_seconds: float):
+        self._connection().execute(
+            "INSERT INTO roadmap_jobs (id, user_id, status, data, updated_at, owner, lease_expires) "
+            "VALUES (?, ?, ?, ?, ?, ?, ?)",
+            (job["id"], job["user_id"], job["status"], json.dumps(job, default=str), job["updated_at"],
+             owner, time.time() + lease_seconds)
+        )
+
+    def update(self, job_id: str, **fields):
+        job = self.get(job_id)
+        if job is None:
+            return
+        job.update(fields, updated_at=time.time())
+        self._connection().execute(
+            "UPDATE roadmap_jobs SET status = ?, data = ?, updated_at = ? WHERE id = ?",
+            (job["status"], json.dumps(job, default=str), job["updated_at"], job_id)
+        )
+        if job["status"] in TERMINAL_STATUSES:
+            self._connection().execute(
+                "DELETE FROM roadmap_jobs WHERE status IN ('succeeded', 'failed') AND updated_at < ?",
+                (time.time() - JOB_RESULT_TTL_SECONDS,)
+            )
+
+    def get(self, job_id: str):
+        row = self._connection().execute(
+            "SELECT data FROM roadmap_jobs WHERE id = ?", (job_id,)
+        ).fetchone()
+        return json.loads(row[0]) if row else None
+
+    def active_job_for_user(self, user_id: str):
+        row = self._connection().execute(
+            "SELECT data FROM roadmap_jobs WHERE user_id = ? AND status IN ('queued', 'running')",
+            (user_id,)
+        ).fetchone()
+        return json.loads(row[0]) if row else None
+
+    def renew_leases(self, owner: str, lease_seconds: float):
+        self._connection().execute(
+            "UPDATE roadmap_jobs SET lease_expires = ? WHERE owner = ? AND status IN ('queued', 'running')",
+            (time.time() + lease_seconds, owner)
+        )
+
+    def release_leases(self, owner: str):
+        self._connection().execute(
+            "UPDATE roadmap_jobs SET lease_expires = 0 WHERE owner = ? AND status IN ('queued', 'running')",
+            (owner,)
+        )
+
+    def claim_expired(self, owner: str, lease_seconds: float, limit: int) -> list:
+        """Takes over up to `limit` unfinished jobs whose lease has run out, oldest first."""
+        now = time.time()
+        conn = self._connection()
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            rows = conn.execute(
+                "SELECT id, data FROM roadmap_jobs WHERE status IN ('queued', 'running') AND lease_expires < ? "
+                "ORDER BY updated_at LIMIT ?",
+                (now, limit)
+            ).fetchall()
+            conn.executemany(
+                "UPDATE roadmap_jobs SET owner = ?, lease_expires = ? WHERE id = ?",
+                [(owner, now + lease_seconds, row[0]) for row in rows]
+            )
+        except BaseException:
+            conn.execute("ROLLBACK")
+            raise
+        conn.execute("COMMIT")
+        return [json.loads(row[1]) for row in rows]
+
+
+_store = None
+_store_lock = threading.Lock()
+# Identifies this process as the owner of the jobs it queues or claims
+_owner = uuid.uuid4().hex
+_queue = None
+_workers = []
+_lease_keeper = None
+_updates = {}
+_enqueue_lock = asyncio.Lock()
+
+
+def get_store():
+    global _store
+    if _store is None:
+        with _store_lock:
+            if _store is None:
+                _store = SQLiteJobStore(SQLITE_PATH) if JOB_QUEUE_BACKEND == "sqlite" else MemoryJobStore()
+    return _store
+
+
+def public_job(job: dict) -> dict:
+    return {key: value for key, value in job.items() if key not in ("profile", "use_cache")}
+
+
+def _notify(job_id: str):
+    event = _updates.pop(job_id, None)
+    if event is not None:
+        event.set()
+
+
+async def wait_for_update(job_id: str, seen_updated_at, timeout: float):
+    """
+    Waits until the job has changed since `seen_updated_at`, or until the
+    timeout, and returns its current state (None if it no longer exists).
+    """
+    event = _updates.setdefault(job_id, asyncio.Event())
+    # Checked after subscribing, so an update that landed since the caller's
+    # read isn't missed
+    job = await get_job(job_id)
+    if job is None or job["updated_at"] != seen_updated_at:
+        return job
+    try:
+        await asyncio.wait_for(event.wait(), timeout=timeout)
+    except asyncio.TimeoutError:
+        pass
+    return await get_job(job_id)
+
+
+async def _update(job_id: str, **fields):
+    await run_in_threadpool(get_store().update, job_id, **fields)
+    _notify(job_id)
+
+
+async def _run_job(job: dict):
+    await _update(job["id"], status="running")
+    try:
+        result = await generate_and_save_roadmap(
+            job["user_id"],
+            job["profile"],
+            use_cache=job.get("use_cache", True)
+        )
+        await _update(job["id"], status="succeeded", result=result)
+    except Exception as e:
+        await _update(job["id"], status="failed", error=str(e))
+
+
+async def _worker():
+    while True:
+        job = await _queue.get()
+        try:
+            await _run_job(job)
+        except Exception:
+            # Most likely the job store; the worker must outlive it
+            logger.exception("Roadmap job %s failed", job["id"])
+            try:
+                await _update(job["id"], status="failed", error="Internal error")
+            except Exception:
+                logger.exception("Could not mark roadmap job %s as failed", job["id"])
+        finally:
+            _queue.task_done()
+
+
+async def _claim_expired():
+    # Jobs whose owner stopped heartbeating, e.g. this process before a
+    # restart (SQLite store only). Only as many as there is room for.
+    async with _enqueue_lock:
+        room = _queue.maxsize - _queue.qsize() if _queue.maxsize > 0 else -1
+        if room == 0:
+            return
+        for job in await run_in_threadpool(get_store().claim_expired, _owner, JOB_LEASE_SECONDS, room):
+            _queue.put_nowait(job)
+
+
+async def _keep_leases():
+    while True:
+        await asyncio.sleep(JOB_LEASE_SECONDS / 3)
+        try:
+            await run_in_threadpool(get_store().renew_leases, _owner, JOB_LEASE_SECONDS)
+            await _claim_expired()
+        except Exception:
+            logger.exception("Renewing job leases failed")
+
+
+async def start():
+    """
+    Starts the workers and takes over orphaned jobs. Called from the app's
+    lifespan, so queued work resumes without waiting for a new job.
+    """
+    global _queue, _lease_keeper
+    if _queue is not None:
+        return
+
+    _queue = asyncio.Queue(maxsize=JOB_QUEUE_MAX_SIZE)
+    await _claim_expired()
+    for _ in range(JOB_WORKERS):
+        _workers.append(asyncio.create_task(_worker()))
+    _lease_keeper = asyncio.create_task(_keep_leases())
+
+
+async def stop():
+    """Stops the workers and releases this process's jobs to the others."""
+    global _queue, _lease_keeper
+    if _queue is None:
+        return
+
+    tasks = _workers + [_lease_keeper]
+    for task in tasks:
+        task.cancel()
+    await asyncio.gather(*tasks, return_exceptions=True)
+    _workers.clear()
+    _queue = _lease_keeper = None
+    await run_in_threadpool(get_store().release_leases, _owner)
+
+
+async def enqueue_roadmap_job(user_id: str, profile: dict, use_cache: bool = True) -> dict:
+    """
+    Queues a roadmap generation for `user_id` and returns the job. A user
+    with a job already queued or running gets that job back instead of a new
+    one. Raises QueueFullError when the queue is at capacity.
+    """
+    # A no-op once the lifespan has started the workers
+    await start()
+
+    async with _enqueue_lock:
+        existing = await run_in_threadpool(get_store().active_job_for_user, user_id)
+        if existing is not None:
+            return existing
+
+        if _queue.full():
+            raise QueueFullError()
+
+        now = time.time()
+        job = {
+            "id": uuid.uuid4().hex,
+            "user_id": user_id,
+            "status": "queued",
+            "created_at": now,
+            "updated_at": now,
+            "result": None,
+            "error": None,
+            "profile": profile,
+            "use_cache": use_cache
+        }
+        await run_in_threadpool(get_store().create, job, _owner, JOB_LEASE_SECONDS)
+        _queue.put_nowait(job)
+        return job
+
+
+async def get_job(job_id: str):
+    return await run_in_threadpool(get_store().get, job_id)
+
+
+def get_stats() -> dict:
+    return {
+        "backend": JOB_QUEUE_BACKEND,
+        "workers": len(_workers),
+        "queued": _queue.qsize() if _queue is not None else 0,
+        "max_size": JOB_QUEUE_MAX_SIZE
+    }
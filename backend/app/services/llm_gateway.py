@@ -0,0 +1,225 @@
+import asyncio
+import random
+import time
+from app.config import (
+    GROQ_API_KEY,
+    GROQ_BASE_URL,
+    LLM_MAX_CONCURRENCY,
+    LLM_TIMEOUT_SECONDS,
+    LLM_BACKOFF_BASE_SECONDS,
+    LLM_BACKOFF_MAX_SECONDS,
+    LLM_MAX_QUEUE_DEPTH,
+    LLM_BREAKER_WINDOW,
+    LLM_BREAKER_MIN_CALLS,
+    LLM_BREAKER_FAILURE_RATE,
+    LLM_BREAKER_SLOW_CALL_SECONDS,
+    LLM_BREAKER_SLOW_CALL_RATE,
+    LLM_BREAKER_OPEN_SECONDS,
+)
+from app.utils.circuit_breaker import CircuitBreaker, CircuitOpenError, CLOSED, HALF_OPEN
+from app.utils.metrics import ADMISSION_REJECTIONS, STAGE_DURATION, CallbackMetric, record_llm_usage
+
+# Built on first use (or by the startup warmup); tests and benchmarks may
+# assign a fake client here directly.
+client = None
+
+
+def get_client():
+    global client
+    if client is None:
+        # Deferred: the SDK is one of the slowest imports at startup
+        from groq import AsyncGroq
+
+        # Retries are driven by the callers (with jittered backoff), so the
+        # SDK's own retry loop is disabled. GROQ_BASE_URL lets the gateway
+        # point at a local fake Groq server for testing.
+        client = AsyncGroq(
+            api_key=GROQ_API_KEY,
+            base_url=GROQ_BASE_URL or None,
+            max_retries=0
+        )
+    return client
+
+# Checked before queueing for a slot, so an unhealthy Groq fails fast instead
+# of holding requests for the full timeout
+breaker = CircuitBreaker(
+    "groq",
+    window=LLM_BREAKER_WINDOW,
+    min_calls=LLM_BREAKER_MIN_CALLS,
+    failure_rate=LLM_BREAKER_FAILURE_RATE,
+    slow_call_seconds=LLM_BREAKER_SLOW_CALL_SECONDS,
+    slow_call_rate=LLM_BREAKER_SLOW_CALL_RATE,
+    open_seconds=LLM_BREAKER_OPEN_SECONDS
+)
+
+# Suggested wait when the queue is full; slots free up as calls finish
+BUSY_RETRY_AFTER_SECONDS = 5
+
+
+class LLMOverloadedError(CircuitOpenError):
+    """
+    Raised instead of queueing when LLM_MAX_QUEUE_DEPTH calls are already
+    waiting for a slot. Callers treat it like an open circuit: fail fast,
+    serve a degraded roadmap where possible, or answer 503 with Retry-After.
+    """
+
+    def __init__(self, retry_after: float):
+        Exception.__init__(self, f"The AI advisor is at capacity, retry in {retry_after:.0f}s")
+        self.retry_after = retry_after
+
+
+_semaphore = asyncio.Semaphore(LLM_MAX_CONCURRENCY)
+_queue_depth = 0
+_in_flight = 0
+
+
+async def _acquire():
+    global _queue_depth, _in_flight
+
+    # Global budget: past the queue bound, waiting would only add latency for
+    # everyone behind
+    if LLM_MAX_QUEUE_DEPTH and _semaphore.locked() and _queue_depth >= LLM_MAX_QUEUE_DEPTH:
+        ADMISSION_REJECTIONS.inc(limiter="llm_queue")
+        raise LLMOverloadedError(BUSY_RETRY_AFTER_SECONDS)
+
+    started = time.perf_counter()
+    _queue_depth += 1
+    try:
+        await _semaphore.acquire()
+    finally:
+        _queue_depth -= 1
+    _in_flight += 1
+    STAGE_DURATION.observe(time.perf_counter() - started, stage="llm.queue_wait")
+
+
+def _release():
+    global _in_flight
+
+    _in_flight -= 1
+    _semaphore.release()
+
+
+def _is_dependency_failure(error: BaseException) -> bool:
+    from groq import BadRequestError
+
+    # A rejected request says nothing about Groq's health
+    return not isinstance(error, (BadRequestError, asyncio.CancelledError, GeneratorExit))
+
+
+def _record_outcome(healthy, duration: float, probe):
+    if healthy is None:
+        breaker.release_probe(probe)
+    else:
+        breaker.record(healthy, duration, probe)
+
+
+async def chat_completion(messages: list, timeout: float = LLM_TIMEOUT_SECONDS, operation: str = "completion", **kwargs):
+    probe = breaker.before_call()
+    try:
+        await _acquire()
+    except BaseException:
+        breaker.release_probe(probe)
+        raise
+
+    started = time.perf_counter()
+    healthy = None
+    try:
+        with STAGE_DURATION.time(stage=f"llm.{operation}"):
+            response = await asyncio.wait_for(
+                get_client().chat.completions.create(messages=messages, **kwargs),
+                timeout=timeout
+            )
+        healthy = True
+    except BaseException as e:
+        if _is_dependency_failure(e):
+            healthy = False
+        raise
+    finally:
+        _release()
+        _record_outcome(healthy, time.perf_counter() - started, probe)
+
+    record_llm_usage(operation, response)
+    return response
+
+
+async def stream_chat_completion(messages: list, timeout: float = LLM_TIMEOUT_SECONDS, operation: str = "completion", **kwargs):
+    # Yields content deltas as they arrive. The concurrency slot is held until
+    # the stream is exhausted or closed, and `timeout` bounds the whole stream.
+    probe = breaker.before_call()
+    try:
+        await _acquire()
+    except BaseException:
+        breaker.release_probe(probe)
+        raise
+
+    stream = None
+    started = time.perf_counter()
+    # None means no verdict on Groq's health (e.g. the client went away)
+    healthy = None
+    try:
+        loop = asyncio.get_running_loop()
+        deadline = loop.time() + timeout
+
+        stream = await asyncio.wait_for(
+            get_client().chat.completions.create(messages=messages, stream=True, **kwargs),
+            timeout=timeout
+        )
+        chunks = stream.__aiter__()
+
+        while True:
+            remaining = deadline - loop.time()
+            if remaining <= 0:
+                raise asyncio.TimeoutError("LLM stream timed out")
+            try:
+                chunk = await asyncio.wait_for(chunks.__anext__(), timeout=remaining)
+            except StopAsyncIteration:
+                break
+
+            # Groq reports usage on the final chunk
+            x_groq = getattr(chunk, "x_groq", None)
+            if x_groq is not None and getattr(x_groq, "usage", None) is not None:
+                record_llm_usage(operation, x_groq)
+
+            if chunk.choices:
+                delta = chunk.choices[0].delta.content
+                if delta:
+                    yield delta
+        healthy = True
+    except BaseException as e:
+        if _is_dependency_failure(e):
+            healthy = False
+        raise
+    finally:
+        _record_outcome(healthy, time.perf_counter() - started, probe)
+        if stream is not None:
+            await stream.close()
+        _release()
+        STAGE_DURATION.observe(time.perf_counter() - started, stage=f"llm.{operation}")
+
+
+def backoff_delay(attempt: int) -> float:
+    # Exponential backoff with full jitter
+    ceiling = min(LLM_BACKOFF_MAX_SECONDS, LLM_BACKOFF_BASE_SECONDS * (2 ** attempt))
+    return random.uniform(0, ceiling)
+
+
+async def backoff(attempt: int):
+    await asyncio.sleep(backoff_delay(attempt))
+
+
+def get_stats() -> dict:
+    return {
+        "max_concurrency": LLM_MAX_CONCURRENCY,
+        "in_flight": _in_flight,
+        "queue_depth": _queue_depth,
+        "max_queue_depth": LLM_MAX_QUEUE_DEPTH,
+        "circuit": breaker.get_stats()
+    }
+
+
+CallbackMetric("skillroute_llm_in_flight", "LLM calls currently running", lambda: _in_flight)
+CallbackMetric("skillroute_llm_queue_depth", "LLM calls waiting for a concurrency slot", lambda: _queue_depth)
+CallbackMetric(
+    "skillroute_llm_circuit_state", "Groq circuit breaker state (0 closed, 1 half-open, 2 open)",
+    lambda: 0 if breaker.state == CLOSED else 1 if breaker.state == HALF_OPEN else 2
+)
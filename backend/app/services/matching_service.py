@@ -1,4 +1,14 @@
-def calculate_skill_match(profile_skills: list, required_skills: list) -> dict:
+from app.services.career_catalog import get_career_index
+from app.services.industry_demand import get_demand_index
+from app.services.skill_taxonomy import get_taxonomy, parse_skills
+
+
+def calculate_skill_match(profile_skills, required_skills: list) -> dict:
+    """
+    Matches skills through the taxonomy, so aliases ("JS", "JavaScript")
+    match and related skills count partially as transferable.
+    """
+    required_skills = parse_skills(required_skills)
     if not required_skills:
         return {
             "match_percentage": 0,
@@ -6,59 +16,71 @@ def calculate_skill_match(profile_skills: list, required_skills: list) -> dict:
             "missing_skills": [],
             "transferable_skills": []
         }
-    
-    profile_set = set(skill.lower() for skill in profile_skills)
-    required_set = set(skill.lower() for skill in required_skills)
-    
-    matched = profile_set.intersection(required_set)
-    missing = required_set.difference(profile_set)
-    
-    match_percentage = int((len(matched) / len(required_set)) * 100) if required_set else 0
-    
-    return {
-        "match_percentage": match_percentage,
-        "matched_skills": list(matched),
-        "missing_skills": list(missing),
-        "transferable_skills": []
-    }
+
+    return get_taxonomy().match(parse_skills(profile_skills), required_skills)
+
+
+def rank_careers_by_skills(profile_skills, careers: dict, top_k: int = None) -> list:
+    """
+    Scores a profile against {career: required_skills} in one batch and
+    returns [{"career", "match_percentage"}], best first. Used to hand the
+    template candidates' skill match to the LLM.
+    """
+    taxonomy = get_taxonomy()
+    names = list(careers)
+    scores = taxonomy.score(parse_skills(profile_skills), taxonomy.requirement_matrix(
+        [parse_skills(careers[name]) for name in names]
+    ))
+    order = scores.argsort(kind="stable")[::-1][:top_k]
+    return [{"career": names[i], "match_percentage": int(scores[i])} for i in order]
+
+
+def roadmap_required_skills(roadmap: dict) -> list:
+    skills = []
+    for phase in (roadmap or {}).get("roadmap", []):
+        skills.extend(phase.get("focus_skills", []))
+    return skills
 
 
 def analyze_industry_demand(career: str) -> dict:
-    trending_careers = [
-        "ai engineer", "machine learning engineer", "data scientist",
-        "full stack developer", "cloud architect", "devops engineer",
-        "cybersecurity specialist", "blockchain developer"
-    ]
-    
-    stable_careers = [
-        "software engineer", "web developer", "mobile developer",
-        "backend developer", "frontend developer", "qa engineer"
-    ]
-    
-    career_lower = career.lower()
-    
-    if any(trend in career_lower for trend in trending_careers):
-        demand = "trending"
-        growth = "high"
-    elif any(stable in career_lower for stable in stable_careers):
-        demand = "stable"
-        growth = "moderate"
-    else:
-        demand = "stable"
-        growth = "moderate"
-    
-    return {
-        "demand_level": demand,
-        "growth_projection": growth,
-        "job_openings_estimate": "moderate to high",
-        "avg_salary_range": "$60k - $120k"
-    }
+    return get_demand_index().lookup(career)
+
 
+def analyze_industry_demand_batch(careers: list) -> list:
+    """Demand info for many careers at once, in input order."""
+    return get_demand_index().lookup_many(careers)
 
-def generate_career_insights(profile: dict, career_decision: dict) -> dict:
+
+def rank_careers(profile: dict, top_k: int = 5, exclude=()) -> list:
+    """
+    Ranks the whole career catalog against a StudentProfile or
+    CareerAnalysisProfile dict with a single matrix-vector product.
+    """
+    return get_career_index().rank(profile, top_k=top_k, exclude=exclude)
+
+
+def catalog_alternatives(profile: dict, current_career: str, top_k: int = 3) -> list:
+    """Alternatives in the LLM's format, from the catalog ranking."""
+    alternatives = []
+    for ranked in rank_careers(profile, top_k=top_k, exclude=[current_career]):
+        match = calculate_skill_match(profile.get("skills"), ranked["skills"])
+        shared = match["matched_skills"] + [item["skill"] for item in match["transferable_skills"]]
+        reason = f"Builds on your {', '.join(shared[:3])} skills" if shared else "Close to your interests and goals"
+        alternatives.append({
+            "career": ranked["career"],
+            "match_score": match["match_percentage"],
+            "reason": reason
+        })
+    return alternatives
+
+
+def generate_career_insights(profile: dict, career_decision: dict, roadmap: dict = None) -> dict:
     career = career_decision.get("career", "")
     
     demand_info = analyze_industry_demand(career)
+
+    # The roadmap's focus skills are what the career needs from this student
+    skill_analysis = calculate_skill_match(profile.get("skills"), roadmap_required_skills(roadmap))
     
     key_strengths = career_decision.get("key_strengths", [])
     skill_gaps = career_decision.get("skill_gaps", [])
@@ -66,7 +88,8 @@ def generate_career_insights(profile: dict, career_decision: dict) -> dict:
     insights = {
         "career": career,
         "confidence": career_decision.get("confidence", 0),
-        "skill_match": career_decision.get("skill_match_percentage", 0),
+        "skill_match": career_decision.get("skill_match_percentage", skill_analysis["match_percentage"]),
+        "skill_analysis": skill_analysis,
         "market_readiness": career_decision.get("market_readiness", 0),
         "industry_demand": demand_info,
         "strengths": key_strengths,
@@ -1,10 +1,13 @@
-import os
 import json
-from groq import Groq
+import logging
+from contextlib import aclosing
+from app.config import ADAPT_MODE, ROADMAP_TEMPLATES_ENABLED
+from app.services import llm_gateway, roadmap_cache, roadmap_output, roadmap_templates
+from app.utils.circuit_breaker import CircuitOpenError
+from app.utils.json_stream import IncrementalJSONParser
+from app.utils.metrics import Counter
 
-client = Groq(
-    api_key=os.getenv("GROQ_API_KEY")
-)
+logger = logging.getLogger(__name__)
 
 SYSTEM_PROMPT = """
 You are an AI Learning Roadmap Planner.
@@ -64,17 +67,76 @@ Return ONLY valid JSON in this exact format:
 }
 """
 
-async def generate_roadmap(profile: dict) -> dict:
+TEMPLATE_SYSTEM_PROMPT = """
+You are an AI Career Decision Agent and Roadmap Personalizer.
+
+Your task:
+- Analyze the student's profile and choose the best-fit career among the
+  candidates. Each candidate comes with a pre-built roadmap template outline.
+- Personalize the chosen template with a small patch. Do NOT write phases,
+  milestones or resources; they already exist.
+- Skip phases the student has clearly already mastered, reorder phases only
+  when their background calls for it, and adjust durations or difficulty to
+  their experience.
+- If none of the candidates fits the student, set "template_id" to null.
+- Each candidate's skill_match_percentage was computed from the student's
+  skills; use the chosen one's for career_decision.skill_match_percentage.
+
+Input JSON:
+{
+  "profile": { ... },
+  "candidates": [
+    { "template_id": "...", "career": "...", "skill_match_percentage": <number 0-100>, "duration_months": <number>,
+      "phases": [ { "index": 0, "title": "...", "duration": "...", "difficulty": "...", "focus_skills": [...] } ] }
+  ]
+}
+
+Return ONLY valid JSON in this exact format:
+{
+  "career_decision": {
+    "career": "<career title>",
+    "reasoning": "<detailed explanation>",
+    "confidence": <number 0-100>,
+    "skill_match_percentage": <number 0-100>,
+    "market_readiness": <number 0-100>,
+    "industry_demand": "<trending|stable|declining>",
+    "key_strengths": ["<strength 1>", "<strength 2>"],
+    "skill_gaps": ["<gap 1>", "<gap 2>"],
+    "time_to_job_ready": "<estimated months>",
+    "alternatives": [
+      {"career": "<alt 1>", "match_score": <0-100>, "reason": "<reason>"}
+    ]
+  },
+  "template_id": "<template_id of the chosen candidate, or null>",
+  "patch": {
+    "duration_months": <number>,
+    "order": [<phase indices in the order to take them>],
+    "skip": [<phase indices to drop>],
+    "durations": {"<phase index>": "<new duration>"},
+    "difficulty": {"<phase index>": "<beginner|intermediate|advanced>"}
+  }
+}
+"""
+
+ROADMAP_GENERATIONS = Counter(
+    "skillroute_roadmap_generations_total",
+    "Roadmaps produced, by source (cache, template patch or full generation)",
+    ("source",)
+)
+
+
+async def generate_full_roadmap(profile: dict) -> dict:
     max_retries = 2
     retry_count = 0
     
     while retry_count < max_retries:
         try:
-            response = client.chat.completions.create(
+            response = await llm_gateway.chat_completion(
+                operation="generate_roadmap",
                 model="groq/compound",
                 messages=[
                     {"role": "system", "content": SYSTEM_PROMPT},
-                    {"role": "user", "content": json.dumps(profile)}
+                    {"role": "user", "content": json.dumps(roadmap_cache.prompt_profile(profile))}
                 ],
                 temperature=1,
                 max_completion_tokens=8000,
@@ -83,19 +145,189 @@ async def generate_roadmap(profile: dict) -> dict:
                 compound_custom={"tools": {"enabled_tools": ["web_search", "code_interpreter", "visit_website"]}}
             )
 
-            content = response.choices[0].message.content
-
-            try:
-                return json.loads(content)
-            except json.JSONDecodeError:
-                raise ValueError("Roadmap agent returned invalid JSON")
+            # Broken sections are repaired on their own; only a completion
+            # with nothing to salvage is generated again
+            return await roadmap_output.validate_roadmap(response.choices[0].message.content, "generate_roadmap")
+        except CircuitOpenError:
+            raise
         except Exception as e:
             retry_count += 1
             if retry_count >= max_retries:
                 raise
-            # Wait a bit before retrying
-            import asyncio
-            await asyncio.sleep(1)
+            await llm_gateway.backoff(retry_count)
+
+
+async def generate_roadmap_from_template(profile: dict):
+    """
+    Asks the model only for a career decision and a patch to the closest
+    template. Returns None when no template fits or the call fails, so the
+    caller can fall back to full generation.
+    """
+    candidates = roadmap_templates.candidate_templates(profile)
+    if not candidates:
+        return None
+
+    try:
+        response = await llm_gateway.chat_completion(
+            operation="generate_roadmap_template",
+            model="groq/compound",
+            messages=[
+                {"role": "system", "content": TEMPLATE_SYSTEM_PROMPT},
+                {"role": "user", "content": json.dumps({
+                    "profile": roadmap_cache.prompt_profile(profile),
+                    "candidates": [roadmap_templates.outline(template) for template in candidates]
+                })}
+            ],
+            temperature=1,
+            max_completion_tokens=1500,
+            top_p=1,
+            stream=False
+        )
+        result = await roadmap_output.validate_template_choice(
+            response.choices[0].message.content, "generate_roadmap_template"
+        )
+    except CircuitOpenError:
+        raise
+    except Exception as e:
+        logger.warning("Template roadmap failed, falling back to full generation: %s", e)
+        return None
+
+    chosen = {template["id"]: template for template in candidates}.get(result.get("template_id"))
+    if chosen is None:
+        return None
+
+    return {
+        "career_decision": result["career_decision"],
+        "learning_roadmap": roadmap_templates.apply_patch(chosen, result.get("patch"))
+    }
+
+
+async def _generate_uncached(profile: dict) -> dict:
+    if ROADMAP_TEMPLATES_ENABLED:
+        result = await generate_roadmap_from_template(profile)
+        if result is not None:
+            ROADMAP_GENERATIONS.inc(source="template")
+            return result
+
+    result = await generate_full_roadmap(profile)
+    ROADMAP_GENERATIONS.inc(source="full")
+    return result
+
+
+async def generate_roadmap(profile: dict, use_cache: bool = True) -> dict:
+    # use_cache=False skips the lookup but still refreshes the cached entry
+    if use_cache:
+        cached = roadmap_cache.get_cached_roadmap(profile)
+        if cached is not None:
+            ROADMAP_GENERATIONS.inc(source="cache")
+            return cached
+
+    try:
+        result = await _generate_uncached(profile)
+    except CircuitOpenError:
+        result = degraded_roadmap(profile)
+        if result is None:
+            raise
+        ROADMAP_GENERATIONS.inc(source="degraded")
+        return result
+
+    roadmap_cache.store_roadmap(profile, result)
+    return result
+
+
+def degraded_roadmap(profile: dict):
+    """
+    What to serve while the Groq circuit is open: a cached roadmap, else the
+    closest template without personalization, marked "degraded". None when
+    neither exists. Degraded results are never cached.
+    """
+    cached = roadmap_cache.get_cached_roadmap(profile)
+    if cached is None and ROADMAP_TEMPLATES_ENABLED:
+        cached = roadmap_templates.local_roadmap(profile)
+    if cached is None:
+        return None
+    return {**cached, "degraded": True}
+
+
+def _is_stream_section(path: tuple) -> bool:
+    if path == ("career_decision",):
+        return True
+    return len(path) == 3 and path[:2] == ("learning_roadmap", "roadmap")
+
+
+def _result_events(result: dict):
+    yield "career_decision", result.get("career_decision", {})
+    for index, phase in enumerate(result.get("learning_roadmap", {}).get("roadmap", [])):
+        yield "phase", {"index": index, "phase": phase}
+    yield "result", result
+
+
+async def stream_roadmap(profile: dict, use_cache: bool = True):
+    """
+    Streams the roadmap completion and yields ("career_decision", dict) and
+    ("phase", {"index", "phase"}) events as soon as each section is complete,
+    followed by ("result", dict) with the full document. Sections are
+    streamed as received; the result has been validated and, where needed,
+    repaired, so it is the one to keep.
+    """
+    result = roadmap_cache.get_cached_roadmap(profile) if use_cache else None
+    if result is not None:
+        ROADMAP_GENERATIONS.inc(source="cache")
+        for event in _result_events(result):
+            yield event
+        return
+
+    try:
+        if ROADMAP_TEMPLATES_ENABLED:
+            # A template patch is small, so there's nothing worth streaming
+            result = await generate_roadmap_from_template(profile)
+        if result is not None:
+            roadmap_cache.store_roadmap(profile, result)
+            ROADMAP_GENERATIONS.inc(source="template")
+            for event in _result_events(result):
+                yield event
+            return
+
+        async for event in _stream_full_roadmap(profile):
+            yield event
+    except CircuitOpenError:
+        result = degraded_roadmap(profile)
+        if result is None:
+            raise
+        ROADMAP_GENERATIONS.inc(source="degraded")
+        for event in _result_events(result):
+            yield event
+
+
+async def _stream_full_roadmap(profile: dict):
+    parser = IncrementalJSONParser(_is_stream_section)
+
+    deltas = llm_gateway.stream_chat_completion(
+        operation="stream_roadmap",
+        model="groq/compound",
+        messages=[
+            {"role": "system", "content": SYSTEM_PROMPT},
+            {"role": "user", "content": json.dumps(roadmap_cache.prompt_profile(profile))}
+        ],
+        temperature=1,
+        max_completion_tokens=8000,
+        top_p=1,
+        compound_custom={"tools": {"enabled_tools": ["web_search", "code_interpreter", "visit_website"]}}
+    )
+
+    async with aclosing(deltas):
+        async for delta in deltas:
+            for path, value in parser.feed(delta):
+                if path == ("career_decision",):
+                    yield "career_decision", value
+                else:
+                    yield "phase", {"index": path[2], "phase": value}
+
+    result = await roadmap_output.validate_roadmap(parser.buffer, "stream_roadmap")
+
+    roadmap_cache.store_roadmap(profile, result)
+    ROADMAP_GENERATIONS.inc(source="full")
+    yield "result", result
 
 
 ADAPT_SYSTEM_PROMPT = """
@@ -127,23 +359,87 @@ Return ONLY valid JSON for the new "learning_roadmap" part:
 }
 """
 
-async def adapt_roadmap(current_data: dict) -> dict:
-    
-    input_data = {
-        "current_roadmap": current_data.get("learning_roadmap"),
-        "progress": current_data.get("progress")
+DELTA_ADAPT_SYSTEM_PROMPT = """
+You are an AI Learning Roadmap Adapter.
+
+Your task:
+- The student has finished part of their roadmap. Completed phases are fixed
+  and given only as a short summary; do not return them.
+- Rewrite the remaining phases based on their progress.
+- If they are progressing well, suggest advanced topics or speed up the timeline.
+- If they are stuck or slow, suggest remedial resources or break down steps further.
+- Build on the skills already covered instead of repeating them.
+
+Input JSON:
+{
+  "completed_phases": [ { "phase": "...", "status": "...", "focus_skills": [...] } ],
+  "remaining_phases": [ { ...full phase... } ],
+  "duration_months": <current total duration>,
+  "progress": { "completed_phases": X, "total_phases": Y, "streak_days": Z }
+}
+
+Return ONLY valid JSON with the replacement remaining phases, in order, in the
+same format as the input phases:
+{
+  "duration_months": <new total duration, including completed phases>,
+  "roadmap": [
+    {
+      "phase": "Phase X: ...",
+      "duration": "...",
+      "difficulty": "...",
+      "focus_skills": [...],
+      "outcomes": [...],
+      "milestones": [...],
+      "prerequisites": [...]
     }
-    
+  ]
+}
+"""
+
+# Per-phase bookkeeping added by storage; the model never needs it
+PHASE_STATE_FIELDS = ("status", "completed_at")
+
+
+def split_for_delta_adapt(learning_roadmap: dict):
+    """
+    Splits the phases into a fixed head, up to and including the last
+    completed phase, and the remaining tail the model may rewrite. Keeping
+    the head in place keeps per-index progress valid after the splice.
+    """
+    phases = learning_roadmap.get("roadmap", [])
+    completed = [i for i, phase in enumerate(phases) if phase.get("status") == "completed"]
+    split = completed[-1] + 1 if completed else 0
+    return phases[:split], phases[split:]
+
+
+def _phase_summary(phase: dict) -> dict:
+    return {
+        "phase": phase.get("phase"),
+        "status": phase.get("status", "pending"),
+        "focus_skills": phase.get("focus_skills", [])
+    }
+
+
+def _strip_phase_state(phase: dict) -> dict:
+    return {key: value for key, value in phase.items() if key not in PHASE_STATE_FIELDS}
+
+
+async def _adapt_completion(system_prompt: str, input_data: dict, duration_months=None, allow_empty: bool = False) -> dict:
+    """
+    Returns the validated learning_roadmap from the adapt response. Raises
+    once the retries are spent rather than keeping the old roadmap unnoticed.
+    """
     max_retries = 2
     retry_count = 0
-    
+
     while retry_count < max_retries:
         try:
-            response = client.chat.completions.create(
+            response = await llm_gateway.chat_completion(
+                operation="adapt_roadmap",
                 model="groq/compound",
                 messages=[
-                    {"role": "system", "content": ADAPT_SYSTEM_PROMPT},
-                    {"role": "user", "content": json.dumps(input_data)}
+                    {"role": "system", "content": system_prompt},
+                    {"role": "user", "content": json.dumps(input_data, default=str)}
                 ],
                 temperature=1,
                 max_completion_tokens=8000,
@@ -152,16 +448,62 @@ async def adapt_roadmap(current_data: dict) -> dict:
                 compound_custom={"tools": {"enabled_tools": ["web_search", "code_interpreter", "visit_website"]}}
             )
 
-            content = response.choices[0].message.content
-
-            try:
-                return json.loads(content)
-            except json.JSONDecodeError:
-                return current_data.get("learning_roadmap")
+            return await roadmap_output.validate_learning_roadmap(
+                response.choices[0].message.content, "adapt_roadmap", duration_months, allow_empty
+            )
+        except CircuitOpenError:
+            raise
         except Exception as e:
             retry_count += 1
             if retry_count >= max_retries:
-                return current_data.get("learning_roadmap")
-            # Wait a bit before retrying
-            import asyncio
-            await asyncio.sleep(1)
+                raise
+            await llm_gateway.backoff(retry_count)
+
+
+async def _adapt_full(current_data: dict) -> dict:
+    learning_roadmap = current_data.get("learning_roadmap") or {}
+    input_data = {
+        "current_roadmap": learning_roadmap,
+        "progress": current_data.get("progress")
+    }
+    return await _adapt_completion(ADAPT_SYSTEM_PROMPT, input_data, learning_roadmap.get("duration_months"))
+
+
+async def _adapt_delta(current_data: dict) -> dict:
+    learning_roadmap = current_data.get("learning_roadmap") or {}
+    head, tail = split_for_delta_adapt(learning_roadmap)
+
+    input_data = {
+        "completed_phases": [_phase_summary(phase) for phase in head],
+        "remaining_phases": [_strip_phase_state(phase) for phase in tail],
+        "duration_months": learning_roadmap.get("duration_months"),
+        "progress": current_data.get("progress")
+    }
+    # With every phase completed there is nothing left that must come back
+    adapted = await _adapt_completion(
+        DELTA_ADAPT_SYSTEM_PROMPT, input_data, learning_roadmap.get("duration_months"), allow_empty=not tail
+    )
+
+    replacement = adapted["roadmap"]
+    # Models sometimes send the completed phases back despite the prompt
+    if head and [phase["phase"] for phase in replacement[:len(head)]] == [phase.get("phase") for phase in head]:
+        replacement = replacement[len(head):]
+
+    # Completed phases are kept verbatim; only the tail is replaced, and the
+    # replacement may be longer or shorter (phases split up or merged)
+    return {
+        **learning_roadmap,
+        "duration_months": adapted["duration_months"],
+        "roadmap": [_strip_phase_state(phase) for phase in head] + replacement
+    }
+
+
+async def adapt_roadmap(current_data: dict) -> dict:
+    """
+    Returns an adapted `learning_roadmap`, or raises if the model's output
+    can't be used (RoadmapOutputError). In "delta" mode (ADAPT_MODE) only
+    the phases after the last completed one are regenerated.
+    """
+    if ADAPT_MODE == "full":
+        return await _adapt_full(current_data)
+    return await _adapt_delta(current_data)
@@ -0,0 +1,78 @@
+import copy
+import hashlib
+import json
+import re
+from app.config import ROADMAP_CACHE_SIZE, ROADMAP_CACHE_TTL_SECONDS
+from app.utils.cache import TTLCache
+
+_cache = TTLCache(maxsize=ROADMAP_CACHE_SIZE, ttl=ROADMAP_CACHE_TTL_SECONDS)
+
+EDUCATION_BUCKETS = [
+    ("phd", ["phd", "ph.d", "doctor"]),
+    ("masters", ["master", "msc", "m.sc", "mba", "m.tech", "mtech"]),
+    ("bachelors", ["bachelor", "bsc", "b.sc", "b.tech", "btech", "undergrad", "degree"]),
+    # Before bootcamp, so a "High School Diploma" isn't read as a diploma course
+    ("high_school", ["high_school", "high school", "secondary"]),
+    ("bootcamp", ["bootcamp", "certificate", "diploma"]),
+]
+
+# Profile fields left out of the cache key, and so also kept out of the
+# prompt: otherwise a cached roadmap could quote another student's name
+UNKEYED_FIELDS = ("name",)
+
+
+def _tokens(value) -> list:
+    if not value:
+        return []
+    if isinstance(value, dict):
+        value = list(value.keys())
+    if isinstance(value, str):
+        value = re.split(r"[,;\n]", value)
+    return sorted({" ".join(str(item).lower().split()) for item in value} - {""})
+
+
+def _text(value) -> str:
+    return " ".join(str(value or "").lower().split())
+
+
+def education_bucket(education: str) -> str:
+    education = _text(education)
+    for bucket, keywords in EDUCATION_BUCKETS:
+        if any(keyword in education for keyword in keywords):
+            return bucket
+    return "other"
+
+
+def prompt_profile(profile: dict) -> dict:
+    """The profile as sent to the LLM: only fields that are part of the key."""
+    return {field: value for field, value in profile.items() if field not in UNKEYED_FIELDS}
+
+
+def canonical_profile(profile: dict) -> dict:
+    # UNKEYED_FIELDS never influence the roadmap, so they are left out.
+    return {
+        "education": education_bucket(profile.get("education")),
+        "skills": _tokens(profile.get("skills")),
+        "interests": _tokens(profile.get("interests")),
+        "goals": _text(profile.get("goals") or profile.get("goal")),
+        "experience": _text(profile.get("experience"))
+    }
+
+
+def profile_cache_key(profile: dict) -> str:
+    canonical = json.dumps(canonical_profile(profile), sort_keys=True)
+    return hashlib.sha256(canonical.encode("utf-8")).hexdigest()
+
+
+def get_cached_roadmap(profile: dict):
+    result = _cache.get(profile_cache_key(profile))
+    # Callers decorate phases with progress state, so never hand out the cached copy
+    return copy.deepcopy(result) if result is not None else None
+
+
+def store_roadmap(profile: dict, result: dict):
+    _cache.set(profile_cache_key(profile), copy.deepcopy(result))
+
+
+def get_stats() -> dict:
+    return _cache.stats()
@@ -0,0 +1,189 @@
+"""
+Schema validation for the roadmap agent's JSON output, with targeted repair.
+
+Completions are parsed leniently (code fences, trailing commas, truncation),
+then each section - the career decision and every phase - is validated on
+its own. Only the sections that fail go back to the model, in parallel,
+with a short prompt and a small token budget. When nothing is salvageable
+RoadmapOutputError is raised and the caller may retry the whole completion.
+"""
+import asyncio
+import json
+import logging
+from pydantic import ValidationError
+from app.config import ROADMAP_REPAIR_MAX_TOKENS
+from app.models.roadmap import CareerDecision, LearningRoadmap, Phase
+from app.services import llm_gateway
+from app.utils.circuit_breaker import CircuitOpenError
+from app.utils.json_repair import OK, TRUNCATED, parse_json
+from app.utils.metrics import STAGE_DURATION, Counter
+
+logger = logging.getLogger(__name__)
+
+REPAIR_SYSTEM_PROMPT = """
+You repair one section of a JSON document written by another model.
+
+Input JSON:
+{
+  "section": "<where the section sits in the document>",
+  "schema": { <JSON schema the section must follow> },
+  "errors": ["<validation error>", ...],
+  "broken": <the section as received, possibly cut off>
+}
+
+Keep the existing content. Fix only what the errors point at, and complete
+anything that was cut off in the same style.
+
+Return ONLY the corrected section as valid JSON.
+"""
+
+OUTPUT_REPAIRS = Counter(
+    "skillroute_llm_output_repairs_total",
+    "Malformed roadmap completions, by operation and outcome (fixed locally, section re-asked, failed)",
+    ("operation", "outcome")
+)
+
+
+class RoadmapOutputError(ValueError):
+    pass
+
+
+def _errors(e: ValidationError) -> list:
+    return [f"{'.'.join(map(str, error['loc']))}: {error['msg']}" for error in e.errors()]
+
+
+def _validate(model, data):
+    """Returns (clean dict, None) or (None, errors)."""
+    try:
+        return model.parse_obj(data).dict(), None
+    except ValidationError as e:
+        return None, _errors(e)
+
+
+def _parse(content: str, operation: str):
+    try:
+        with STAGE_DURATION.time(stage="llm.parse_json"):
+            document, status = parse_json(content)
+    except ValueError as e:
+        OUTPUT_REPAIRS.inc(operation=operation, outcome="failed")
+        raise RoadmapOutputError(f"Roadmap agent returned invalid JSON: {e}")
+    if not isinstance(document, dict):
+        OUTPUT_REPAIRS.inc(operation=operation, outcome="failed")
+        raise RoadmapOutputError("Roadmap agent returned JSON that isn't an object")
+    return document, status
+
+
+async def _repair_section(name: str, model, data, errors: list) -> dict:
+    response = await llm_gateway.chat_completion(
+        operation="repair_output",
+        model="groq/compound",
+        messages=[
+            {"role": "system", "content": REPAIR_SYSTEM_PROMPT},
+            {"role": "user", "content": json.dumps({
+                "section": name,
+                "schema": model.schema(),
+                "errors": errors,
+                "broken": data
+            }, default=str)}
+        ],
+        temperature=0.2,
+        max_completion_tokens=ROADMAP_REPAIR_MAX_TOKENS,
+        top_p=1,
+        stream=False
+    )
+    value, _ = parse_json(response.choices[0].message.content)
+    clean, errors = _validate(model, value)
+    if clean is None:
+        raise RoadmapOutputError(f"Repair of {name} is still invalid: {'; '.join(errors)}")
+    return clean
+
+
+async def _validated_sections(operation: str, status: str, sections: list) -> list:
+    """
+    `sections` holds (name, model, data, suspect) tuples; a suspect section
+    is repaired even if it validates, because it may have been cut short.
+    Returns the clean sections in order.
+    """
+    results = []
+    broken = {}
+    for index, (name, model, data, suspect) in enumerate(sections):
+        clean, errors = _validate(model, data)
+        if clean is None or suspect:
+            errors = errors or ["The section was cut off by the completion's token limit; complete it"]
+            broken[index] = (name, model, data, errors)
+        results.append(clean)
+
+    if not broken:
+        if status != OK:
+            OUTPUT_REPAIRS.inc(operation=operation, outcome="local")
+        return results
+
+    logger.warning("Repairing %d section(s) of %s output: %s", len(broken), operation, ", ".join(args[0] for args in broken.values()))
+    try:
+        repaired = await asyncio.gather(*(_repair_section(*args) for args in broken.values()))
+    except CircuitOpenError:
+        raise
+    except Exception as e:
+        OUTPUT_REPAIRS.inc(operation=operation, outcome="failed")
+        raise RoadmapOutputError(f"Could not repair {operation} output: {e}")
+
+    OUTPUT_REPAIRS.inc(len(broken), operation=operation, outcome="section")
+    for index, clean in zip(broken, repaired):
+        results[index] = clean
+    return results
+
+
+def _phases(learning_roadmap, status: str, prefix: str, allow_empty: bool = False) -> list:
+    phases = learning_roadmap.get("roadmap") if isinstance(learning_roadmap, dict) else None
+    if not isinstance(phases, list) or not (phases or allow_empty):
+        raise RoadmapOutputError("Roadmap agent returned no phases")
+    # On a truncated document only the last phase can be incomplete
+    return [
+        (f"{prefix}roadmap[{index}]", Phase, phase, status == TRUNCATED and index == len(phases) - 1)
+        for index, phase in enumerate(phases)
+    ]
+
+
+def _learning_roadmap(learning_roadmap: dict, phases: list) -> dict:
+    clean, errors = _validate(LearningRoadmap, {**learning_roadmap, "roadmap": phases})
+    if clean is None:
+        raise RoadmapOutputError(f"Roadmap agent returned an invalid roadmap: {'; '.join(errors)}")
+    return clean
+
+
+async def validate_roadmap(content: str, operation: str) -> dict:
+    """A SYSTEM_PROMPT completion -> {"career_decision", "learning_roadmap"}."""
+    document, status = _parse(content, operation)
+    learning_roadmap = document.get("learning_roadmap")
+    sections = [("career_decision", CareerDecision, document.get("career_decision"), False)]
+    sections += _phases(learning_roadmap, status, "learning_roadmap.")
+    career_decision, *phases = await _validated_sections(operation, status, sections)
+    return {
+        "career_decision": career_decision,
+        "learning_roadmap": _learning_roadmap(learning_roadmap, phases)
+    }
+
+
+async def validate_learning_roadmap(content: str, operation: str, duration_months=None, allow_empty: bool = False) -> dict:
+    """
+    An adapt completion -> a learning_roadmap with validated phases.
+    `duration_months` is used if the model left it out.
+    """
+    document, status = _parse(content, operation)
+    if document.get("duration_months") is None:
+        document["duration_months"] = duration_months
+    phases = await _validated_sections(operation, status, _phases(document, status, "", allow_empty))
+    return _learning_roadmap(document, phases)
+
+
+async def validate_template_choice(content: str, operation: str) -> dict:
+    """
+    A TEMPLATE_SYSTEM_PROMPT completion with its career_decision validated.
+    The patch is left as is; apply_patch already ignores invalid entries.
+    """
+    document, status = _parse(content, operation)
+    # The decision comes first, so a cut-off document has usually lost only
+    # (part of) the patch; a decision that was cut short fails validation
+    section = ("career_decision", CareerDecision, document.get("career_decision"), False)
+    career_decision, = await _validated_sections(operation, status, [section])
+    return {**document, "career_decision": career_decision}
@@ -0,0 +1,59 @@
+from app.services.roadmap_agent import generate_roadmap, adapt_roadmap
+from app.services.roadmap_cache import profile_cache_key
+from app.services.storage_service import save_career_analysis, get_active_roadmap_snapshot, adapt_active_roadmap
+from app.utils.singleflight import SingleFlight
+
+# Double-clicks and client retries often start the same generation several
+# times at once. Duplicates join the in-flight call instead of burning
+# another completion and racing on the active roadmap.
+_generate_flights = SingleFlight("generate_roadmap")
+_adapt_flights = SingleFlight("adapt_roadmap")
+
+
+async def _generate_and_save(user_id: str, profile: dict, use_cache: bool) -> dict:
+    result = await generate_roadmap(profile, use_cache=use_cache)
+
+    career_decision = result.get("career_decision", {})
+    learning_roadmap = result.get("learning_roadmap", {})
+
+    await save_career_analysis(
+        user_id=user_id,
+        profile=profile,
+        career_decision=career_decision,
+        roadmap=learning_roadmap
+    )
+
+    return {
+        "status": "success",
+        "user_id": user_id,
+        "career_decision": career_decision,
+        "learning_roadmap": learning_roadmap,
+        "degraded": result.get("degraded", False)
+    }
+
+
+async def generate_and_save_roadmap(user_id: str, profile: dict, use_cache: bool = True) -> dict:
+    key = (user_id, profile_cache_key(profile))
+    return await _generate_flights.do(key, _generate_and_save, user_id, profile, use_cache)
+
+
+async def _adapt_and_save(user_id: str):
+    current_data, version = await get_active_roadmap_snapshot(user_id)
+    if not current_data:
+        return None
+
+    new_roadmap = await adapt_roadmap(current_data)
+
+    return await adapt_active_roadmap(user_id, current_data, version, new_roadmap)
+
+
+async def adapt_and_save_roadmap(user_id: str):
+    """Returns the merged active roadmap, or None if the user has none."""
+    return await _adapt_flights.do(user_id, _adapt_and_save, user_id)
+
+
+def get_stats() -> dict:
+    return {
+        "generate_in_flight": _generate_flights.in_flight(),
+        "adapt_in_flight": _adapt_flights.in_flight()
+    }
@@ -0,0 +1,251 @@
+"""
+Pre-generated roadmap templates, one versioned JSON file per career in
+ROADMAP_TEMPLATE_DIR. The LLM only picks a template and returns a small
+personalization patch, which is applied here deterministically.
+
+New templates are generated offline from the full roadmap prompt:
+
+    python -m app.services.roadmap_templates "DevOps Engineer" "Cloud Engineer"
+"""
+import asyncio
+import copy
+import json
+import os
+import re
+import sys
+import threading
+from app.config import ROADMAP_TEMPLATE_DIR, ROADMAP_TEMPLATE_MIN_SCORE
+from app.services.matching_service import (
+    analyze_industry_demand,
+    calculate_skill_match,
+    catalog_alternatives,
+    rank_careers,
+    rank_careers_by_skills,
+)
+
+DIFFICULTIES = ("beginner", "intermediate", "advanced")
+MAX_CANDIDATES = 3
+
+_PHASE_PREFIX = re.compile(r"^\s*phase\s*\d+\s*[:.\-]\s*", re.IGNORECASE)
+
+
+def template_id(career: str) -> str:
+    return re.sub(r"[^a-z0-9]+", "-", career.lower()).strip("-")
+
+
+def outline(template: dict) -> dict:
+    """What the model sees of a template: phase headers without milestones."""
+    return {
+        "template_id": template["id"],
+        "career": template["career"],
+        "skill_match_percentage": template.get("skill_match_percentage"),
+        "duration_months": template["duration_months"],
+        "phases": [
+            {
+                "index": index,
+                "title": phase["title"],
+                "duration": phase.get("duration"),
+                "difficulty": phase.get("difficulty"),
+                "focus_skills": phase.get("focus_skills", [])
+            }
+            for index, phase in enumerate(template["phases"])
+        ]
+    }
+
+
+def _indices(values, count: int) -> list:
+    result = []
+    for value in values if isinstance(values, list) else []:
+        try:
+            index = int(value)
+        except (TypeError, ValueError):
+            continue
+        if 0 <= index < count and index not in result:
+            result.append(index)
+    return result
+
+
+def _by_index(values: dict, index: int):
+    if not isinstance(values, dict):
+        return None
+    return values.get(str(index), values.get(index))
+
+
+def apply_patch(template: dict, patch: dict) -> dict:
+    """
+    Builds a learning_roadmap from a template and a patch of the form
+    {"order": [...], "skip": [...], "durations": {i: str},
+    "difficulty": {i: str}, "duration_months": n}. Invalid entries are
+    ignored, and a patch can never drop every phase.
+    """
+    phases = template["phases"]
+    patch = patch if isinstance(patch, dict) else {}
+
+    skip = set(_indices(patch.get("skip"), len(phases)))
+    order = [index for index in _indices(patch.get("order"), len(phases)) if index not in skip]
+    order += [index for index in range(len(phases)) if index not in order and index not in skip]
+    if not order:
+        order = list(range(len(phases)))
+
+    roadmap = []
+    for position, index in enumerate(order, start=1):
+        phase = copy.deepcopy(phases[index])
+        phase = {"phase": f"Phase {position}: {phase.pop('title')}", **phase}
+
+        duration = _by_index(patch.get("durations"), index)
+        if isinstance(duration, str) and duration.strip():
+            phase["duration"] = duration.strip()
+        difficulty = _by_index(patch.get("difficulty"), index)
+        if difficulty in DIFFICULTIES:
+            phase["difficulty"] = difficulty
+        roadmap.append(phase)
+
+    duration_months = patch.get("duration_months")
+    if not isinstance(duration_months, (int, float)) or isinstance(duration_months, bool) or duration_months <= 0:
+        duration_months = round(template["duration_months"] * len(order) / len(phases), 1)
+
+    return {
+        "duration_months": duration_months,
+        "roadmap": roadmap,
+        "template": {"id": template["id"], "version": template["version"]}
+    }
+
+
+def load_templates(directory: str = ROADMAP_TEMPLATE_DIR) -> dict:
+    templates = {}
+    if not os.path.isdir(directory):
+        return templates
+    for name in sorted(os.listdir(directory)):
+        if not name.endswith(".json"):
+            continue
+        with open(os.path.join(directory, name), encoding="utf-8") as f:
+            template = json.load(f)
+        templates[template["id"]] = template
+    return templates
+
+
+_templates = None
+_by_career = None
+_templates_lock = threading.Lock()
+
+
+def get_templates() -> dict:
+    global _templates, _by_career
+    if _templates is None:
+        with _templates_lock:
+            if _templates is None:
+                templates = load_templates()
+                _by_career = {template["career"].lower(): template for template in templates.values()}
+                _templates = templates
+    return _templates
+
+
+def _ranked_templates(profile: dict) -> list:
+    if not get_templates():
+        return []
+    candidates = []
+    for ranked in rank_careers(profile, top_k=10):
+        template = _by_career.get(ranked["career"].lower())
+        if template is not None and ranked["score"] >= ROADMAP_TEMPLATE_MIN_SCORE:
+            candidates.append((template, ranked))
+        if len(candidates) == MAX_CANDIDATES:
+            break
+    return candidates
+
+
+def candidate_templates(profile: dict) -> list:
+    """
+    Templates of the best-ranked catalog careers for this profile, each with
+    the profile's skill match against the career's catalog skills (scored
+    in one batch), so the model is handed the numbers instead of guessing.
+    """
+    candidates = _ranked_templates(profile)
+    if not candidates:
+        return []
+    scores = rank_careers_by_skills(
+        profile.get("skills"), {template["id"]: ranked["skills"] for template, ranked in candidates}
+    )
+    match = {score["career"]: score["match_percentage"] for score in scores}
+    return [{**template, "skill_match_percentage": match[template["id"]]} for template, _ in candidates]
+
+
+def local_roadmap(profile: dict):
+    """
+    Roadmap for when the LLM is unavailable: the closest template as-is and a
+    career decision derived from the catalog, or None if no template fits.
+    """
+    candidates = _ranked_templates(profile)
+    if not candidates:
+        return None
+    template, ranked = candidates[0]
+
+    match = calculate_skill_match(profile.get("skills"), ranked["skills"])
+    learning_roadmap = apply_patch(template, {})
+    learning_roadmap["degraded"] = True
+
+    return {
+        "career_decision": {
+            "career": template["career"],
+            "reasoning": (
+                "Picked from the career catalog by matching your skills and interests, "
+                "because the AI advisor is temporarily unavailable. Generate again later "
+                "for a personalized analysis."
+            ),
+            "confidence": int(ranked["score"]),
+            "skill_match_percentage": match["match_percentage"],
+            "market_readiness": 0,
+            "industry_demand": analyze_industry_demand(template["career"])["demand_level"],
+            "key_strengths": match["matched_skills"],
+            "skill_gaps": match["missing_skills"],
+            "time_to_job_ready": f"{learning_roadmap['duration_months']} months",
+            "alternatives": catalog_alternatives(profile, template["career"])
+        },
+        "learning_roadmap": learning_roadmap
+    }
+
+
+def template_from_roadmap(career: str, learning_roadmap: dict, version: int = 1) -> dict:
+    phases = []
+    for phase in learning_roadmap.get("roadmap", []):
+        phase = {key: value for key, value in phase.items() if key not in ("status", "completed_at")}
+        phase = {"title": _PHASE_PREFIX.sub("", phase.pop("phase", "")), **phase}
+        phases.append(phase)
+    return {
+        "id": template_id(career),
+        "version": version,
+        "career": career,
+        "duration_months": learning_roadmap.get("duration_months", len(phases)),
+        "phases": phases
+    }
+
+
+async def generate_template(career: str) -> dict:
+    # Imported here: roadmap_agent imports this module
+    from app.services.roadmap_agent import generate_full_roadmap
+
+    profile = {
+        "name": "Template",
+        "education": "bachelors",
+        "skills": "",
+        "interests": career,
+        "goals": f"Become a {career} starting from the basics",
+        "experience": None
+    }
+    result = await generate_full_roadmap(profile)
+    existing = get_templates().get(template_id(career))
+    version = existing["version"] + 1 if existing else 1
+    return template_from_roadmap(career, result.get("learning_roadmap", {}), version)
+
+
+async def _generate_templates(careers: list):
+    for career in careers:
+        template = await generate_template(career)
+        path = os.path.join(ROADMAP_TEMPLATE_DIR, f"{template['id']}.json")
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump(template, f, indent=2)
+            f.write("\n")
+        print(f"Wrote {path} (version {template['version']})")
+
+
+if __name__ == "__main__":
+    asyncio.run(_generate_templates(sys.argv[1:]))
@@ -0,0 +1,199 @@
+import json
+import re
+import threading
+from app.config import SKILL_TAXONOMY_PATH
+
+# Related skills weaker than this don't count as transferable
+TRANSFER_MIN_STRENGTH = 0.3
+
+_SPLIT = re.compile(r"[,;|\n]+")
+_SQUASH = re.compile(r"[\s._\-]+")
+
+
+def skill_key(skill: str) -> str:
+    # "Node.js", "node js" and "NodeJS" all become "nodejs"; "+" and "#"
+    # are kept so C, C++ and C# stay distinct.
+    return _SQUASH.sub("", skill.strip().lower())
+
+
+def parse_skills(skills) -> list:
+    """Accepts "Python, React", a list of names, or a {skill: level} dict."""
+    if not skills:
+        return []
+    if isinstance(skills, dict):
+        skills = list(skills)
+    elif isinstance(skills, str):
+        skills = _SPLIT.split(skills)
+    return [skill.strip() for skill in skills if isinstance(skill, str) and skill.strip()]
+
+
+class RequirementMatrix:
+    """
+    Required skills of many careers as a (careers x skills) 0/1 matrix, built
+    once and scored against any profile with one matrix-vector product.
+    Required skills missing from the taxonomy get extra columns that only
+    match exactly.
+    """
+
+    def __init__(self, matrix, extra_keys: dict, counts):
+        self.matrix = matrix
+        self.extra_keys = extra_keys
+        self.counts = counts
+
+    def __len__(self):
+        return self.matrix.shape[0]
+
+
+class SkillTaxonomy:
+    # numpy is imported where it's used: this module is imported with the
+    # app, but the matrices are only built on the first match.
+
+    def __init__(self, document: dict):
+        import numpy as np
+
+        skills = document["skills"]
+        self.version = document.get("version", 1)
+        self.ids = [skill["id"] for skill in skills]
+        self.names = [skill["name"] for skill in skills]
+        self.categories = [skill.get("category") for skill in skills]
+
+        self._index = {}
+        for i, skill in enumerate(skills):
+            for alias in [skill["id"], skill["name"], *skill.get("aliases", [])]:
+                self._index.setdefault(skill_key(alias), i)
+
+        # Dense transfer matrix: transfer[a, b] is how much holding skill b
+        # counts towards required skill a. The taxonomy is a few hundred
+        # skills, so this stays well under a megabyte.
+        position = {skill_id: i for i, skill_id in enumerate(self.ids)}
+        self.transfer = np.eye(len(skills), dtype=np.float32)
+        for a, b, strength in document.get("related", []):
+            i, j = position[a], position[b]
+            self.transfer[i, j] = self.transfer[j, i] = strength
+        self.transfer[self.transfer < TRANSFER_MIN_STRENGTH] = 0
+
+    @classmethod
+    def from_file(cls, path: str) -> "SkillTaxonomy":
+        with open(path, encoding="utf-8") as f:
+            return cls(json.load(f))
+
+    def __len__(self):
+        return len(self.ids)
+
+    def resolve(self, skill: str):
+        """Index of the canonical skill, or None if it isn't in the taxonomy."""
+        return self._index.get(skill_key(skill))
+
+    def canonical_name(self, skill: str) -> str:
+        index = self.resolve(skill)
+        return self.names[index] if index is not None else skill.strip()
+
+    def _profile_vectors(self, profile_skills: list):
+        import numpy as np
+
+        held = np.zeros(len(self), dtype=bool)
+        unknown = set()
+        for skill in profile_skills:
+            index = self.resolve(skill)
+            if index is None:
+                unknown.add(skill_key(skill))
+            else:
+                held[index] = True
+
+        # Best credit per taxonomy skill over everything the profile holds
+        if held.any():
+            held_transfer = self.transfer[:, held]
+            credit = held_transfer.max(axis=1)
+            source = np.flatnonzero(held)[held_transfer.argmax(axis=1)]
+        else:
+            credit = np.zeros(len(self), dtype=np.float32)
+            source = np.full(len(self), -1)
+        return credit, source, unknown
+
+    def requirement_matrix(self, requirements: list) -> RequirementMatrix:
+        """`requirements` holds one list of required skill names per career."""
+        import numpy as np
+
+        extra_keys = {}
+        cells = []
+        for row, required in enumerate(requirements):
+            for skill in required:
+                index = self.resolve(skill)
+                if index is None:
+                    index = len(self) + extra_keys.setdefault(skill_key(skill), len(extra_keys))
+                cells.append((row, index))
+
+        matrix = np.zeros((len(requirements), len(self) + len(extra_keys)), dtype=np.float32)
+        if cells:
+            rows, cols = zip(*cells)
+            matrix[rows, cols] = 1
+        return RequirementMatrix(matrix, extra_keys, matrix.sum(axis=1))
+
+    def score(self, profile_skills: list, requirements: RequirementMatrix):
+        """Match percentage (0-100) of the profile against every career, as an array."""
+        import numpy as np
+
+        credit, _, unknown = self._profile_vectors(profile_skills)
+        extra = np.zeros(len(requirements.extra_keys), dtype=np.float32)
+        for key, column in requirements.extra_keys.items():
+            if key in unknown:
+                extra[column] = 1
+        covered = requirements.matrix @ np.concatenate([credit, extra])
+        return np.divide(
+            covered * 100, requirements.counts,
+            out=np.zeros_like(covered), where=requirements.counts > 0
+        )
+
+    def match(self, profile_skills: list, required_skills: list) -> dict:
+        credit, source, unknown = self._profile_vectors(profile_skills)
+
+        matched, missing, transferable = [], [], []
+        total = 0.0
+        seen = set()
+        for skill in required_skills:
+            key = skill_key(skill)
+            index = self.resolve(skill)
+            if key in seen or (index is not None and index in seen):
+                continue
+            seen.add(index if index is not None else key)
+
+            if index is None:
+                if key in unknown:
+                    matched.append(skill.strip())
+                    total += 1
+                else:
+                    missing.append(skill.strip())
+                continue
+
+            strength = float(credit[index])
+            if strength >= 1:
+                matched.append(self.names[index])
+            elif strength > 0:
+                transferable.append({
+                    "skill": self.names[index],
+                    "from": self.names[source[index]],
+                    "strength": round(strength, 2)
+                })
+            else:
+                missing.append(self.names[index])
+            total += strength
+
+        return {
+            "match_percentage": int(total / len(seen) * 100) if seen else 0,
+            "matched_skills": matched,
+            "missing_skills": missing,
+            "transferable_skills": transferable
+        }
+
+
+_taxonomy = None
+_taxonomy_lock = threading.Lock()
+
+
+def get_taxonomy() -> SkillTaxonomy:
+    global _taxonomy
+    if _taxonomy is None:
+        with _taxonomy_lock:
+            if _taxonomy is None:
+                _taxonomy = SkillTaxonomy.from_file(SKILL_TAXONOMY_PATH)
+    return _taxonomy
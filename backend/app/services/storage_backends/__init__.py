@@ -0,0 +1,64 @@
+import threading
+from app.config import STORAGE_BACKEND, SQLITE_PATH
+from app.services.storage_backends.base import AsyncStorageBackend, StorageBackend, VersionConflict
+
+_backend = None
+_async_backend = None
+_backend_lock = threading.Lock()
+
+
+def create_backend(name: str) -> StorageBackend:
+    # Backends are imported lazily so the Firestore client (and its
+    # credentials) are only loaded when Firestore is actually selected.
+    if name == "firestore":
+        from app.services.storage_backends.firestore_backend import FirestoreBackend
+        return FirestoreBackend()
+    if name == "sqlite":
+        from app.services.storage_backends.sqlite_backend import SQLiteBackend
+        return SQLiteBackend(SQLITE_PATH)
+    if name == "memory":
+        from app.services.storage_backends.memory_backend import MemoryBackend
+        return MemoryBackend()
+    raise ValueError(f"Unknown storage backend: {name}")
+
+
+def get_backend() -> StorageBackend:
+    global _backend
+    if _backend is None:
+        with _backend_lock:
+            if _backend is None:
+                _backend = create_backend(STORAGE_BACKEND)
+    return _backend
+
+
+def create_async_backend(name: str) -> AsyncStorageBackend:
+    if name == "firestore":
+        from app.services.storage_backends.firestore_backend import AsyncFirestoreBackend
+        return AsyncFirestoreBackend()
+    # SQLite and the memory store have no async driver
+    from app.services.storage_backends.threaded_backend import ThreadedAsyncBackend
+    return ThreadedAsyncBackend(get_backend())
+
+
+def get_async_backend() -> AsyncStorageBackend:
+    global _async_backend
+    if _async_backend is None:
+        # Created outside the lock: the threaded adapter takes it in get_backend()
+        backend = create_async_backend(STORAGE_BACKEND)
+        with _backend_lock:
+            if _async_backend is None:
+                _async_backend = backend
+    return _async_backend
+
+
+def set_backend(backend: StorageBackend):
+    """Replaces the sync backend; the async one then runs it in the threadpool."""
+    global _backend, _async_backend
+    from app.services.storage_backends.threaded_backend import ThreadedAsyncBackend
+    _backend = backend
+    _async_backend = ThreadedAsyncBackend(backend)
+
+
+def set_async_backend(backend: AsyncStorageBackend):
+    global _async_backend
+    _async_backend = backend
@@ -0,0 +1,134 @@
+from abc import ABC, abstractmethod
+
+
+class VersionConflict(Exception):
+    """Raised when a conditional write finds the document has changed."""
+
+
+def apply_phase_update(data: dict, phase_index: int, phase_state: dict, progress: dict, completed_delta: int, updated_at):
+    data["learning_roadmap"]["roadmap"][phase_index].update(phase_state)
+    data["progress"].update(progress)
+    data["progress"]["completed_phases"] = data["progress"].get("completed_phases", 0) + completed_delta
+    data["updated_at"] = updated_at
+
+
+class StorageBackend(ABC):
+    """
+    Persistence for profiles, analyses, active roadmaps and progress.
+
+    Active roadmaps are returned together with an opaque `version` that
+    changes on every write; it is used as the precondition for
+    `replace_active_roadmap`.
+    """
+
+    @abstractmethod
+    def get_profile(self, user_id: str):
+        ...
+
+    @abstractmethod
+    def save_profile(self, user_id: str, profile: dict):
+        ...
+
+    @abstractmethod
+    def save_analysis(self, user_id: str, analysis: dict, active_roadmap: dict):
+        """Atomically appends to the analysis history and replaces the active roadmap. Returns the new version."""
+
+    def save_analyses(self, items: list) -> list:
+        """
+        save_analysis for many users; `items` holds (user_id, analysis,
+        active_roadmap) tuples. Returns the new versions in order. Backends
+        that can batch writes override this.
+        """
+        return [self.save_analysis(*item) for item in items]
+
+    @abstractmethod
+    def get_active_roadmap(self, user_id: str):
+        """Returns (data, version), or (None, None) if there is no active roadmap."""
+
+    @abstractmethod
+    def set_active_roadmap(self, user_id: str, data: dict):
+        """Returns the new version."""
+
+    @abstractmethod
+    def replace_active_roadmap(self, user_id: str, data: dict, expected_version):
+        """
+        Replaces the active roadmap only if it is still at `expected_version`.
+        Returns the new version, None if the roadmap no longer exists, and
+        raises VersionConflict if it has changed.
+        """
+
+    @abstractmethod
+    def merge_active_roadmap(self, user_id: str, merge):
+        """
+        Atomically applies `merge(existing_data) -> new_data` to the active
+        roadmap. Returns (new_data, version), where version may be None if
+        the backend cannot report it, or (None, None) if there is no roadmap.
+        """
+
+    @abstractmethod
+    def update_phase(self, user_id: str, phase_index: int, phase_state: dict, progress: dict, completed_delta: int, updated_at, expected_version):
+        """
+        Writes one phase's state, the given progress fields and adjusts
+        progress.completed_phases by `completed_delta`, only if the roadmap
+        is still at `expected_version` (the delta was computed from it).
+        Returns the new version, None if there is no active roadmap, and
+        raises VersionConflict if it has changed.
+        """
+
+    @abstractmethod
+    def delete_active_roadmap(self, user_id: str) -> bool:
+        ...
+
+    def watch_active_roadmap(self, user_id: str, on_change):
+        """
+        Calls `on_change(data, version)` whenever the active roadmap changes
+        (data is None after a delete). Returns an unsubscribe callable, or
+        None if the backend has no change feed.
+        """
+        return None
+
+
+class AsyncStorageBackend(ABC):
+    """
+    Awaitable counterpart of StorageBackend, used by storage_service. Same
+    methods and return values; change feeds stay on the sync backend.
+    """
+
+    @abstractmethod
+    async def get_profile(self, user_id: str):
+        ...
+
+    @abstractmethod
+    async def save_profile(self, user_id: str, profile: dict):
+        ...
+
+    @abstractmethod
+    async def save_analysis(self, user_id: str, analysis: dict, active_roadmap: dict):
+        ...
+
+    async def save_analyses(self, items: list) -> list:
+        return [await self.save_analysis(*item) for item in items]
+
+    @abstractmethod
+    async def get_active_roadmap(self, user_id: str):
+        ...
+
+    @abstractmethod
+    async def set_active_roadmap(self, user_id: str, data: dict):
+        ...
+
+    @abstractmethod
+    async def replace_active_roadmap(self, user_id: str, data: dict, expected_version):
+        ...
+
+    @abstractmethod
+    async def merge_active_roadmap(self, user_id: str, merge):
+        ...
+
+    @abstractmethod
+    async def update_phase(self, user_id: str, phase_index: int, phase_state: dict, progress: dict, completed_delta: int, updated_at, expected_version):
+        ...
+
+    @abstractmethod
+    async def delete_active_roadmap(self, user_id: str) -> bool:
+        ...
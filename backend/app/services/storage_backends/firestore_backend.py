@@ -0,0 +1,268 @@
+from datetime import datetime
+from firebase_admin import firestore
+from google.api_core.exceptions import FailedPrecondition, NotFound
+from app.utils.firebase import get_async_db, get_db
+from app.services.storage_backends.base import AsyncStorageBackend, StorageBackend, VersionConflict
+
+# Firestore's per-batch write limit
+MAX_BATCH_WRITES = 500
+
+
+def _fold_phase_status(data: dict) -> dict:
+    # Progress clicks write only phase_status.<index>; fold those overrides
+    # back into the phases so callers see the usual document shape.
+    overrides = data.pop("phase_status", None) or {}
+    roadmap = data.get("learning_roadmap", {}).get("roadmap", [])
+    for key, phase_state in overrides.items():
+        idx = int(key)
+        if 0 <= idx < len(roadmap):
+            roadmap[idx].update(phase_state)
+    return data
+
+
+def _with_empty_phase_status(data: dict) -> dict:
+    # Full writes carry statuses inline, so any field-level overrides are reset
+    return {**data, "phase_status": {}}
+
+
+def _batches(db, writes: list):
+    # Up to MAX_BATCH_WRITES operations per batch
+    for start in range(0, len(writes), MAX_BATCH_WRITES):
+        batch = db.batch()
+        for operation, ref, data in writes[start:start + MAX_BATCH_WRITES]:
+            if operation == "delete":
+                batch.delete(ref)
+            else:
+                getattr(batch, operation)(ref, data)
+        yield batch
+
+
+def commit_writes(writes: list) -> list:
+    """
+    Commits ("set" | "create" | "update" | "delete", ref, data) operations
+    through WriteBatches and returns their WriteResults in order. Each batch
+    holds up to MAX_BATCH_WRITES operations and commits atomically.
+    """
+    results = []
+    for batch in _batches(get_db(), writes):
+        results.extend(batch.commit())
+    return results
+
+
+async def commit_writes_async(writes: list) -> list:
+    """commit_writes on the asyncio client; refs must come from it too."""
+    results = []
+    for batch in _batches(get_async_db(), writes):
+        results.extend(await batch.commit())
+    return results
+
+
+@firestore.transactional
+def _merge_in_transaction(transaction, ref, merge):
+    snapshot = ref.get(transaction=transaction)
+    if not snapshot.exists:
+        return None
+
+    data = merge(_fold_phase_status(snapshot.to_dict()))
+    transaction.set(ref, _with_empty_phase_status(data))
+    return data
+
+
+@firestore.async_transactional
+async def _merge_in_async_transaction(transaction, ref, merge):
+    snapshot = await ref.get(transaction=transaction)
+    if not snapshot.exists:
+        return None
+
+    data = merge(_fold_phase_status(snapshot.to_dict()))
+    transaction.set(ref, _with_empty_phase_status(data))
+    return data
+
+
+def _phase_updates(phase_index: int, phase_state: dict, progress: dict, completed_delta: int, updated_at) -> dict:
+    updates = {f"phase_status.{phase_index}": phase_state, "updated_at": updated_at}
+    for field, value in progress.items():
+        updates[f"progress.{field}"] = value
+    if completed_delta:
+        updates["progress.completed_phases"] = firestore.Increment(completed_delta)
+    return updates
+
+
+class FirestoreBackend(StorageBackend):
+
+    def _user_ref(self, user_id: str):
+        return get_db().collection("users").document(user_id)
+
+    def _active_roadmap_ref(self, user_id: str):
+        return self._user_ref(user_id).collection("active_roadmap").document("current")
+
+    def get_profile(self, user_id: str):
+        doc = self._user_ref(user_id).get()
+        if doc.exists:
+            return doc.to_dict().get("profile")
+        return None
+
+    def save_profile(self, user_id: str, profile: dict):
+        self._user_ref(user_id).set({
+            "profile": profile,
+            "updated_at": datetime.utcnow()
+        }, merge=True)
+
+    def save_analysis(self, user_id: str, analysis: dict, active_roadmap: dict):
+        analysis_ref = self._user_ref(user_id).collection("analyses").document()
+        results = commit_writes([
+            ("set", analysis_ref, analysis),
+            ("set", self._active_roadmap_ref(user_id), _with_empty_phase_status(active_roadmap))
+        ])
+        return results[1].update_time
+
+    def save_analyses(self, items: list) -> list:
+        writes = []
+        for user_id, analysis, active_roadmap in items:
+            # Two writes per user and an even batch limit, so a user's history
+            # and active roadmap always land in the same batch
+            writes.append(("set", self._user_ref(user_id).collection("analyses").document(), analysis))
+            writes.append(("set", self._active_roadmap_ref(user_id), _with_empty_phase_status(active_roadmap)))
+        return [result.update_time for result in commit_writes(writes)[1::2]]
+
+    def get_active_roadmap(self, user_id: str):
+        doc = self._active_roadmap_ref(user_id).get()
+        if doc.exists:
+            return _fold_phase_status(doc.to_dict()), doc.update_time
+        return None, None
+
+    def set_active_roadmap(self, user_id: str, data: dict):
+        result = self._active_roadmap_ref(user_id).set(_with_empty_phase_status(data))
+        return result.update_time
+
+    def replace_active_roadmap(self, user_id: str, data: dict, expected_version):
+        try:
+            result = self._active_roadmap_ref(user_id).update(
+                _with_empty_phase_status(data),
+                option=get_db().write_option(last_update_time=expected_version)
+            )
+        except NotFound:
+            return None
+        except FailedPrecondition:
+            raise VersionConflict()
+        return result.update_time
+
+    def merge_active_roadmap(self, user_id: str, merge):
+        data = _merge_in_transaction(get_db().transaction(), self._active_roadmap_ref(user_id), merge)
+        # The commit time of a transaction isn't returned
+        return data, None
+
+    def update_phase(self, user_id: str, phase_index: int, phase_state: dict, progress: dict, completed_delta: int, updated_at, expected_version):
+        updates = _phase_updates(phase_index, phase_state, progress, completed_delta, updated_at)
+        try:
+            result = self._active_roadmap_ref(user_id).update(
+                updates, option=get_db().write_option(last_update_time=expected_version)
+            )
+        except NotFound:
+            return None
+        except FailedPrecondition:
+            raise VersionConflict()
+        return result.update_time
+
+    def delete_active_roadmap(self, user_id: str) -> bool:
+        ref = self._active_roadmap_ref(user_id)
+        if not ref.get().exists:
+            return False
+        ref.delete()
+        return True
+
+    def watch_active_roadmap(self, user_id: str, on_change):
+        def on_snapshot(snapshots, changes, read_time):
+            for snapshot in snapshots:
+                if snapshot.exists:
+                    on_change(_fold_phase_status(snapshot.to_dict()), snapshot.update_time)
+                else:
+                    on_change(None, None)
+
+        watch = self._active_roadmap_ref(user_id).on_snapshot(on_snapshot)
+        return watch.unsubscribe
+
+
+class AsyncFirestoreBackend(AsyncStorageBackend):
+    """
+    FirestoreBackend on the asyncio client. Each RPC awaits on the event loop
+    instead of holding a threadpool thread for its round trip.
+    """
+
+    def _user_ref(self, user_id: str):
+        return get_async_db().collection("users").document(user_id)
+
+    def _active_roadmap_ref(self, user_id: str):
+        return self._user_ref(user_id).collection("active_roadmap").document("current")
+
+    async def get_profile(self, user_id: str):
+        doc = await self._user_ref(user_id).get()
+        if doc.exists:
+            return doc.to_dict().get("profile")
+        return None
+
+    async def save_profile(self, user_id: str, profile: dict):
+        await self._user_ref(user_id).set({
+            "profile": profile,
+            "updated_at": datetime.utcnow()
+        }, merge=True)
+
+    async def save_analysis(self, user_id: str, analysis: dict, active_roadmap: dict):
+        results = await commit_writes_async([
+            ("set", self._user_ref(user_id).collection("analyses").document(), analysis),
+            ("set", self._active_roadmap_ref(user_id), _with_empty_phase_status(active_roadmap))
+        ])
+        return results[1].update_time
+
+    async def save_analyses(self, items: list) -> list:
+        writes = []
+        for user_id, analysis, active_roadmap in items:
+            # Pairs stay within one batch, as in FirestoreBackend.save_analyses
+            writes.append(("set", self._user_ref(user_id).collection("analyses").document(), analysis))
+            writes.append(("set", self._active_roadmap_ref(user_id), _with_empty_phase_status(active_roadmap)))
+        return [result.update_time for result in (await commit_writes_async(writes))[1::2]]
+
+    async def get_active_roadmap(self, user_id: str):
+        doc = await self._active_roadmap_ref(user_id).get()
+        if doc.exists:
+            return _fold_phase_status(doc.to_dict()), doc.update_time
+        return None, None
+
+    async def set_active_roadmap(self, user_id: str, data: dict):
+        result = await self._active_roadmap_ref(user_id).set(_with_empty_phase_status(data))
+        return result.update_time
+
+    async def replace_active_roadmap(self, user_id: str, data: dict, expected_version):
+        try:
+            result = await self._active_roadmap_ref(user_id).update(
+                _with_empty_phase_status(data),
+                option=get_async_db().write_option(last_update_time=expected_version)
+            )
+        except NotFound:
+            return None
+        except FailedPrecondition:
+            raise VersionConflict()
+        return result.update_time
+
+    async def merge_active_roadmap(self, user_id: str, merge):
+        data = await _merge_in_async_transaction(get_async_db().transaction(), self._active_roadmap_ref(user_id), merge)
+        return data, None
+
+    async def update_phase(self, user_id: str, phase_index: int, phase_state: dict, progress: dict, completed_delta: int, updated_at, expected_version):
+        updates = _phase_updates(phase_index, phase_state, progress, completed_delta, updated_at)
+        try:
+            result = await self._active_roadmap_ref(user_id).update(
+                updates, option=get_async_db().write_option(last_update_time=expected_version)
+            )
+        except NotFound:
+            return None
+        except FailedPrecondition:
+            raise VersionConflict()
+        return result.update_time
+
+    async def delete_active_roadmap(self, user_id: str) -> bool:
+        ref = self._active_roadmap_ref(user_id)
+        if not (await ref.get()).exists:
+            return False
+        await ref.delete()
+        return True
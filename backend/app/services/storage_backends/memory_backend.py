@@ -0,0 +1,77 @@
+import copy
+import threading
+from collections import defaultdict
+from app.services.storage_backends.base import StorageBackend, VersionConflict, apply_phase_update
+
+
+class MemoryBackend(StorageBackend):
+    """Process-local storage for tests, benchmarks and single-worker demos."""
+
+    def __init__(self):
+        self._lock = threading.RLock()
+        self._profiles = {}
+        self._analyses = defaultdict(list)
+        self._active_roadmaps = {}
+        self._versions = {}
+        self._next_version = 0
+
+    def _bump(self, user_id: str) -> int:
+        self._next_version += 1
+        self._versions[user_id] = self._next_version
+        return self._next_version
+
+    def get_profile(self, user_id: str):
+        with self._lock:
+            return copy.deepcopy(self._profiles.get(user_id))
+
+    def save_profile(self, user_id: str, profile: dict):
+        with self._lock:
+            self._profiles[user_id] = copy.deepcopy(profile)
+
+    def save_analysis(self, user_id: str, analysis: dict, active_roadmap: dict):
+        with self._lock:
+            self._analyses[user_id].append(copy.deepcopy(analysis))
+            self._active_roadmaps[user_id] = copy.deepcopy(active_roadmap)
+            return self._bump(user_id)
+
+    def get_active_roadmap(self, user_id: str):
+        with self._lock:
+            if user_id not in self._active_roadmaps:
+                return None, None
+            return copy.deepcopy(self._active_roadmaps[user_id]), self._versions[user_id]
+
+    def set_active_roadmap(self, user_id: str, data: dict):
+        with self._lock:
+            self._active_roadmaps[user_id] = copy.deepcopy(data)
+            return self._bump(user_id)
+
+    def replace_active_roadmap(self, user_id: str, data: dict, expected_version):
+        with self._lock:
+            if user_id not in self._active_roadmaps:
+                return None
+            if self._versions[user_id] != expected_version:
+                raise VersionConflict()
+            self._active_roadmaps[user_id] = copy.deepcopy(data)
+            return self._bump(user_id)
+
+    def merge_active_roadmap(self, user_id: str, merge):
+        with self._lock:
+            if user_id not in self._active_roadmaps:
+                return None, None
+            data = merge(copy.deepcopy(self._active_roadmaps[user_id]))
+            self._active_roadmaps[user_id] = copy.deepcopy(data)
+            return data, self._bump(user_id)
+
+    def update_phase(self, user_id: str, phase_index: int, phase_state: dict, progress: dict, completed_delta: int, updated_at, expected_version):
+        with self._lock:
+            if user_id not in self._active_roadmaps:
+                return None
+            if self._versions[user_id] != expected_version:
+                raise VersionConflict()
+            apply_phase_update(self._active_roadmaps[user_id], phase_index, phase_state, progress, completed_delta, updated_at)
+            return self._bump(user_id)
+
+    def delete_active_roadmap(self, user_id: str) -> bool:
+        with self._lock:
+            self._versions.pop(user_id, None)
+            return self._active_roadmaps.pop(user_id, None) is not None
@@ -0,0 +1,176 @@
+import json
+import sqlite3
+import threading
+from contextlib import contextmanager
+from datetime import datetime
+from app.services.storage_backends.base import StorageBackend, VersionConflict, apply_phase_update
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS profiles (
+    user_id TEXT PRIMARY KEY,
+    profile TEXT NOT NULL,
+    updated_at TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS analyses (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    user_id TEXT NOT NULL,
+    data TEXT NOT NULL,
+    created_at TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS analyses_user_id ON analyses (user_id);
+CREATE TABLE IF NOT EXISTS active_roadmaps (
+    user_id TEXT PRIMARY KEY,
+    data TEXT NOT NULL,
+    version INTEGER NOT NULL
+);
+CREATE TABLE IF NOT EXISTS roadmap_versions (
+    user_id TEXT PRIMARY KEY,
+    version INTEGER NOT NULL
+);
+"""
+
+
+def _encode(value):
+    if isinstance(value, datetime):
+        return value.isoformat()
+    raise TypeError(f"Object of type {type(value).__name__} is not JSON serializable")
+
+
+def _dumps(data) -> str:
+    return json.dumps(data, default=_encode)
+
+
+class SQLiteBackend(StorageBackend):
+    """
+    Single-file storage in WAL mode, so readers don't block the writer.
+    Documents are stored as JSON; datetimes come back as ISO strings.
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        self._local = threading.local()
+        self._connection().executescript(SCHEMA)
+
+    def _connection(self) -> sqlite3.Connection:
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            # Autocommit mode; writes open explicit transactions below
+            conn = sqlite3.connect(self.path, timeout=10, isolation_level=None)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            self._local.conn = conn
+        return conn
+
+    @contextmanager
+    def _transaction(self):
+        conn = self._connection()
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            yield conn
+        except BaseException:
+            conn.execute("ROLLBACK")
+            raise
+        conn.execute("COMMIT")
+
+    def _load_active(self, conn, user_id: str):
+        row = conn.execute(
+            "SELECT data, version FROM active_roadmaps WHERE user_id = ?", (user_id,)
+        ).fetchone()
+        if row is None:
+            return None, None
+        return json.loads(row[0]), row[1]
+
+    def _store_active(self, conn, user_id: str, data: dict, version: int) -> int:
+        conn.execute(
+            "INSERT INTO active_roadmaps (user_id, data, version) VALUES (?, ?, ?) "
+            "ON CONFLICT (user_id) DO UPDATE SET data = excluded.data, version = excluded.version",
+            (user_id, _dumps(data), version)
+        )
+        return version
+
+    def _next_version(self, conn, user_id: str) -> int:
+        # Kept apart from active_roadmaps so a delete doesn't restart the
+        # count; a stale version must never match a later roadmap. The first
+        # bump for a user carries on from the stored roadmap's version.
+        conn.execute(
+            "INSERT INTO roadmap_versions (user_id, version) "
+            "SELECT ?, COALESCE((SELECT version FROM active_roadmaps WHERE user_id = ?), 0) + 1 WHERE true "
+            "ON CONFLICT (user_id) DO UPDATE SET version = version + 1",
+            (user_id, user_id)
+        )
+        return conn.execute(
+            "SELECT version FROM roadmap_versions WHERE user_id = ?", (user_id,)
+        ).fetchone()[0]
+
+    def get_profile(self, user_id: str):
+        row = self._connection().execute(
+            "SELECT profile FROM profiles WHERE user_id = ?", (user_id,)
+        ).fetchone()
+        return json.loads(row[0]) if row else None
+
+    def save_profile(self, user_id: str, profile: dict):
+        with self._transaction() as conn:
+            conn.execute(
+                "INSERT INTO profiles (user_id, profile, updated_at) VALUES (?, ?, ?) "
+                "ON CONFLICT (user_id) DO UPDATE SET profile = excluded.profile, updated_at = excluded.updated_at",
+                (user_id, _dumps(profile), datetime.utcnow().isoformat())
+            )
+
+    def save_analysis(self, user_id: str, analysis: dict, active_roadmap: dict):
+        with self._transaction() as conn:
+            conn.execute(
+                "INSERT INTO analyses (user_id, data, created_at) VALUES (?, ?, ?)",
+                (user_id, _dumps(analysis), datetime.utcnow().isoformat())
+            )
+            return self._store_active(conn, user_id, active_roadmap, self._next_version(conn, user_id))
+
+    def save_analyses(self, items: list) -> list:
+        # One transaction (and one fsync) for the whole batch
+        versions = []
+        with self._transaction() as conn:
+            for user_id, analysis, active_roadmap in items:
+                conn.execute(
+                    "INSERT INTO analyses (user_id, data, created_at) VALUES (?, ?, ?)",
+                    (user_id, _dumps(analysis), datetime.utcnow().isoformat())
+                )
+                versions.append(self._store_active(conn, user_id, active_roadmap, self._next_version(conn, user_id)))
+        return versions
+
+    def get_active_roadmap(self, user_id: str):
+        return self._load_active(self._connection(), user_id)
+
+    def set_active_roadmap(self, user_id: str, data: dict):
+        with self._transaction() as conn:
+            return self._store_active(conn, user_id, data, self._next_version(conn, user_id))
+
+    def replace_active_roadmap(self, user_id: str, data: dict, expected_version):
+        with self._transaction() as conn:
+            _, version = self._load_active(conn, user_id)
+            if version is None:
+                return None
+            if version != expected_version:
+                raise VersionConflict()
+            return self._store_active(conn, user_id, data, self._next_version(conn, user_id))
+
+    def merge_active_roadmap(self, user_id: str, merge):
+        with self._transaction() as conn:
+            existing, version = self._load_active(conn, user_id)
+            if existing is None:
+                return None, None
+            data = merge(existing)
+            return data, self._store_active(conn, user_id, data, self._next_version(conn, user_id))
+
+    def update_phase(self, user_id: str, phase_index: int, phase_state: dict, progress: dict, completed_delta: int, updated_at, expected_version):
+        with self._transaction() as conn:
+            data, version = self._load_active(conn, user_id)
+            if data is None:
+                return None
+            if version != expected_version:
+                raise VersionConflict()
+            apply_phase_update(data, phase_index, phase_state, progress, completed_delta, updated_at)
+            return self._store_active(conn, user_id, data, self._next_version(conn, user_id))
+
+    def delete_active_roadmap(self, user_id: str) -> bool:
+        with self._transaction() as conn:
+            cursor = conn.execute("DELETE FROM active_roadmaps WHERE user_id = ?", (user_id,))
+            return cursor.rowcount > 0
@@ -0,0 +1,41 @@
+from fastapi.concurrency import run_in_threadpool
+from app.services.storage_backends.base import AsyncStorageBackend, StorageBackend
+
+
+class ThreadedAsyncBackend(AsyncStorageBackend):
+    """Runs a blocking StorageBackend (SQLite, memory) in the threadpool."""
+
+    def __init__(self, backend: StorageBackend):
+        self.backend = backend
+
+    async def get_profile(self, user_id: str):
+        return await run_in_threadpool(self.backend.get_profile, user_id)
+
+    async def save_profile(self, user_id: str, profile: dict):
+        return await run_in_threadpool(self.backend.save_profile, user_id, profile)
+
+    async def save_analysis(self, user_id: str, analysis: dict, active_roadmap: dict):
+        return await run_in_threadpool(self.backend.save_analysis, user_id, analysis, active_roadmap)
+
+    async def save_analyses(self, items: list) -> list:
+        return await run_in_threadpool(self.backend.save_analyses, items)
+
+    async def get_active_roadmap(self, user_id: str):
+        return await run_in_threadpool(self.backend.get_active_roadmap, user_id)
+
+    async def set_active_roadmap(self, user_id: str, data: dict):
+        return await run_in_threadpool(self.backend.set_active_roadmap, user_id, data)
+
+    async def replace_active_roadmap(self, user_id: str, data: dict, expected_version):
+        return await run_in_threadpool(self.backend.replace_active_roadmap, user_id, data, expected_version)
+
+    async def merge_active_roadmap(self, user_id: str, merge):
+        return await run_in_threadpool(self.backend.merge_active_roadmap, user_id, merge)
+
+    async def update_phase(self, user_id: str, phase_index: int, phase_state: dict, progress: dict, completed_delta: int, updated_at, expected_version):
+        return await run_in_threadpool(
+            self.backend.update_phase, user_id, phase_index, phase_state, progress, completed_delta, updated_at, expected_version
+        )
+
+    async def delete_active_roadmap(self, user_id: str) -> bool:
+        return await run_in_threadpool(self.backend.delete_active_roadmap, user_id)
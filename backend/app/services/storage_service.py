@@ -1,38 +1,122 @@
-from app.utils.firebase import db
+import copy
+import logging
+import threading
+from collections import OrderedDict
+from app.services.storage_backends import get_async_backend, get_backend, VersionConflict
+from app.services.storage_backends.base import apply_phase_update
+from app.utils.cache import TTLCache
+from app.utils.metrics import timed_stage
+from app.config import (
+    ACTIVE_ROADMAP_CACHE_SIZE,
+    ACTIVE_ROADMAP_CACHE_TTL_SECONDS,
+    ACTIVE_ROADMAP_CACHE_MODE,
+)
 from datetime import datetime
 
+logger = logging.getLogger(__name__)
 
-def save_career_analysis(
+# Read-through cache of each user's active roadmap, kept in sync by the write
+# paths below. Entries are (data, version) so cached reads can still be used
+# as optimistic-concurrency preconditions. Callers always receive a private
+# copy.
+_active_roadmap_cache = TTLCache(maxsize=ACTIVE_ROADMAP_CACHE_SIZE, ttl=ACTIVE_ROADMAP_CACHE_TTL_SECONDS)
+_snapshot_watches = OrderedDict()
+_snapshot_lock = threading.Lock()
+
+
+def _cache_active_roadmap(user_id: str, data: dict, version):
+    if version is None:
+        # Without a version the entry can't serve as a precondition
+        _active_roadmap_cache.pop(user_id)
+        return
+    _active_roadmap_cache.set(user_id, (copy.deepcopy(data), version))
+
+
+def _watch_active_roadmap(user_id: str):
+    if ACTIVE_ROADMAP_CACHE_MODE != "snapshot":
+        return
+
+    def on_change(data, version):
+        if data is not None:
+            _cache_active_roadmap(user_id, data, version)
+        else:
+            _active_roadmap_cache.pop(user_id)
+
+    with _snapshot_lock:
+        if user_id in _snapshot_watches:
+            _snapshot_watches.move_to_end(user_id)
+            return
+        unsubscribe = get_backend().watch_active_roadmap(user_id, on_change)
+        if unsubscribe is None:
+            return
+        _snapshot_watches[user_id] = unsubscribe
+
+        # Keep at most one listener per cacheable entry
+        while len(_snapshot_watches) > ACTIVE_ROADMAP_CACHE_SIZE:
+            stale_user_id, stale_unsubscribe = _snapshot_watches.popitem(last=False)
+            stale_unsubscribe()
+            _active_roadmap_cache.pop(stale_user_id)
+
+
+def get_active_roadmap_cache_stats() -> dict:
+    stats = _active_roadmap_cache.stats()
+    stats["mode"] = ACTIVE_ROADMAP_CACHE_MODE
+    stats["snapshot_watches"] = len(_snapshot_watches)
+    return stats
+
+
+@timed_stage("storage.save_career_analysis")
+async def save_career_analysis(
     user_id: str,
     profile: dict,
     career_decision: dict,
     roadmap: dict
 ):
+    data, active_data = _analysis_documents(profile, career_decision, roadmap)
+
+    # History and active state are committed together in one round trip
+    version = await get_async_backend().save_analysis(user_id, data, active_data)
+
+    _cache_active_roadmap(user_id, active_data, version)
+    _watch_active_roadmap(user_id)
+
+    return True
+
+
+@timed_stage("storage.save_career_analyses")
+async def save_career_analyses(analyses: list):
+    """
+    Bulk save_career_analysis for dicts with user_id, profile,
+    career_decision and roadmap, written in as few batches as the backend
+    allows. The users' cached roadmaps are dropped rather than filled, so a
+    large cohort doesn't flush the cache.
+    """
+    items = []
+    for analysis in analyses:
+        data, active_data = _analysis_documents(analysis["profile"], analysis["career_decision"], analysis["roadmap"])
+        items.append((analysis["user_id"], data, active_data))
+
+    await get_async_backend().save_analyses(items)
+
+    for user_id, _, _ in items:
+        _active_roadmap_cache.pop(user_id)
+    return True
+
+
+def _analysis_documents(profile: dict, career_decision: dict, roadmap: dict):
     data = {
         "profile": profile,
         "career_decision": career_decision,
-        "roadmap": roadmap,
+        "roadmap": copy.deepcopy(roadmap),
         "created_at": datetime.utcnow()
     }
-
-    db.collection("users") \
-      .document(user_id) \
-      .collection("analyses") \
-      .add(data)
-
-    save_active_roadmap(user_id, career_decision, roadmap)
-
-    return True
+    return data, _build_active_roadmap(career_decision, roadmap)
 
 
-def save_active_roadmap(user_id: str, career_decision: dict, roadmap: dict, preserve_progress: bool = False):
-    existing_data = None
-    if preserve_progress:
-        existing_data = get_active_roadmap(user_id)
-    
+def _build_active_roadmap(career_decision: dict, roadmap: dict, existing_data: dict = None) -> dict:
     if "roadmap" in roadmap:
         for idx, phase in enumerate(roadmap["roadmap"]):
-            if existing_data and preserve_progress:
+            if existing_data:
                 old_roadmap = existing_data.get("learning_roadmap", {}).get("roadmap", [])
                 if idx < len(old_roadmap):
                     old_phase = old_roadmap[idx]
@@ -49,7 +133,7 @@ def save_active_roadmap(user_id: str, career_decision: dict, roadmap: dict, pres
                 phase["status"] = "pending"
                 phase["completed_at"] = None
     
-    if existing_data and preserve_progress:
+    if existing_data:
         completed_count = sum(1 for p in roadmap.get("roadmap", []) if p.get("status") == "completed")
         progress_data = {
             "completed_phases": completed_count,
@@ -65,52 +149,167 @@ def save_active_roadmap(user_id: str, career_decision: dict, roadmap: dict, pres
             "last_activity_date": None
         }
 
-    data = {
+    return {
         "career_decision": career_decision,
         "learning_roadmap": roadmap,
         "progress": progress_data,
         "updated_at": datetime.utcnow()
     }
 
-    db.collection("users").document(user_id).collection("active_roadmap").document("current").set(data)
+
+@timed_stage("storage.save_active_roadmap")
+async def save_active_roadmap(user_id: str, career_decision: dict, roadmap: dict, preserve_progress: bool = False):
+    existing_data = None
+    if preserve_progress:
+        existing_data = await get_active_roadmap(user_id)
+
+    data = _build_active_roadmap(career_decision, roadmap, existing_data)
+
+    version = await get_async_backend().set_active_roadmap(user_id, data)
+    _cache_active_roadmap(user_id, data, version)
+    _watch_active_roadmap(user_id)
     return True
 
 
-def get_active_roadmap(user_id: str):
-    doc = db.collection("users").document(user_id).collection("active_roadmap").document("current").get()
-    if doc.exists:
-        return doc.to_dict()
-    return None
+@timed_stage("storage.adapt_active_roadmap")
+async def adapt_active_roadmap(user_id: str, current_data: dict, version, roadmap: dict):
+    """
+    Merges progress from the snapshot the caller already loaded into the
+    adapted roadmap and writes it once, guarded by the snapshot's version.
+    If the roadmap changed in the meantime (e.g. a concurrent progress
+    update), the merge is redone atomically against the latest copy. Returns
+    the merged document, or None if the roadmap no longer exists.
+    """
+    backend = get_async_backend()
+    career_decision = current_data.get("career_decision")
 
+    if version is not None:
+        data = _build_active_roadmap(career_decision, roadmap, current_data)
+        try:
+            new_version = await backend.replace_active_roadmap(user_id, data, version)
+        except VersionConflict:
+            pass
+        else:
+            if new_version is None:
+                _active_roadmap_cache.pop(user_id)
+                return None
+            _cache_active_roadmap(user_id, data, new_version)
+            return data
 
-def update_phase_status(user_id: str, phase_index: int, status: str):
-    ref = db.collection("users").document(user_id).collection("active_roadmap").document("current")
-    doc = ref.get()
-    
-    if not doc.exists:
-        return False
-        
-    data = doc.to_dict()
+    data, new_version = await backend.merge_active_roadmap(
+        user_id,
+        lambda existing_data: _build_active_roadmap(career_decision, roadmap, existing_data)
+    )
+    if data is None:
+        _active_roadmap_cache.pop(user_id)
+        return None
+    _cache_active_roadmap(user_id, data, new_version)
+    return data
+
+
+@timed_stage("storage.get_active_roadmap_snapshot")
+async def get_active_roadmap_snapshot(user_id: str):
+    cached = _active_roadmap_cache.get(user_id)
+    if cached is not None:
+        data, version = cached
+        return copy.deepcopy(data), version
+
+    data, version = await get_async_backend().get_active_roadmap(user_id)
+    if data is not None:
+        _cache_active_roadmap(user_id, data, version)
+        _watch_active_roadmap(user_id)
+    return data, version
+
+
+async def get_active_roadmap(user_id: str):
+    data, _ = await get_active_roadmap_snapshot(user_id)
+    return data
+
+
+class _PhaseNotFound(Exception):
+    pass
+
+
+def _phase_status_change(data: dict, phase_index: int, status: str, now):
+    """
+    Works out the write for setting a phase's status on `data`: returns
+    (phase_state, progress_updates, completed_delta), or None if there is no
+    such phase. Updates the streak in data["progress"].
+    """
     roadmap = data.get("learning_roadmap", {}).get("roadmap", [])
-    
-    if 0 <= phase_index < len(roadmap):
-        roadmap[phase_index]["status"] = status
-        if status == "completed":
-            roadmap[phase_index]["completed_at"] = datetime.utcnow().isoformat()
-            
-            completed_count = sum(1 for p in roadmap if p.get("status") == "completed")
-            data["progress"]["completed_phases"] = completed_count
-            
-            update_streak(data["progress"])
-            
-        ref.update({
-            "learning_roadmap.roadmap": roadmap,
-            "progress": data["progress"],
-            "updated_at": datetime.utcnow()
-        })
-        return True
-        
-    return False
+    if not 0 <= phase_index < len(roadmap):
+        return None
+
+    phase = roadmap[phase_index]
+    progress = data["progress"]
+    was_completed = phase.get("status") == "completed"
+    phase_state = {"status": status, "completed_at": phase.get("completed_at")}
+    progress_updates = {}
+    completed_delta = 0
+
+    if status == "completed":
+        phase_state["completed_at"] = now.isoformat()
+        if not was_completed:
+            completed_delta = 1
+
+        update_streak(progress)
+        progress_updates["streak_days"] = progress["streak_days"]
+        progress_updates["last_activity_date"] = progress["last_activity_date"]
+    elif was_completed:
+        phase_state["completed_at"] = None
+        completed_delta = -1
+
+    return phase_state, progress_updates, completed_delta
+
+
+@timed_stage("storage.update_phase_status")
+async def update_phase_status(user_id: str, phase_index: int, status: str):
+    """
+    Only this phase's state and the progress counters are written, so the
+    payload stays the same size however large the roadmap is. The write is
+    guarded by the version of the snapshot the delta was computed from; if
+    that snapshot was stale (e.g. a concurrent click on the same phase), the
+    change is recomputed and applied atomically against the latest copy.
+    """
+    backend = get_async_backend()
+    now = datetime.utcnow()
+    data, version = await get_active_roadmap_snapshot(user_id)
+    if not data:
+        return False
+
+    change = _phase_status_change(data, phase_index, status, now)
+    if change is None:
+        return False
+
+    if version is not None:
+        try:
+            new_version = await backend.update_phase(user_id, phase_index, *change, now, version)
+        except VersionConflict:
+            pass
+        else:
+            if new_version is None:
+                _active_roadmap_cache.pop(user_id)
+                return False
+            apply_phase_update(data, phase_index, *change, now)
+            _cache_active_roadmap(user_id, data, new_version)
+            return True
+
+    def merge(existing_data: dict) -> dict:
+        latest = _phase_status_change(existing_data, phase_index, status, now)
+        if latest is None:
+            raise _PhaseNotFound()
+        apply_phase_update(existing_data, phase_index, *latest, now)
+        return existing_data
+
+    try:
+        data, new_version = await backend.merge_active_roadmap(user_id, merge)
+    except _PhaseNotFound:
+        data = None
+    if data is None:
+        _active_roadmap_cache.pop(user_id)
+        return False
+    _cache_active_roadmap(user_id, data, new_version)
+    return True
 
 
 def update_streak(progress_data: dict):
@@ -132,43 +331,34 @@ def update_streak(progress_data: dict):
     progress_data["last_activity_date"] = now.isoformat()
 
 
-def get_student_profile(user_id: str):
-    doc = db.collection("users").document(user_id).get()
-    if doc.exists:
-        data = doc.to_dict()
-        return data.get("profile")
-    return None
+@timed_stage("storage.get_student_profile")
+async def get_student_profile(user_id: str):
+    return await get_async_backend().get_profile(user_id)
 
 
-def save_student_profile(user_id: str, profile: dict):
+@timed_stage("storage.save_student_profile")
+async def save_student_profile(user_id: str, profile: dict):
     try:
-        print(f"Saving to Firestore for user: {user_id}")
-        db.collection("users").document(user_id).set({
-            "profile": profile,
-            "updated_at": datetime.utcnow()
-        }, merge=True)
-        print(f"Successfully saved to Firestore for user: {user_id}")
+        await get_async_backend().save_profile(user_id, profile)
+        logger.debug("Saved profile for user %s", user_id)
         return True
     except Exception as e:
-        print(f"Firestore error for user {user_id}: {str(e)}")
-        import traceback
-        traceback.print_exc()
+        logger.exception("Storage error for user %s", user_id)
         raise Exception(f"Database error: {str(e)}")
 
 
-def delete_active_roadmap(user_id: str):
+@timed_stage("storage.delete_active_roadmap")
+async def delete_active_roadmap(user_id: str):
     try:
-        ref = db.collection("users").document(user_id).collection("active_roadmap").document("current")
-        doc = ref.get()
+        deleted = await get_async_backend().delete_active_roadmap(user_id)
+        _active_roadmap_cache.pop(user_id)
         
-        if doc.exists:
-            ref.delete()
-            print(f"Deleted roadmap for user: {user_id}")
+        if deleted:
+            logger.info("Deleted roadmap for user %s", user_id)
             return True
         else:
-            print(f"No roadmap found for user: {user_id}")
+            logger.debug("No roadmap found for user %s", user_id)
             return False
     except Exception as e:
-        print(f"Error deleting roadmap for user {user_id}: {str(e)}")
+        logger.exception("Error deleting roadmap for user %s", user_id)
         raise Exception(f"Failed to delete roadmap: {str(e)}")
-
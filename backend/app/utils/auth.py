@@ -1,15 +1,72 @@
-from firebase_admin import auth
+import hashlib
+import time
 from fastapi import Header, HTTPException
+from fastapi.concurrency import run_in_threadpool
+from app.config import ADMIN_UIDS, TOKEN_CACHE_SIZE, TOKEN_CACHE_MAX_TTL_SECONDS
+from app.utils.cache import TTLCache
+from app.utils.firebase import get_firebase_app
+from app.utils.metrics import STAGE_DURATION, timed_stage
 
+# Decoded tokens keyed by a hash of the raw token. Each entry lives no longer
+# than the token's own `exp` claim.
+_token_cache = TTLCache(maxsize=TOKEN_CACHE_SIZE, ttl=TOKEN_CACHE_MAX_TTL_SECONDS)
 
-def verify_firebase_token(authorization: str = Header(...)):
-    if not authorization.startswith("Bearer "):
-        raise HTTPException(status_code=401, detail="Invalid auth header")
 
-    token = authorization.split(" ")[1]
+def _token_key(token: str) -> str:
+    return hashlib.sha256(token.encode("utf-8")).hexdigest()
+
+
+def _cache_decoded_token(key: str, decoded_token: dict):
+    lifetime = min(decoded_token.get("exp", 0) - time.time(), TOKEN_CACHE_MAX_TTL_SECONDS)
+    if lifetime > 0:
+        _token_cache.set(key, decoded_token, expires_at=time.monotonic() + lifetime)
+
+
+def _verify_id_token(token: str) -> dict:
+    # Imported here so firebase_admin loads on the first verification (in
+    # the threadpool) rather than at startup
+    from firebase_admin import auth
+    return auth.verify_id_token(token, app=get_firebase_app())
+
+
+async def verify_id_token_cached(token: str) -> dict:
+    key = _token_key(token)
+
+    # Fast path: a token we already verified skips the signature check and
+    # the threadpool hop entirely.
+    decoded_token = _token_cache.get(key)
+    if decoded_token is not None:
+        return decoded_token
 
     try:
-        decoded_token = auth.verify_id_token(token)
-        return decoded_token["uid"]
+        with STAGE_DURATION.time(stage="auth.verify_id_token"):
+            decoded_token = await run_in_threadpool(_verify_id_token, token)
     except Exception:
         raise HTTPException(status_code=401, detail="Invalid or expired token")
+
+    _cache_decoded_token(key, decoded_token)
+    return decoded_token
+
+
+def _bearer_token(authorization: str) -> str:
+    if not authorization.startswith("Bearer "):
+        raise HTTPException(status_code=401, detail="Invalid auth header")
+    return authorization.split(" ")[1]
+
+
+@timed_stage("auth.verify_firebase_token")
+async def verify_firebase_token(authorization: str = Header(...)):
+    decoded_token = await verify_id_token_cached(_bearer_token(authorization))
+    return decoded_token["uid"]
+
+
+@timed_stage("auth.verify_admin_token")
+async def verify_admin_token(authorization: str = Header(...)):
+    decoded_token = await verify_id_token_cached(_bearer_token(authorization))
+    if decoded_token.get("admin") is not True and decoded_token["uid"] not in ADMIN_UIDS:
+        raise HTTPException(status_code=403, detail="Admin access required")
+    return decoded_token["uid"]
+
+
+def get_token_cache_stats() -> dict:
+    return _token_cache.stats()
@@ -0,0 +1,132 @@
+import itertools
+import logging
+import math
+import time
+from collections import deque
+from fastapi import HTTPException
+
+logger = logging.getLogger(__name__)
+
+CLOSED = "closed"
+OPEN = "open"
+HALF_OPEN = "half_open"
+
+
+class CircuitOpenError(Exception):
+    """Raised instead of calling a dependency whose circuit is open."""
+
+    def __init__(self, name: str, retry_after: float):
+        super().__init__(f"{name} is unavailable (circuit open), retry in {retry_after:.0f}s")
+        self.retry_after = retry_after
+
+
+def llm_unavailable(error: CircuitOpenError) -> HTTPException:
+    return HTTPException(
+        status_code=503,
+        detail="The AI advisor is temporarily unavailable, please retry shortly",
+        headers={"Retry-After": str(max(1, math.ceil(error.retry_after)))}
+    )
+
+
+class CircuitBreaker:
+    """
+    Count-based circuit breaker over the last `window` calls. It opens when
+    the failure rate or the slow-call rate crosses its threshold (after at
+    least `min_calls`). After `open_seconds` a single probe call is let
+    through (half-open). The probe's outcome closes the circuit or reopens
+    it; calls admitted before the circuit opened only count towards the
+    window. Meant to be used from the event loop, so it has no lock.
+    """
+
+    def __init__(self, name: str, window: int, min_calls: int, failure_rate: float,
+                 slow_call_seconds: float, slow_call_rate: float, open_seconds: float):
+        self.name = name
+        self.min_calls = min_calls
+        self.failure_rate = failure_rate
+        self.slow_call_seconds = slow_call_seconds
+        self.slow_call_rate = slow_call_rate
+        self.open_seconds = open_seconds
+
+        self._calls = deque(maxlen=window)
+        self._state = CLOSED
+        self._opened_at = 0.0
+        # Token of the probe in flight, if any
+        self._probe = None
+        self._tokens = itertools.count(1)
+        self.times_opened = 0
+
+    @property
+    def state(self) -> str:
+        if self._state == OPEN and time.monotonic() - self._opened_at >= self.open_seconds:
+            return HALF_OPEN
+        return self._state
+
+    def retry_after(self) -> float:
+        return max(0.0, self.open_seconds - (time.monotonic() - self._opened_at))
+
+    def before_call(self):
+        """
+        Raises CircuitOpenError if the call should not be attempted. Returns
+        a token if the call is the half-open probe (None otherwise), to be
+        passed back to record() or release_probe().
+        """
+        state = self.state
+        if state == CLOSED:
+            return None
+        if state == HALF_OPEN and self._probe is None:
+            self._state = HALF_OPEN
+            self._probe = next(self._tokens)
+            return self._probe
+        raise CircuitOpenError(self.name, self.retry_after() or self.open_seconds)
+
+    def _is_probe(self, probe) -> bool:
+        return probe is not None and probe == self._probe
+
+    def record(self, success: bool, duration: float, probe=None):
+        if self._is_probe(probe):
+            self._probe = None
+            if success and duration < self.slow_call_seconds:
+                self._close()
+            else:
+                self._open()
+            return
+
+        self._calls.append((not success, duration >= self.slow_call_seconds))
+        if self._state == CLOSED and len(self._calls) >= self.min_calls:
+            failures = sum(1 for failed, _ in self._calls if failed)
+            slow = sum(1 for _, was_slow in self._calls if was_slow)
+            if failures / len(self._calls) >= self.failure_rate or slow / len(self._calls) >= self.slow_call_rate:
+                self._open()
+
+    def release_probe(self, probe):
+        # The probe was abandoned (e.g. the client went away) without an outcome
+        if self._is_probe(probe):
+            self._probe = None
+            self._state = OPEN
+
+    def _open(self):
+        self._state = OPEN
+        self._probe = None
+        self._opened_at = time.monotonic()
+        self._calls.clear()
+        self.times_opened += 1
+        logger.warning("Circuit %s opened for %.0fs", self.name, self.open_seconds)
+
+    def _close(self):
+        self._state = CLOSED
+        self._probe = None
+        self._calls.clear()
+        logger.info("Circuit %s closed", self.name)
+
+    def get_stats(self) -> dict:
+        failures = sum(1 for failed, _ in self._calls if failed)
+        slow = sum(1 for _, was_slow in self._calls if was_slow)
+        state = self.state
+        return {
+            "state": state,
+            "recent_calls": len(self._calls),
+            "recent_failures": failures,
+            "recent_slow_calls": slow,
+            "times_opened": self.times_opened,
+            "retry_after_seconds": round(self.retry_after(), 1) if state != CLOSED else 0
+        }
@@ -1,12 +1,49 @@
-import firebase_admin
-from firebase_admin import credentials, firestore
 import os
+import threading
 
 FIREBASE_KEY_PATH = os.getenv("FIREBASE_KEY_PATH", "firebase_key.json")
 
-cred = credentials.Certificate(FIREBASE_KEY_PATH)
+# Everything here is built on first use: importing firebase_admin and loading
+# credentials is slow, and a missing key file shouldn't stop the app booting.
+_app = None
+_db = None
+_async_db = None
+_lock = threading.Lock()
 
-if not firebase_admin._apps:
-    firebase_admin.initialize_app(cred)
 
-db = firestore.client()
+def get_firebase_app():
+    global _app
+    if _app is None:
+        with _lock:
+            if _app is None:
+                import firebase_admin
+                from firebase_admin import credentials
+
+                if firebase_admin._apps:
+                    _app = firebase_admin.get_app()
+                else:
+                    _app = firebase_admin.initialize_app(credentials.Certificate(FIREBASE_KEY_PATH))
+    return _app
+
+
+def get_db():
+    global _db
+    if _db is None:
+        app = get_firebase_app()
+        with _lock:
+            if _db is None:
+                from firebase_admin import firestore
+                _db = firestore.client(app)
+    return _db
+
+
+def get_async_db():
+    # Request paths use the asyncio client; the sync one backs snapshot listeners
+    global _async_db
+    if _async_db is None:
+        app = get_firebase_app()
+        with _lock:
+            if _async_db is None:
+                from firebase_admin import firestore_async
+                _async_db = firestore_async.client(app)
+    return _async_db
@@ -0,0 +1,110 @@
+"""
+Lenient parsing for JSON written by a model: code fences, prose around the
+document, trailing commas and documents cut off mid-way (max tokens).
+"""
+import json
+import re
+
+OK = "ok"
+REPAIRED = "repaired"
+TRUNCATED = "truncated"
+
+# Only a fence that opens the document counts; ``` inside a string is content
+_FENCE_OPEN = re.compile(r"\A\s*```[\w+-]*[ \t]*\n?")
+_FENCE_CLOSE = re.compile(r"\n?[ \t]*```\s*\Z")
+_CLOSERS = {"{": "}", "[": "]"}
+
+
+def strip_fences(text: str) -> str:
+    match = _FENCE_OPEN.match(text)
+    if not match:
+        return text
+    return _FENCE_CLOSE.sub("", text[match.end():])
+
+
+def _root_start(text: str) -> int:
+    starts = [i for i in (text.find("{"), text.find("[")) if i != -1]
+    if not starts:
+        raise ValueError("No JSON document found")
+    return min(starts)
+
+
+def repair_json(text: str):
+    """
+    Returns (text, truncated). Trailing commas are dropped; an unfinished
+    document is cut back to its last complete value and its open
+    brackets are closed. Anything after the root value is ignored.
+    """
+    out = []
+    stack = []
+    in_string = escaped = False
+    # Per open object: whether the next string is a key
+    expect_key = []
+    # (length of out, open brackets) after the last complete value
+    safe = (0, ())
+
+    for char in text[_root_start(text):]:
+        if in_string:
+            out.append(char)
+            if escaped:
+                escaped = False
+            elif char == "\\":
+                escaped = True
+            elif char == '"':
+                in_string = False
+                if not (stack[-1] == "{" and expect_key[-1]):
+                    safe = (len(out), tuple(stack))
+            continue
+
+        if char == '"':
+            in_string = True
+            out.append(char)
+        elif char in _CLOSERS:
+            stack.append(char)
+            expect_key.append(True)
+            out.append(char)
+            safe = (len(out), tuple(stack))
+        elif char in "}]":
+            while out and (out[-1].isspace() or out[-1] == ","):
+                out.pop()
+            out.append(_CLOSERS[stack.pop()])
+            expect_key.pop()
+            if not stack:
+                return "".join(out), False
+            safe = (len(out), tuple(stack))
+        elif char == ",":
+            # Numbers and literals end here, so this is a safe point too
+            safe = (len(out), tuple(stack))
+            expect_key[-1] = True
+            out.append(char)
+        elif char == ":":
+            expect_key[-1] = False
+            out.append(char)
+        else:
+            out.append(char)
+
+    end, open_brackets = safe
+    head = "".join(out[:end]).rstrip().rstrip(",")
+    return head + "".join(_CLOSERS[bracket] for bracket in reversed(open_brackets)), True
+
+
+def parse_json(text: str):
+    """
+    Returns (value, status): OK if the text parsed as-is (fences and
+    surrounding prose aside), REPAIRED if it needed fixing, TRUNCATED if it
+    was cut off and the last value may be incomplete. Raises ValueError
+    when nothing usable is left.
+    """
+    text = text or ""
+    try:
+        value, _ = json.JSONDecoder().raw_decode(text, _root_start(text))
+        return value, OK
+    except json.JSONDecodeError:
+        pass
+
+    repaired, truncated = repair_json(strip_fences(text))
+    try:
+        value = json.loads(repaired)
+    except json.JSONDecodeError as e:
+        raise ValueError(f"Unrepairable JSON: {e}")
+    return value, TRUNCATED if truncated else REPAIRED
@@ -0,0 +1,78 @@
+import json
+
+
+class IncrementalJSONParser:
+    """
+    Scans a JSON document as it streams in and returns every object/array
+    that closes at a watched path, e.g. ("learning_roadmap", "roadmap", 0).
+    Text before the root value (such as a ```json fence) is ignored.
+    """
+
+    def __init__(self, watch):
+        self.watch = watch
+        self.buffer = ""
+        self.pos = 0
+        self.stack = []
+        self.in_string = False
+        self.escaped = False
+        self.string_start = None
+        self.root_span = None
+
+    def feed(self, chunk: str) -> list:
+        self.buffer += chunk
+        completed = []
+
+        while self.pos < len(self.buffer) and self.root_span is None:
+            i = self.pos
+            char = self.buffer[i]
+            self.pos += 1
+
+            if self.in_string:
+                if self.escaped:
+                    self.escaped = False
+                elif char == "\\":
+                    self.escaped = True
+                elif char == '"':
+                    self.in_string = False
+                    frame = self.stack[-1]
+                    if frame["kind"] == "object" and frame["expect_key"]:
+                        frame["key"] = json.loads(self.buffer[self.string_start:i + 1])
+                continue
+
+            if not self.stack and char != "{" and char != "[":
+                continue
+
+            if char == '"':
+                self.in_string = True
+                self.string_start = i
+            elif char in "{[":
+                if self.stack:
+                    parent = self.stack[-1]
+                    step = parent["key"] if parent["kind"] == "object" else parent["index"]
+                    path = parent["path"] + (step,)
+                else:
+                    path = ()
+                self.stack.append({
+                    "kind": "object" if char == "{" else "array",
+                    "start": i,
+                    "path": path,
+                    "key": None,
+                    "index": 0,
+                    "expect_key": char == "{"
+                })
+            elif char in "}]":
+                frame = self.stack.pop()
+                if self.watch(frame["path"]):
+                    completed.append((frame["path"], json.loads(self.buffer[frame["start"]:i + 1])))
+                if not self.stack:
+                    self.root_span = (frame["start"], i + 1)
+            elif char == ",":
+                frame = self.stack[-1]
+                if frame["kind"] == "object":
+                    frame["expect_key"] = True
+                else:
+                    frame["index"] += 1
+            elif char == ":":
+                self.stack[-1]["expect_key"] = False
+
+        return completed
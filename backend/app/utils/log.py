@@ -0,0 +1,47 @@
+import atexit
+import logging
+import queue
+import sys
+from logging.handlers import QueueHandler, QueueListener
+from app.config import LOG_LEVEL
+
+_listener = None
+_handler = None
+
+
+def setup_logging():
+    """
+    Routes the "app" loggers through a queue, so a log call on the event
+    loop only enqueues a record. A background thread formats it and writes
+    it to stderr.
+    """
+    global _listener, _handler
+    if _listener is not None:
+        return
+
+    stream = logging.StreamHandler(sys.stderr)
+    stream.setFormatter(logging.Formatter("%(asctime)s %(levelname)s %(name)s: %(message)s"))
+
+    records = queue.SimpleQueue()
+    logger = logging.getLogger("app")
+    logger.setLevel(LOG_LEVEL.upper())
+    _handler = QueueHandler(records)
+    logger.addHandler(_handler)
+    logger.propagate = False
+
+    _listener = QueueListener(records, stream, respect_handler_level=True)
+    _listener.start()
+    atexit.register(stop_logging)
+
+
+def stop_logging():
+    """Flushes queued records and detaches the handler."""
+    global _listener, _handler
+    if _listener is not None:
+        _listener.stop()
+        _listener = None
+    if _handler is not None:
+        logging.getLogger("app").removeHandler(_handler)
+        logging.getLogger("app").propagate = True
+        _handler = None
+_handler = None
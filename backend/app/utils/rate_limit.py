@@ -0,0 +1,172 @@
+import math
+import sqlite3
+import threading
+import time
+from fastapi import Depends, HTTPException
+from fastapi.concurrency import run_in_threadpool
+from app.config import (
+    RATE_LIMIT_BACKEND,
+    RATE_LIMIT_PER_MINUTE,
+    RATE_LIMIT_BURST,
+    RATE_LIMIT_MAX_KEYS,
+    SQLITE_PATH,
+)
+from app.utils.auth import verify_firebase_token
+from app.utils.cache import TTLCache
+from app.utils.metrics import ADMISSION_REJECTIONS
+
+
+def _refill(tokens: float, elapsed: float, capacity: float, rate: float) -> float:
+    return min(capacity, tokens + max(0.0, elapsed) * rate)
+
+
+def _take(tokens: float, capacity: float, rate: float, cost: float):
+    """Returns (tokens left, seconds to wait); the wait is 0 when admitted."""
+    if tokens >= cost:
+        return tokens - cost, 0.0
+    return tokens, (cost - tokens) / rate
+
+
+class MemoryBucketStore:
+    """
+    Token buckets for this process only. A bucket that has refilled is
+    dropped, so idle users cost nothing and an evicted bucket is simply full.
+    """
+    blocking = False
+
+    def __init__(self, max_keys: int):
+        self._buckets = TTLCache(maxsize=max_keys, ttl=0)
+        self._lock = threading.Lock()
+
+    def take(self, key: str, capacity: float, rate: float, cost: float = 1.0) -> float:
+        now = time.monotonic()
+        with self._lock:
+            bucket = self._buckets.get(key)
+            tokens = capacity if bucket is None else _refill(bucket[0], now - bucket[1], capacity, rate)
+            tokens, wait = _take(tokens, capacity, rate, cost)
+            self._buckets.set(key, (tokens, now), expires_at=now + (capacity - tokens) / rate)
+        return wait
+
+    def __len__(self):
+        return len(self._buckets)
+
+
+class SQLiteBucketStore:
+    """
+    Token buckets shared by every worker process on the host, in the same
+    WAL-mode database as the other SQLite stores.
+    """
+    blocking = True
+    # Full buckets are deleted every this many takes
+    PRUNE_EVERY = 1000
+
+    def __init__(self, path: str):
+        self.path = path
+        self._local = threading.local()
+        self._takes = 0
+        self._connection().execute(
+            "CREATE TABLE IF NOT EXISTS rate_buckets ("
+            "key TEXT PRIMARY KEY, tokens REAL NOT NULL, updated_at REAL NOT NULL)"
+        )
+
+    def _connection(self) -> sqlite3.Connection:
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = sqlite3.connect(self.path, timeout=10, isolation_level=None)
+            conn.execute("PRAGMA journal_mode=WAL")
+            self._local.conn = conn
+        return conn
+
+    def take(self, key: str, capacity: float, rate: float, cost: float = 1.0) -> float:
+        # Wall-clock time, since buckets are shared between processes
+        now = time.time()
+        conn = self._connection()
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            row = conn.execute("SELECT tokens, updated_at FROM rate_buckets WHERE key = ?", (key,)).fetchone()
+            tokens = capacity if row is None else _refill(row[0], now - row[1], capacity, rate)
+            tokens, wait = _take(tokens, capacity, rate, cost)
+            conn.execute(
+                "INSERT INTO rate_buckets (key, tokens, updated_at) VALUES (?, ?, ?) "
+                "ON CONFLICT(key) DO UPDATE SET tokens = excluded.tokens, updated_at = excluded.updated_at",
+                (key, tokens, now)
+            )
+            self._takes += 1
+            if self._takes % self.PRUNE_EVERY == 0:
+                conn.execute("DELETE FROM rate_buckets WHERE updated_at < ?", (now - capacity / rate,))
+        except BaseException:
+            conn.execute("ROLLBACK")
+            raise
+        conn.execute("COMMIT")
+        return wait
+
+    def __len__(self):
+        return self._connection().execute("SELECT COUNT(*) FROM rate_buckets").fetchone()[0]
+
+
+def create_store(name: str):
+    if name == "sqlite":
+        return SQLiteBucketStore(SQLITE_PATH)
+    if name == "memory":
+        return MemoryBucketStore(RATE_LIMIT_MAX_KEYS)
+    raise ValueError(f"Unknown rate limit backend: {name}")
+
+
+class RateLimiter:
+    """
+    Token bucket per key: up to `burst` requests at once, refilled at
+    `per_minute`. A per_minute of 0 disables the limiter.
+    """
+
+    def __init__(self, name: str, per_minute: float, burst: float, store):
+        self.name = name
+        self.rate = per_minute / 60
+        self.capacity = max(1.0, burst)
+        self.store = store
+
+    async def check(self, key: str):
+        """Raises a 429 with Retry-After when `key` is out of tokens."""
+        if self.rate <= 0:
+            return
+        bucket = f"{self.name}:{key}"
+        if self.store.blocking:
+            wait = await run_in_threadpool(self.store.take, bucket, self.capacity, self.rate)
+        else:
+            wait = self.store.take(bucket, self.capacity, self.rate)
+        if wait > 0:
+            ADMISSION_REJECTIONS.inc(limiter=self.name)
+            raise HTTPException(
+                status_code=429,
+                detail="Too many AI requests, please slow down",
+                headers={"Retry-After": str(max(1, math.ceil(wait)))}
+            )
+
+
+llm_limiter = RateLimiter("llm", RATE_LIMIT_PER_MINUTE, RATE_LIMIT_BURST, create_store(RATE_LIMIT_BACKEND))
+
+
+def set_store(store):
+    """
+    Plugs in another bucket store, e.g. one backed by a shared cache for
+    workers spread over several hosts. It needs `take(key, capacity, rate,
+    cost) -> seconds to wait`, `__len__` and a `blocking` flag.
+    """
+    llm_limiter.store = store
+
+
+async def llm_rate_limit(user_id: str = Depends(verify_firebase_token)) -> str:
+    """
+    Drop-in replacement for Depends(verify_firebase_token) on endpoints that
+    call the LLM: authenticates, then spends one of the user's tokens.
+    """
+    await llm_limiter.check(user_id)
+    return user_id
+
+
+def get_stats() -> dict:
+    return {
+        "backend": RATE_LIMIT_BACKEND,
+        "per_minute": RATE_LIMIT_PER_MINUTE,
+        "burst": RATE_LIMIT_BURST,
+        "tracked_keys": len(llm_limiter.store)
+    }
@@ -0,0 +1,29 @@
+import orjson
+from fastapi.responses import Response
+
+_OPTIONS = orjson.OPT_NON_STR_KEYS | orjson.OPT_SERIALIZE_NUMPY
+
+
+def _default(value):
+    # Firestore returns DatetimeWithNanoseconds, a datetime subclass orjson
+    # won't serialize natively
+    if hasattr(value, "isoformat"):
+        return value.isoformat()
+    if hasattr(value, "model_dump"):
+        return value.model_dump()
+    raise TypeError(f"Object of type {type(value).__name__} is not JSON serializable")
+
+
+def dumps(content) -> bytes:
+    return orjson.dumps(content, default=_default, option=_OPTIONS)
+
+
+class ORJSONResponse(Response):
+    """
+    Serializes with orjson in one pass. Routes that return this directly
+    also skip FastAPI's jsonable_encoder walk over the payload.
+    """
+    media_type = "application/json"
+
+    def render(self, content) -> bytes:
+        return dumps(content)
@@ -0,0 +1,39 @@
+import asyncio
+from app.utils.metrics import Counter
+
+SINGLEFLIGHT_CALLS = Counter(
+    "skillroute_singleflight_calls_total",
+    "Calls through a single-flight group, by whether they ran or joined an in-flight call",
+    ("operation", "outcome")
+)
+
+
+class SingleFlight:
+    """
+    Coalesces concurrent calls with the same key: the first caller runs the
+    work and later callers await the same result (or exception). The shared
+    task is shielded, so one caller disconnecting doesn't cancel it for the
+    others.
+    """
+
+    def __init__(self, operation: str):
+        self.operation = operation
+        self._in_flight = {}
+
+    async def do(self, key, func, *args, **kwargs):
+        task = self._in_flight.get(key)
+        if task is not None:
+            SINGLEFLIGHT_CALLS.inc(operation=self.operation, outcome="coalesced")
+            return await asyncio.shield(task)
+
+        SINGLEFLIGHT_CALLS.inc(operation=self.operation, outcome="executed")
+        task = asyncio.ensure_future(func(*args, **kwargs))
+        self._in_flight[key] = task
+        task.add_done_callback(lambda _: self._in_flight.pop(key, None))
+        return await asyncio.shield(task)
+
+    def running(self, key) -> bool:
+        return key in self._in_flight
+
+    def in_flight(self) -> int:
+        return len(self._in_flight)
@@ -0,0 +1,94 @@
+"""
+Startup timing: how long importing the app took, and how long each warmup
+step in the lifespan hook took. Exposed under "startup" on /health.
+
+For a per-module breakdown of import cost:
+
+    python -m app.utils.startup [--top 25]
+"""
+import logging
+import time
+
+logger = logging.getLogger(__name__)
+
+# app.main imports this module first, so this is roughly when importing the
+# app began
+_started = time.perf_counter()
+_import_seconds = None
+_ready_seconds = None
+_steps = {}
+
+
+def mark_imported():
+    global _import_seconds
+    _import_seconds = time.perf_counter() - _started
+
+
+def warm(name: str, func):
+    """
+    Runs one warmup step and records its duration. A failing step is only
+    logged; whatever it was warming is built again on first use.
+    """
+    started = time.perf_counter()
+    try:
+        func()
+    except Exception as e:
+        logger.warning("Startup step %s failed (%s: %s), it will be retried on first use", name, type(e).__name__, e)
+        _steps[name] = {"seconds": round(time.perf_counter() - started, 4), "ok": False}
+    else:
+        _steps[name] = {"seconds": round(time.perf_counter() - started, 4), "ok": True}
+
+
+def mark_ready():
+    global _ready_seconds
+    _ready_seconds = time.perf_counter() - _started
+    logger.info(
+        "Started in %.2fs (imports %.2fs; %s)",
+        _ready_seconds, _import_seconds or 0,
+        ", ".join(f"{name} {step['seconds']:.2f}s" for name, step in _steps.items()) or "no warmup"
+    )
+
+
+def report() -> dict:
+    return {
+        "import_seconds": round(_import_seconds, 4) if _import_seconds is not None else None,
+        "ready_seconds": round(_ready_seconds, 4) if _ready_seconds is not None else None,
+        "steps": _steps
+    }
+
+
+def import_profile(module: str = "app.main") -> list:
+    """
+    (module, self_seconds, cumulative_seconds) for every module imported by
+    `module`, measured in a fresh interpreter with -X importtime.
+    """
+    import subprocess
+    import sys
+
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        capture_output=True, text=True, check=True
+    )
+    rows = []
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:") or "|" not in line:
+            continue
+        self_us, cumulative_us, name = line[len("import time:"):].split("|")
+        if not self_us.strip().isdigit():
+            continue
+        rows.append((name.strip(), int(self_us) / 1e6, int(cumulative_us) / 1e6))
+    return rows
+
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Per-module import cost of the API")
+    parser.add_argument("--module", default="app.main")
+    parser.add_argument("--top", type=int, default=25)
+    args = parser.parse_args()
+
+    rows = import_profile(args.module)
+    print(f"{'module':<60}{'self ms':>10}{'cumul ms':>10}")
+    for name, self_seconds, cumulative in sorted(rows, key=lambda row: -row[2])[:args.top]:
+        print(f"{name:<60}{self_seconds * 1000:>10.1f}{cumulative * 1000:>10.1f}")
@@ -0,0 +1,187 @@
+import asyncio
+import json
+import random
+from types import SimpleNamespace
+from fastapi import Header
+from app.services.storage_backends.base import AsyncStorageBackend
+from app.services.storage_backends.memory_backend import MemoryBackend
+
+
+def fake_roadmap_document(phases: int = 5, milestones: int = 3) -> dict:
+    roadmap = []
+    for i in range(1, phases + 1):
+        roadmap.append({
+            "phase": f"Phase {i}: Topic {i}",
+            "duration": "4-6 weeks",
+            "difficulty": "intermediate",
+            "focus_skills": ["python", "sql", "docker"],
+            "outcomes": ["Build a project", "Understand the fundamentals"],
+            "milestones": [
+                {
+                    "name": f"Milestone {i}.{j}",
+                    "description": "Complete the exercises and a small project",
+                    "estimated_hours": 10,
+                    "resources": [
+                        {"type": "course", "title": "Course", "url": "https://example.com/course", "duration": "6 hours"},
+                        {"type": "documentation", "title": "Docs", "url": "https://example.com/docs", "duration": "2 hours"}
+                    ]
+                }
+                for j in range(1, milestones + 1)
+            ],
+            "prerequisites": ["Basic programming"]
+        })
+
+    return {
+        "career_decision": {
+            "career": "Backend Developer",
+            "reasoning": "Strong fit with existing skills and stated goals.",
+            "confidence": 82,
+            "skill_match_percentage": 64,
+            "market_readiness": 40,
+            "industry_demand": "stable",
+            "key_strengths": ["Python", "Problem solving"],
+            "skill_gaps": ["System design", "Databases"],
+            "time_to_job_ready": "8 months",
+            "alternatives": [
+                {"career": "Data Engineer", "match_score": 70, "reason": "Overlapping skills"}
+            ]
+        },
+        "learning_roadmap": {"duration_months": phases * 1.5, "roadmap": roadmap}
+    }
+
+
+class FakeStream:
+
+    def __init__(self, content: str, first_token_latency: float, tokens_per_second: float, chunk_chars: int = 64):
+        self.content = content
+        self.first_token_latency = first_token_latency
+        self.tokens_per_second = tokens_per_second
+        self.chunk_chars = chunk_chars
+
+    async def __aiter__(self):
+        await asyncio.sleep(self.first_token_latency)
+        # Roughly four characters per token
+        delay = (self.chunk_chars / 4) / self.tokens_per_second
+        for start in range(0, len(self.content), self.chunk_chars):
+            delta = SimpleNamespace(content=self.content[start:start + self.chunk_chars])
+            yield SimpleNamespace(choices=[SimpleNamespace(delta=delta)])
+            await asyncio.sleep(delay)
+
+    async def close(self):
+        pass
+
+
+class FakeCompletions:
+
+    def __init__(self, first_token_latency: float, tokens_per_second: float, phases: int):
+        self.first_token_latency = first_token_latency
+        self.tokens_per_second = tokens_per_second
+        self.phases = phases
+        self.calls = 0
+
+    def _content(self, messages: list) -> str:
+        document = fake_roadmap_document(self.phases)
+        if "Personalizer" in messages[0]["content"]:
+            candidate = json.loads(messages[1]["content"])["candidates"][0]
+            return json.dumps({
+                "career_decision": {**document["career_decision"], "career": candidate["career"]},
+                "template_id": candidate["template_id"],
+                "patch": {"duration_months": candidate["duration_months"], "skip": [0], "durations": {"1": "2-3 weeks"}}
+            })
+        if "Adapter" in messages[0]["content"]:
+            request = json.loads(messages[1]["content"])
+            if "remaining_phases" in request:
+                # Delta adapt: replace only the phases that were sent
+                remaining = len(request["remaining_phases"])
+                document = fake_roadmap_document(self.phases)
+                document["learning_roadmap"]["roadmap"] = document["learning_roadmap"]["roadmap"][-remaining:] if remaining else []
+            return json.dumps(document["learning_roadmap"])
+        return json.dumps(document)
+
+    async def create(self, messages: list, stream: bool = False, **kwargs):
+        self.calls += 1
+        content = self._content(messages)
+        completion_tokens = len(content) // 4
+        prompt_tokens = sum(len(m["content"]) for m in messages) // 4
+
+        if stream:
+            return FakeStream(content, self.first_token_latency, self.tokens_per_second)
+
+        await asyncio.sleep(self.first_token_latency + completion_tokens / self.tokens_per_second)
+        return SimpleNamespace(
+            choices=[SimpleNamespace(message=SimpleNamespace(content=content))],
+            usage=SimpleNamespace(
+                prompt_tokens=prompt_tokens,
+                completion_tokens=completion_tokens,
+                total_tokens=prompt_tokens + completion_tokens
+            )
+        )
+
+
+class FakeGroq:
+    """Stands in for AsyncGroq with configurable latency and token throughput."""
+
+    def __init__(self, first_token_latency: float = 0.5, tokens_per_second: float = 2000, phases: int = 5):
+        self.chat = SimpleNamespace(
+            completions=FakeCompletions(first_token_latency, tokens_per_second, phases)
+        )
+
+
+class FakeFirestore(AsyncStorageBackend):
+    """
+    MemoryBackend with a simulated network round trip on every call, awaited
+    like the asyncio Firestore client.
+    """
+
+    def __init__(self, latency: float = 0.02, jitter: float = 0.01):
+        self.latency = latency
+        self.jitter = jitter
+        self.inner = MemoryBackend()
+        self.calls = 0
+
+    async def _round_trip(self):
+        self.calls += 1
+        await asyncio.sleep(max(0.0, self.latency + random.uniform(-self.jitter, self.jitter)))
+
+    async def get_profile(self, user_id):
+        await self._round_trip()
+        return self.inner.get_profile(user_id)
+
+    async def save_profile(self, user_id, profile):
+        await self._round_trip()
+        return self.inner.save_profile(user_id, profile)
+
+    async def save_analysis(self, user_id, analysis, active_roadmap):
+        await self._round_trip()
+        return self.inner.save_analysis(user_id, analysis, active_roadmap)
+
+    async def get_active_roadmap(self, user_id):
+        await self._round_trip()
+        return self.inner.get_active_roadmap(user_id)
+
+    async def set_active_roadmap(self, user_id, data):
+        await self._round_trip()
+        return self.inner.set_active_roadmap(user_id, data)
+
+    async def replace_active_roadmap(self, user_id, data, expected_version):
+        await self._round_trip()
+        return self.inner.replace_active_roadmap(user_id, data, expected_version)
+
+    async def merge_active_roadmap(self, user_id, merge):
+        # A transaction is a read and a commit
+        await self._round_trip()
+        await self._round_trip()
+        return self.inner.merge_active_roadmap(user_id, merge)
+
+    async def update_phase(self, user_id, phase_index, phase_state, progress, completed_delta, updated_at, expected_version):
+        await self._round_trip()
+        return self.inner.update_phase(user_id, phase_index, phase_state, progress, completed_delta, updated_at, expected_version)
+
+    async def delete_active_roadmap(self, user_id):
+        await self._round_trip()
+        return self.inner.delete_active_roadmap(user_id)
+
+
+def fake_verify_firebase_token(authorization: str = Header(...)) -> str:
+    # "Bearer <uid>" -> "<uid>"
+    return authorization.split(" ", 1)[1]
@@ -0,0 +1,287 @@
+"""
+End-to-end benchmark for the SkillRoute API.
+
+Runs the FastAPI app in-process against a fake Groq client, a fake Firestore
+backend and a fake token verifier, drives a weighted mix of endpoints at a
+fixed concurrency, and writes per-endpoint RPS, latency percentiles and
+event-loop lag to JSON.
+
+    python -m benchmarks.run --duration 30 --concurrency 50 --out bench.json
+    python -m benchmarks.run --compare bench.json --out bench-new.json
+"""
+import argparse
+import asyncio
+import json
+import os
+import random
+import subprocess
+import time
+from collections import defaultdict
+
+# The app reads its configuration at import time
+os.environ.setdefault("GROQ_API_KEY", "benchmark")
+os.environ.setdefault("STORAGE_BACKEND", "memory")
+# Virtual users hit the LLM endpoints far faster than the per-user limit allows
+os.environ.setdefault("RATE_LIMIT_PER_MINUTE", "0")
+
+import httpx
+
+from app.main import app
+from app.services import llm_gateway
+from app.services.storage_backends import set_async_backend
+from app.utils.auth import verify_firebase_token
+from benchmarks.fakes import FakeFirestore, FakeGroq, fake_verify_firebase_token
+
+DEFAULT_MIX = "roadmap=1,update=8,adapt=1,dashboard=20"
+
+PROFILE_SKILLS = ["Python", "React", "SQL", "Java", "Docker", "Data Analysis", "JavaScript", "Go"]
+PROFILE_INTERESTS = ["Web Development", "Data Science", "Cloud", "Mobile", "Security"]
+
+
+def percentile(values: list, pct: float) -> float:
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    index = min(len(ordered) - 1, max(0, int(round(pct / 100 * len(ordered))) - 1))
+    return ordered[index]
+
+
+def parse_mix(mix: str) -> dict:
+    weights = {}
+    for part in mix.split(","):
+        name, _, weight = part.partition("=")
+        weights[name.strip()] = float(weight or 1)
+    return weights
+
+
+def random_profile(variety: int) -> dict:
+    # `variety` bounds the number of distinct profiles, which controls the
+    # roadmap cache hit rate.
+    seed = random.randrange(variety)
+    rng = random.Random(seed)
+    return {
+        "name": f"Student {seed}",
+        "education": rng.choice(["bachelors", "masters", "high_school", "bootcamp"]),
+        "skills": ", ".join(rng.sample(PROFILE_SKILLS, 3)),
+        "interests": ", ".join(rng.sample(PROFILE_INTERESTS, 2)),
+        "goals": "Become a software engineer",
+        "experience": None
+    }
+
+
+class Recorder:
+
+    def __init__(self):
+        self.latencies = defaultdict(list)
+        self.errors = defaultdict(int)
+        self.loop_lag = defaultdict(list)
+        self.all_loop_lag = []
+        self.in_flight = defaultdict(int)
+
+    def record_lag(self, lag_ms: float):
+        self.all_loop_lag.append(lag_ms)
+        # Attribute the sample to every endpoint with a request in flight
+        for endpoint, count in self.in_flight.items():
+            if count:
+                self.loop_lag[endpoint].append(lag_ms)
+
+
+async def monitor_loop_lag(recorder: Recorder, stop: asyncio.Event, interval: float = 0.01):
+    loop = asyncio.get_running_loop()
+    while not stop.is_set():
+        started = loop.time()
+        await asyncio.sleep(interval)
+        recorder.record_lag(max(0.0, (loop.time() - started - interval) * 1000))
+
+
+def record_phase_count(phase_counts: dict, user_id: str, response):
+    # Template roadmaps skip phases, so the count differs from --phases
+    if response.status_code == 200:
+        phase_counts[user_id] = len(response.json()["learning_roadmap"]["roadmap"])
+
+
+async def call_endpoint(client: httpx.AsyncClient, endpoint: str, user_id: str, phase_counts: dict, args):
+    headers = {"Authorization": f"Bearer {user_id}"}
+
+    if endpoint == "roadmap":
+        response = await client.post("/api/career/roadmap", json=random_profile(args.profile_variety), headers=headers)
+        record_phase_count(phase_counts, user_id, response)
+        return [response]
+    if endpoint == "update":
+        # Only indices the active roadmap has, so a 404 is a real failure
+        body = {"phase_index": random.randrange(phase_counts[user_id]), "status": random.choice(["completed", "pending"])}
+        return [await client.post("/api/progress/update", json=body, headers=headers)]
+    if endpoint == "adapt":
+        response = await client.post("/api/progress/adapt", headers=headers)
+        record_phase_count(phase_counts, user_id, response)
+        return [response]
+    if endpoint == "dashboard":
+        # The dashboard loads these together on page view
+        return await asyncio.gather(
+            client.get("/api/students/profile", headers=headers),
+            client.get("/api/career/roadmap", headers=headers),
+            client.get("/api/career/insights", headers=headers),
+            client.get("/api/career/alternatives", headers=headers)
+        )
+    raise ValueError(f"Unknown endpoint: {endpoint}")
+
+
+async def virtual_user(client, user_id: str, weights: dict, deadline: float, recorder: Recorder, phase_counts: dict, args):
+    endpoints = list(weights)
+    endpoint_weights = [weights[name] for name in endpoints]
+
+    while time.perf_counter() < deadline:
+        endpoint = random.choices(endpoints, endpoint_weights)[0]
+        recorder.in_flight[endpoint] += 1
+        started = time.perf_counter()
+        try:
+            responses = await call_endpoint(client, endpoint, user_id, phase_counts, args)
+            if any(response.status_code >= 400 for response in responses):
+                recorder.errors[endpoint] += 1
+        except Exception:
+            recorder.errors[endpoint] += 1
+        finally:
+            recorder.in_flight[endpoint] -= 1
+        recorder.latencies[endpoint].append((time.perf_counter() - started) * 1000)
+
+
+async def setup_users(client, users: list, phase_counts: dict, args):
+    # Every virtual user starts with a profile and an active roadmap
+    semaphore = asyncio.Semaphore(args.concurrency)
+
+    async def setup(user_id):
+        async with semaphore:
+            headers = {"Authorization": f"Bearer {user_id}"}
+            profile = random_profile(args.profile_variety)
+            await client.post("/api/students/profile", json=profile, headers=headers)
+            response = await client.post("/api/career/roadmap", json=profile, headers=headers)
+            record_phase_count(phase_counts, user_id, response)
+
+    await asyncio.gather(*(setup(user_id) for user_id in users))
+
+
+def summarize(recorder: Recorder, elapsed: float) -> dict:
+    endpoints = {}
+    for endpoint, latencies in recorder.latencies.items():
+        lag = recorder.loop_lag.get(endpoint, [])
+        endpoints[endpoint] = {
+            "requests": len(latencies),
+            "errors": recorder.errors.get(endpoint, 0),
+            "rps": round(len(latencies) / elapsed, 2),
+            "p50_ms": round(percentile(latencies, 50), 2),
+            "p95_ms": round(percentile(latencies, 95), 2),
+            "p99_ms": round(percentile(latencies, 99), 2),
+            "max_ms": round(max(latencies), 2),
+            "loop_lag_p99_ms": round(percentile(lag, 99), 2),
+            "loop_lag_max_ms": round(max(lag), 2) if lag else 0.0
+        }
+
+    total = sum(len(latencies) for latencies in recorder.latencies.values())
+    return {
+        "elapsed_seconds": round(elapsed, 2),
+        "total_requests": total,
+        "total_rps": round(total / elapsed, 2),
+        "loop_lag": {
+            "p50_ms": round(percentile(recorder.all_loop_lag, 50), 2),
+            "p99_ms": round(percentile(recorder.all_loop_lag, 99), 2),
+            "max_ms": round(max(recorder.all_loop_lag), 2) if recorder.all_loop_lag else 0.0
+        },
+        "endpoints": endpoints
+    }
+
+
+def git_commit() -> str:
+    try:
+        return subprocess.check_output(["git", "rev-parse", "--short", "HEAD"], text=True).strip()
+    except Exception:
+        return "unknown"
+
+
+def print_report(report: dict, baseline: dict = None):
+    print(f"\n{'endpoint':<12}{'req':>8}{'err':>6}{'rps':>9}{'p50':>9}{'p95':>9}{'p99':>9}{'lag p99':>10}")
+    for endpoint, stats in sorted(report["results"]["endpoints"].items()):
+        line = (
+            f"{endpoint:<12}{stats['requests']:>8}{stats['errors']:>6}{stats['rps']:>9}"
+            f"{stats['p50_ms']:>9}{stats['p95_ms']:>9}{stats['p99_ms']:>9}{stats['loop_lag_p99_ms']:>10}"
+        )
+        previous = (baseline or {}).get("results", {}).get("endpoints", {}).get(endpoint)
+        if previous and previous["p99_ms"]:
+            change = (stats["p99_ms"] - previous["p99_ms"]) / previous["p99_ms"] * 100
+            line += f"   p99 {change:+.1f}% vs {baseline.get('git_commit', 'baseline')}"
+        print(line)
+
+    results = report["results"]
+    print(f"\ntotal: {results['total_requests']} requests, {results['total_rps']} rps, "
+          f"loop lag p99 {results['loop_lag']['p99_ms']} ms")
+
+
+async def run(args) -> dict:
+    fake_groq = FakeGroq(args.llm_latency, args.llm_tokens_per_second, args.phases)
+    fake_firestore = FakeFirestore(args.db_latency)
+    llm_gateway.client = fake_groq
+    set_async_backend(fake_firestore)
+    app.dependency_overrides[verify_firebase_token] = fake_verify_firebase_token
+
+    users = [f"bench-user-{i}" for i in range(args.users or args.concurrency)]
+    recorder = Recorder()
+    phase_counts = {}
+    stop = asyncio.Event()
+
+    transport = httpx.ASGITransport(app=app)
+    limits = httpx.Limits(max_connections=None)
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench", timeout=None, limits=limits) as client:
+        await setup_users(client, users, phase_counts, args)
+
+        monitor = asyncio.create_task(monitor_loop_lag(recorder, stop))
+        started = time.perf_counter()
+        deadline = started + args.duration
+        await asyncio.gather(*(
+            virtual_user(client, users[i % len(users)], parse_mix(args.mix), deadline, recorder, phase_counts, args)
+            for i in range(args.concurrency)
+        ))
+        elapsed = time.perf_counter() - started
+        stop.set()
+        await monitor
+
+    return {
+        "git_commit": git_commit(),
+        "timestamp": time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime()),
+        "config": vars(args),
+        "llm_calls": fake_groq.chat.completions.calls,
+        "storage_calls": fake_firestore.calls,
+        "results": summarize(recorder, elapsed)
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="SkillRoute end-to-end benchmark")
+    parser.add_argument("--duration", type=float, default=20, help="seconds of measured load")
+    parser.add_argument("--concurrency", type=int, default=20, help="concurrent virtual users")
+    parser.add_argument("--users", type=int, default=0, help="distinct user ids (default: concurrency)")
+    parser.add_argument("--mix", default=DEFAULT_MIX, help="weighted endpoint mix, e.g. " + DEFAULT_MIX)
+    parser.add_argument("--profile-variety", type=int, default=50, help="distinct student profiles")
+    parser.add_argument("--phases", type=int, default=5, help="phases per fake roadmap")
+    parser.add_argument("--llm-latency", type=float, default=0.5, help="fake LLM time to first token (s)")
+    parser.add_argument("--llm-tokens-per-second", type=float, default=2000, help="fake LLM throughput")
+    parser.add_argument("--db-latency", type=float, default=0.02, help="fake Firestore round trip (s)")
+    parser.add_argument("--seed", type=int, default=1)
+    parser.add_argument("--out", default="benchmark-results.json")
+    parser.add_argument("--compare", help="previous results JSON to compare against")
+    args = parser.parse_args()
+
+    random.seed(args.seed)
+    report = asyncio.run(run(args))
+
+    with open(args.out, "w") as f:
+        json.dump(report, f, indent=2)
+
+    baseline = None
+    if args.compare:
+        with open(args.compare) as f:
+            baseline = json.load(f)
+    print_report(report, baseline)
+    print(f"results written to {args.out}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,68 @@
+import asyncio
+import os
+import sys
+
+# Settings are read at import time, so they have to be in place before app.*
+os.environ.setdefault("STORAGE_BACKEND", "memory")
+os.environ.setdefault("GROQ_API_KEY", "test")
+os.environ.setdefault("RATE_LIMIT_PER_MINUTE", "0")
+os.environ.setdefault("STARTUP_WARMUP", "false")
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import pytest
+from fastapi.testclient import TestClient
+
+
+@pytest.fixture
+def client():
+    from app.main import app
+    from app.utils.auth import verify_firebase_token
+
+    app.dependency_overrides[verify_firebase_token] = lambda: "test-user"
+    try:
+        yield TestClient(app)
+    finally:
+        app.dependency_overrides.clear()
+
+
+@pytest.fixture(autouse=True)
+def llm_gateway_state(monkeypatch):
+    """A closed circuit and a fresh concurrency slot pool for every test."""
+    from app.services import llm_gateway
+    from app.utils.circuit_breaker import CircuitBreaker
+
+    old = llm_gateway.breaker
+    monkeypatch.setattr(llm_gateway, "breaker", CircuitBreaker(
+        old.name, old._calls.maxlen, old.min_calls, old.failure_rate,
+        old.slow_call_seconds, old.slow_call_rate, old.open_seconds
+    ))
+    monkeypatch.setattr(llm_gateway, "_semaphore", asyncio.Semaphore(llm_gateway.LLM_MAX_CONCURRENCY))
+
+
+@pytest.fixture
+def fake_groq(monkeypatch):
+    """Groq replaced by the benchmark's fake, answering (almost) instantly."""
+    from benchmarks.fakes import FakeGroq
+    from app.services import llm_gateway
+
+    fake = FakeGroq(first_token_latency=0, tokens_per_second=1e9, phases=4)
+    monkeypatch.setattr(llm_gateway, "client", fake)
+    return fake
+
+
+@pytest.fixture
+def memory_storage():
+    """A fresh in-memory backend with an empty roadmap cache."""
+    from app.services import storage_backends, storage_service
+    from app.services.storage_backends.memory_backend import MemoryBackend
+
+    previous = storage_backends.get_backend(), storage_backends.get_async_backend()
+    backend = MemoryBackend()
+    storage_backends.set_backend(backend)
+    storage_service._active_roadmap_cache.clear()
+    try:
+        yield backend
+    finally:
+        storage_backends.set_backend(previous[0])
+        storage_backends.set_async_backend(previous[1])
+        storage_service._active_roadmap_cache.clear()
@@ -0,0 +1,99 @@
+import asyncio
+from collections import OrderedDict
+import pytest
+from benchmarks.fakes import fake_roadmap_document
+from app.services import storage_backends, storage_service
+from app.services.storage_backends.memory_backend import MemoryBackend
+
+USER_ID = "student-1"
+
+
+class CountingBackend(MemoryBackend):
+    """Counts reads, and lets a test play the change feed of another worker."""
+
+    def __init__(self):
+        super().__init__()
+        self.reads = 0
+        self.watchers = {}
+
+    def get_active_roadmap(self, user_id):
+        self.reads += 1
+        return super().get_active_roadmap(user_id)
+
+    def watch_active_roadmap(self, user_id, on_change):
+        self.watchers[user_id] = on_change
+        return lambda: self.watchers.pop(user_id, None)
+
+
+@pytest.fixture
+def backend(memory_storage):
+    backend = CountingBackend()
+    storage_backends.set_backend(backend)
+    return backend
+
+
+def _seed():
+    document = fake_roadmap_document(3, 1)
+    asyncio.run(storage_service.save_active_roadmap(USER_ID, document["career_decision"], document["learning_roadmap"]))
+    storage_service._active_roadmap_cache.clear()
+
+
+def _read():
+    return asyncio.run(storage_service.get_active_roadmap(USER_ID))
+
+
+def test_reads_go_through_the_cache(backend):
+    _seed()
+
+    first = _read()
+    second = _read()
+
+    assert first == second
+    assert backend.reads == 1
+
+
+def test_callers_get_private_copies(backend):
+    _seed()
+
+    _read()["learning_roadmap"]["roadmap"].clear()
+    assert len(_read()["learning_roadmap"]["roadmap"]) == 3
+
+
+def test_writes_refresh_the_cache(backend):
+    _seed()
+    _read()
+
+    asyncio.run(storage_service.update_phase_status(USER_ID, 0, "completed"))
+    reads = backend.reads
+
+    data = _read()
+    assert data["learning_roadmap"]["roadmap"][0]["status"] == "completed"
+    assert data["progress"]["completed_phases"] == 1
+    assert backend.reads == reads
+
+
+def test_delete_evicts(backend):
+    _seed()
+    _read()
+
+    assert asyncio.run(storage_service.delete_active_roadmap(USER_ID))
+    assert _read() is None
+
+
+def test_snapshot_mode_follows_other_workers_writes(backend, monkeypatch):
+    monkeypatch.setattr(storage_service, "ACTIVE_ROADMAP_CACHE_MODE", "snapshot")
+    monkeypatch.setattr(storage_service, "_snapshot_watches", OrderedDict())
+    _seed()
+    _read()
+    assert USER_ID in backend.watchers
+
+    # Another worker rewrites the roadmap, then deletes it
+    data, _ = MemoryBackend.get_active_roadmap(backend, USER_ID)
+    data["career_decision"]["career"] = "Data Engineer"
+    backend.watchers[USER_ID](data, 99)
+    assert _read()["career_decision"]["career"] == "Data Engineer"
+
+    backend.watchers[USER_ID](None, None)
+    reads = backend.reads
+    _read()
+    assert backend.reads == reads + 1
@@ -0,0 +1,69 @@
+import asyncio
+import pytest
+from benchmarks.fakes import fake_roadmap_document
+from app.services import roadmap_service, storage_backends, storage_service
+from app.services.storage_backends.memory_backend import MemoryBackend
+
+USER_ID = "student-1"
+
+
+class CountingBackend(MemoryBackend):
+
+    def __init__(self):
+        super().__init__()
+        self.calls = []
+
+    def get_active_roadmap(self, user_id):
+        self.calls.append("get")
+        return super().get_active_roadmap(user_id)
+
+    def replace_active_roadmap(self, user_id, data, expected_version):
+        self.calls.append("replace")
+        return super().replace_active_roadmap(user_id, data, expected_version)
+
+    def merge_active_roadmap(self, user_id, merge):
+        self.calls.append("merge")
+        return super().merge_active_roadmap(user_id, merge)
+
+
+@pytest.fixture
+def backend(memory_storage, fake_groq):
+    backend = CountingBackend()
+    storage_backends.set_backend(backend)
+    document = fake_roadmap_document(4, 1)
+    asyncio.run(storage_service.save_active_roadmap(USER_ID, document["career_decision"], document["learning_roadmap"]))
+    storage_service._active_roadmap_cache.clear()
+    backend.calls.clear()
+    return backend
+
+
+def test_adapt_is_one_read_and_one_conditional_write(backend):
+    adapted = asyncio.run(roadmap_service.adapt_and_save_roadmap(USER_ID))
+
+    assert backend.calls == ["get", "replace"]
+    assert asyncio.run(storage_service.get_active_roadmap(USER_ID)) == adapted
+    # Served from the cache the write refreshed
+    assert backend.calls == ["get", "replace"]
+
+
+def test_progress_made_during_the_llm_call_is_kept(backend, monkeypatch):
+    adapt_roadmap = roadmap_service.adapt_roadmap
+
+    async def slow_adapt(current_data):
+        # The student completes a phase while the model is thinking
+        await storage_service.update_phase_status(USER_ID, 0, "completed")
+        return await adapt_roadmap(current_data)
+
+    monkeypatch.setattr(roadmap_service, "adapt_roadmap", slow_adapt)
+
+    adapted = asyncio.run(roadmap_service.adapt_and_save_roadmap(USER_ID))
+
+    assert backend.calls[-2:] == ["replace", "merge"]
+    assert adapted["learning_roadmap"]["roadmap"][0]["status"] == "completed"
+    assert adapted["progress"]["completed_phases"] == 1
+    assert asyncio.run(storage_service.get_active_roadmap(USER_ID)) == adapted
+
+
+def test_adapt_without_a_roadmap(memory_storage, fake_groq):
+    assert asyncio.run(roadmap_service.adapt_and_save_roadmap(USER_ID)) is None
+    assert fake_groq.chat.completions.calls == 0
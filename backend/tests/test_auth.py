@@ -0,0 +1,63 @@
+import asyncio
+import time
+import pytest
+from fastapi import HTTPException
+from app.utils import auth
+
+
+@pytest.fixture
+def verifications(monkeypatch):
+    """Tokens passed to Firebase; "bad" fails, "<uid>:<seconds>" expires after that long."""
+    calls = []
+
+    def verify(token):
+        calls.append(token)
+        if token == "bad":
+            raise ValueError("invalid signature")
+        uid, lifetime = token.split(":")
+        return {"uid": uid, "exp": time.time() + float(lifetime)}
+
+    monkeypatch.setattr(auth, "_verify_id_token", verify)
+    auth._token_cache.clear()
+    yield calls
+    auth._token_cache.clear()
+
+
+def test_verified_tokens_are_cached(verifications):
+    async def scenario():
+        return [await auth.verify_firebase_token("Bearer alice:3600") for _ in range(3)]
+
+    assert asyncio.run(scenario()) == ["alice", "alice", "alice"]
+    assert verifications == ["alice:3600"]
+    # Keyed by a hash, so the raw token isn't held in memory
+    assert "alice:3600" not in auth._token_cache._data
+
+
+def test_cache_entry_ends_with_the_token(verifications):
+    asyncio.run(auth.verify_firebase_token("Bearer bob:60"))
+    _, expires_at = auth._token_cache._data[auth._token_key("bob:60")]
+    assert expires_at <= time.monotonic() + 60
+
+    # Already expired tokens are never cached
+    asyncio.run(auth.verify_firebase_token("Bearer carol:-1"))
+    asyncio.run(auth.verify_firebase_token("Bearer carol:-1"))
+    assert verifications.count("carol:-1") == 2
+
+
+def test_cache_ttl_is_capped(verifications, monkeypatch):
+    monkeypatch.setattr(auth, "TOKEN_CACHE_MAX_TTL_SECONDS", 5)
+    asyncio.run(auth.verify_firebase_token("Bearer dave:3600"))
+    _, expires_at = auth._token_cache._data[auth._token_key("dave:3600")]
+    assert expires_at <= time.monotonic() + 5
+
+
+def test_invalid_tokens_are_rejected_and_not_cached(verifications):
+    for _ in range(2):
+        with pytest.raises(HTTPException) as error:
+            asyncio.run(auth.verify_firebase_token("Bearer bad"))
+        assert error.value.status_code == 401
+    assert verifications == ["bad", "bad"]
+
+    with pytest.raises(HTTPException) as error:
+        asyncio.run(auth.verify_firebase_token("Token abc"))
+    assert error.value.status_code == 401
@@ -0,0 +1,26 @@
+import asyncio
+import random
+from types import SimpleNamespace
+from app.main import app
+from app.services import llm_gateway
+from benchmarks import run as benchmark
+
+
+def test_short_run_has_no_errors(memory_storage, monkeypatch):
+    monkeypatch.setattr(llm_gateway, "client", None)
+    random.seed(1)
+    args = SimpleNamespace(
+        duration=0.5, concurrency=5, users=0, mix="roadmap=1,update=8,adapt=1,dashboard=4",
+        profile_variety=5, phases=5, llm_latency=0, llm_tokens_per_second=1e9, db_latency=0, seed=1
+    )
+
+    try:
+        report = asyncio.run(benchmark.run(args))
+    finally:
+        app.dependency_overrides.clear()
+
+    results = report["results"]["endpoints"]
+    assert results["update"]["requests"] > 0
+    # Updates only target phases the user's roadmap has, so nothing is an
+    # expected 404
+    assert {endpoint: result["errors"] for endpoint, result in results.items()} == {endpoint: 0 for endpoint in results}
@@ -0,0 +1,117 @@
+import pytest
+from app.utils import circuit_breaker
+from app.utils.circuit_breaker import CLOSED, HALF_OPEN, OPEN, CircuitBreaker, CircuitOpenError
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    now = [1000.0]
+    monkeypatch.setattr(circuit_breaker.time, "monotonic", lambda: now[0])
+    return now
+
+
+@pytest.fixture
+def breaker(clock):
+    return CircuitBreaker(
+        "test", window=4, min_calls=4, failure_rate=0.5,
+        slow_call_seconds=10, slow_call_rate=0.75, open_seconds=30
+    )
+
+
+def fail_until_open(breaker):
+    for _ in range(4):
+        breaker.record(False, 1, breaker.before_call())
+    assert breaker.state == OPEN
+
+
+def test_closed_until_failure_rate_is_crossed(breaker):
+    for success in (True, True, False):
+        assert breaker.before_call() is None
+        breaker.record(success, 1)
+    assert breaker.state == CLOSED
+
+    breaker.record(False, 1)
+    assert breaker.state == OPEN
+    assert breaker.times_opened == 1
+
+
+def test_slow_calls_open_the_circuit(breaker):
+    for _ in range(3):
+        breaker.record(True, 10)
+    breaker.record(True, 1)
+    assert breaker.state == OPEN
+
+
+def test_open_circuit_rejects_calls(breaker, clock):
+    fail_until_open(breaker)
+    clock[0] += 10
+
+    with pytest.raises(CircuitOpenError) as error:
+        breaker.before_call()
+    assert error.value.retry_after == 20
+
+
+def test_half_open_lets_one_probe_through(breaker, clock):
+    fail_until_open(breaker)
+    clock[0] += 30
+    assert breaker.state == HALF_OPEN
+
+    probe = breaker.before_call()
+    assert probe is not None
+    with pytest.raises(CircuitOpenError):
+        breaker.before_call()
+
+    breaker.record(True, 1, probe)
+    assert breaker.state == CLOSED
+    assert breaker.before_call() is None
+
+
+@pytest.mark.parametrize("duration", [1, 10])
+def test_failed_or_slow_probe_reopens(breaker, clock, duration):
+    fail_until_open(breaker)
+    clock[0] += 30
+
+    breaker.record(duration == 10, duration, breaker.before_call())
+    assert breaker.state == OPEN
+    assert breaker.times_opened == 2
+
+
+def test_released_probe_lets_the_next_call_probe(breaker, clock):
+    fail_until_open(breaker)
+    clock[0] += 30
+
+    breaker.release_probe(breaker.before_call())
+    assert breaker.state == HALF_OPEN
+    assert breaker.before_call() is not None
+
+
+def test_stragglers_do_not_decide_the_probe(breaker, clock):
+    # Admitted while closed, finishing after the circuit opened and went half-open
+    straggler = breaker.before_call()
+    fail_until_open(breaker)
+    clock[0] += 30
+    probe = breaker.before_call()
+
+    breaker.record(True, 1, straggler)
+    assert breaker.state == HALF_OPEN
+    with pytest.raises(CircuitOpenError):
+        breaker.before_call()
+    breaker.release_probe(straggler)
+    with pytest.raises(CircuitOpenError):
+        breaker.before_call()
+
+    breaker.record(False, 1, probe)
+    assert breaker.state == OPEN
+
+
+def test_stale_probe_token_is_ignored(breaker, clock):
+    fail_until_open(breaker)
+    clock[0] += 30
+    first = breaker.before_call()
+    breaker.release_probe(first)
+    second = breaker.before_call()
+
+    breaker.record(True, 1, first)
+    assert breaker.state == HALF_OPEN
+    breaker.record(True, 1, second)
+    assert breaker.state == CLOSED
@@ -0,0 +1,91 @@
+import asyncio
+import json
+import pytest
+from app.main import app
+from app.services import cohort_service, roadmap_cache, storage_service
+from app.utils import auth
+from app.utils.auth import verify_admin_token
+from app.utils.cache import TTLCache
+
+PROFILE = {
+    "name": "Student",
+    "education": "bachelors",
+    "skills": "Python, SQL",
+    "interests": "Backend development",
+    "goals": "Become a backend developer"
+}
+OTHER_PROFILE = {**PROFILE, "skills": "Figma, user research", "goals": "Become a UX designer"}
+
+
+@pytest.fixture
+def admin(client, memory_storage, fake_groq, monkeypatch):
+    app.dependency_overrides[verify_admin_token] = lambda: "admin"
+    monkeypatch.setattr(roadmap_cache, "_cache", TTLCache(maxsize=100, ttl=60))
+    return client
+
+
+def _events(response) -> list:
+    assert response.headers["content-type"].startswith("application/x-ndjson")
+    return [json.loads(line) for line in response.text.splitlines()]
+
+
+def _post(client, students, ndjson=False):
+    if ndjson:
+        body = "\n".join(student if isinstance(student, str) else json.dumps(student) for student in students)
+        return client.post("/api/admin/cohorts/roadmaps", content=body, headers={"Content-Type": "application/x-ndjson"})
+    return client.post("/api/admin/cohorts/roadmaps", json=students)
+
+
+def test_cohort_streams_results_and_saves_roadmaps(admin, fake_groq):
+    students = [
+        {"user_id": "s1", "profile": PROFILE},
+        # Same canonical profile (the name isn't part of it): generated once
+        {"user_id": "s2", "profile": {**PROFILE, "name": "Someone Else"}},
+        {"user_id": "s3", "profile": OTHER_PROFILE},
+        {"user_id": "s4", "profile": {"name": "No skills"}},
+    ]
+
+    events = _events(_post(admin, students))
+
+    results = {event["user_id"]: event for event in events if event["type"] == "result"}
+    assert set(results) == {"s1", "s2", "s3"}
+    assert [event["index"] for event in events if event["type"] == "error"] == [3]
+    assert events[-1] == {"type": "summary", "received": 4, "invalid": 1, "failed": 0, "saved": 3, "deduped": 1}
+    assert fake_groq.chat.completions.calls == 2
+
+    # Every student got their own copy of the shared roadmap
+    first = asyncio.run(storage_service.get_active_roadmap("s1"))
+    second = asyncio.run(storage_service.get_active_roadmap("s2"))
+    assert first["learning_roadmap"] == second["learning_roadmap"]
+    assert first["learning_roadmap"]["roadmap"] is not second["learning_roadmap"]["roadmap"]
+
+
+def test_ndjson_upload_reports_bad_lines(admin):
+    events = _events(_post(admin, [{"user_id": "s1", "profile": PROFILE}, "{not json", {"profile": PROFILE}], ndjson=True))
+
+    errors = {event["index"]: event["detail"] for event in events if event["type"] == "error"}
+    assert set(errors) == {1, 2}
+    assert errors[1].startswith("Invalid JSON")
+    assert "user_id" in errors[2]
+    assert events[-1]["saved"] == 1
+
+
+def test_unusable_uploads_are_rejected(admin, monkeypatch):
+    assert admin.post("/api/admin/cohorts/roadmaps", content=b"{", headers={"Content-Type": "application/json"}).status_code == 400
+    assert _post(admin, {"students": "nope"}).status_code == 400
+
+    monkeypatch.setattr(cohort_service, "COHORT_MAX_STUDENTS", 1)
+    students = [{"user_id": "s1", "profile": PROFILE}, {"user_id": "s2", "profile": PROFILE}]
+    assert _post(admin, students).status_code == 413
+    assert _post(admin, students, ndjson=True).status_code == 413
+
+
+def test_cohorts_need_an_admin(client, monkeypatch):
+    async def not_an_admin(token):
+        return {"uid": "student"}
+
+    monkeypatch.setattr(auth, "verify_id_token_cached", not_an_admin)
+    response = client.post(
+        "/api/admin/cohorts/roadmaps", json=[], headers={"Authorization": "Bearer token"}
+    )
+    assert response.status_code == 403
@@ -0,0 +1,79 @@
+import asyncio
+from types import SimpleNamespace
+from app.services.storage_backends import firestore_backend
+
+
+class FakeAsyncBatch:
+
+    def __init__(self, commits: list):
+        self.commits = commits
+        self.writes = []
+
+    def set(self, ref, data):
+        self.writes.append((ref, data))
+
+    async def commit(self):
+        self.commits.append(len(self.writes))
+        return [SimpleNamespace(update_time=ref) for ref, _ in self.writes]
+
+
+class FakeRef(str):
+
+    def collection(self, name):
+        return FakeCollection(f"{self}/{name}")
+
+
+class FakeCollection(str):
+
+    def document(self, name: str = "auto"):
+        return FakeRef(f"{self}/{name}")
+
+
+def test_async_save_analyses_chunks_like_the_sync_backend(monkeypatch):
+    commits = []
+    db = SimpleNamespace(batch=lambda: FakeAsyncBatch(commits), collection=FakeCollection)
+    monkeypatch.setattr(firestore_backend, "get_async_db", lambda: db)
+
+    items = [(f"user-{i}", {"n": i}, {"learning_roadmap": {}}) for i in range(260)]
+    versions = asyncio.run(firestore_backend.AsyncFirestoreBackend().save_analyses(items))
+
+    assert commits == [firestore_backend.MAX_BATCH_WRITES, 20]
+    assert versions == [f"users/user-{i}/active_roadmap/current" for i in range(260)]
+
+
+class FakeBatch(FakeAsyncBatch):
+
+    def commit(self):
+        self.commits.append(len(self.writes))
+        return [SimpleNamespace(update_time=ref) for ref, _ in self.writes]
+
+
+def test_save_analysis_is_one_batch(monkeypatch):
+    commits = []
+    db = SimpleNamespace(batch=lambda: FakeBatch(commits), collection=FakeCollection)
+    monkeypatch.setattr(firestore_backend, "get_db", lambda: db)
+
+    version = firestore_backend.FirestoreBackend().save_analysis("user-1", {"n": 1}, {"learning_roadmap": {}})
+
+    # History and active roadmap commit together, in one round trip
+    assert commits == [2]
+    assert version == "users/user-1/active_roadmap/current"
+
+
+def test_save_analyses_never_splits_a_user(monkeypatch):
+    commits = []
+    batches = []
+
+    def batch():
+        batches.append(FakeBatch(commits))
+        return batches[-1]
+
+    monkeypatch.setattr(firestore_backend, "get_db", lambda: SimpleNamespace(batch=batch, collection=FakeCollection))
+
+    items = [(f"user-{i}", {"n": i}, {"learning_roadmap": {}}) for i in range(260)]
+    firestore_backend.FirestoreBackend().save_analyses(items)
+
+    assert commits == [firestore_backend.MAX_BATCH_WRITES, 20]
+    for fake in batches:
+        users = [ref.split("/")[1] for ref, _ in fake.writes]
+        assert users[::2] == users[1::2]
@@ -0,0 +1,46 @@
+from app.services.industry_demand import DemandIndex, get_demand_index
+
+DEFAULTS = {"demand_level": "stable", "growth_projection": "moderate", "job_openings_estimate": "moderate", "avg_salary_range": "varies"}
+
+
+def _entry(title, aliases=(), level="stable"):
+    return {**DEFAULTS, "title": title, "aliases": list(aliases), "demand_level": level}
+
+
+INDEX = DemandIndex({
+    "default": DEFAULTS,
+    "titles": [
+        _entry("Engineer", level="default-engineer"),
+        _entry("Data Engineer", ["big data engineer"], level="high"),
+        _entry("Machine Learning Engineer", ["ml engineer"], level="trending"),
+    ]
+})
+
+
+def test_exact_titles_and_aliases():
+    assert INDEX.lookup("Data Engineer")["matched_title"] == "Data Engineer"
+    assert INDEX.lookup("ML-Engineer")["matched_title"] == "Machine Learning Engineer"
+
+
+def test_most_specific_phrase_wins():
+    assert INDEX.lookup("Senior Big Data Engineer II")["demand_level"] == "high"
+    assert INDEX.lookup("Principal Machine Learning Engineer")["demand_level"] == "trending"
+    assert INDEX.lookup("Civil Engineer")["demand_level"] == "default-engineer"
+
+
+def test_unknown_titles_get_the_default():
+    assert INDEX.lookup("Florist") == {**DEFAULTS, "matched_title": None}
+    assert INDEX.lookup("") == {**DEFAULTS, "matched_title": None}
+
+
+def test_lookup_many_returns_independent_results():
+    results = INDEX.lookup_many(["Data Engineer", "data engineer", "Florist"])
+    assert [result["matched_title"] for result in results] == ["Data Engineer", "Data Engineer", None]
+    results[0]["demand_level"] = "changed"
+    assert results[1]["demand_level"] == "high"
+
+
+def test_shipped_dataset_loads():
+    index = get_demand_index()
+    assert len(index) > 0
+    assert index.lookup("Senior AI Engineer")["matched_title"] == "AI Engineer"
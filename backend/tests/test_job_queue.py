@@ -0,0 +1,128 @@
+import asyncio
+import sqlite3
+import time
+import pytest
+from app.services import job_queue
+from app.services.job_queue import SQLiteJobStore
+
+
+def _job(job_id: str, status: str = "queued") -> dict:
+    now = time.time()
+    return {
+        "id": job_id, "user_id": f"user-{job_id}", "status": status, "created_at": now, "updated_at": now,
+        "result": None, "error": None, "profile": {"name": "x"}, "use_cache": True
+    }
+
+
+@pytest.fixture
+def sqlite_store(tmp_path, monkeypatch):
+    store = SQLiteJobStore(str(tmp_path / "jobs.db"))
+    monkeypatch.setattr(job_queue, "_store", store)
+    return store
+
+
+def test_only_expired_leases_are_claimed(tmp_path):
+    path = str(tmp_path / "jobs.db")
+    owner_a, owner_b = SQLiteJobStore(path), SQLiteJobStore(path)
+    owner_a.create(_job("queued"), "a", 60)
+    owner_a.create(_job("running", status="running"), "a", 60)
+
+    # Another process must not take jobs that are still owned
+    assert owner_b.claim_expired("b", 60, 10) == []
+
+    owner_a.release_leases("a")
+    assert {job["id"] for job in owner_b.claim_expired("b", 60, 10)} == {"queued", "running"}
+    # ... and once claimed they are b's
+    assert owner_a.claim_expired("a", 60, 10) == []
+
+
+def test_lifespan_resumes_orphaned_jobs(sqlite_store, monkeypatch):
+    # Left behind by a process whose lease ran out
+    sqlite_store.create(_job("orphan"), "dead-process", -1)
+
+    async def fake_generate(user_id, profile, use_cache=True):
+        return {"status": "success", "user_id": user_id}
+
+    monkeypatch.setattr(job_queue, "generate_and_save_roadmap", fake_generate)
+
+    async def scenario():
+        await job_queue.start()
+        try:
+            for _ in range(100):
+                job = await job_queue.get_job("orphan")
+                if job["status"] == "succeeded":
+                    return job
+                await asyncio.sleep(0.01)
+        finally:
+            await job_queue.stop()
+
+    assert asyncio.run(scenario())["result"]["user_id"] == "user-orphan"
+
+
+def test_app_lifespan_starts_workers(client):
+    with client:
+        assert job_queue.get_stats()["workers"] == job_queue.JOB_WORKERS
+    assert job_queue.get_stats()["workers"] == 0
+
+
+def test_wait_for_update_sees_update_made_before_subscribing(sqlite_store):
+    sqlite_store.create(_job("job"), "a", 60)
+    seen = sqlite_store.get("job")["updated_at"]
+    # Lands between the caller's read and its wait, with nobody subscribed
+    time.sleep(0.01)
+    sqlite_store.update("job", status="running")
+    job_queue._notify("job")
+
+    started = time.perf_counter()
+    job = asyncio.run(job_queue.wait_for_update("job", seen, timeout=5))
+    assert job["status"] == "running"
+    assert time.perf_counter() - started < 1
+
+
+def test_worker_survives_store_errors(monkeypatch):
+    store = job_queue.MemoryJobStore()
+    monkeypatch.setattr(job_queue, "_store", store)
+    store_update = store.update
+
+    def update(job_id, **fields):
+        if store.get(job_id)["user_id"] == "user-first" and fields.get("status") == "running":
+            raise sqlite3.OperationalError("database is locked")
+        store_update(job_id, **fields)
+
+    monkeypatch.setattr(store, "update", update)
+
+    async def fake_generate(user_id, profile, use_cache=True):
+        return {"status": "success"}
+
+    monkeypatch.setattr(job_queue, "generate_and_save_roadmap", fake_generate)
+    monkeypatch.setattr(job_queue, "JOB_WORKERS", 1)
+
+    async def scenario():
+        await job_queue.start()
+        try:
+            first = await job_queue.enqueue_roadmap_job("user-first", {"name": "x"})
+            second = await job_queue.enqueue_roadmap_job("user-second", {"name": "x"})
+            await asyncio.wait_for(job_queue._queue.join(), timeout=5)
+            return await job_queue.get_job(first["id"]), await job_queue.get_job(second["id"])
+        finally:
+            await job_queue.stop()
+
+    first, second = asyncio.run(scenario())
+    assert first["status"] == "failed"
+    # The same (only) worker went on to the next job
+    assert second["status"] == "succeeded"
+
+
+def test_memory_store_keeps_unfinished_jobs(monkeypatch):
+    store = job_queue.MemoryJobStore()
+    monkeypatch.setattr(store._finished, "maxsize", 2)
+    for i in range(5):
+        store.create(_job(f"queued-{i}"), "a", 60)
+    for i in range(5):
+        store.create(_job(f"done-{i}"), "a", 60)
+        store.update(f"done-{i}", status="succeeded")
+
+    assert all(store.get(f"queued-{i}")["status"] == "queued" for i in range(5))
+    assert store.active_job_for_user("user-queued-0")["id"] == "queued-0"
+    # Only finished jobs are evicted
+    assert [store.get(f"done-{i}") is not None for i in range(5)] == [False, False, False, True, True]
@@ -0,0 +1,49 @@
+import json
+import pytest
+from app.utils.json_repair import OK, REPAIRED, TRUNCATED, parse_json, strip_fences
+
+DOCUMENT = {"a": [1, 2, {"b": "c"}], "d": True}
+
+
+def test_valid_json_parses_as_is():
+    assert parse_json(json.dumps(DOCUMENT)) == (DOCUMENT, OK)
+
+
+def test_fence_inside_a_string_is_content():
+    text = '{"a": "run ```ls -la``` first"}'
+    assert parse_json(text) == ({"a": "run ```ls -la``` first"}, OK)
+    assert parse_json("```json\n" + text + "\n```") == ({"a": "run ```ls -la``` first"}, OK)
+
+
+@pytest.mark.parametrize("text", [
+    "```json\n" + json.dumps(DOCUMENT) + "\n```",
+    "```\n" + json.dumps(DOCUMENT) + "\n```",
+    "Here is the roadmap:\n" + json.dumps(DOCUMENT) + "\nGood luck!",
+])
+def test_fences_and_prose_are_ignored(text):
+    assert parse_json(text) == (DOCUMENT, OK)
+
+
+def test_only_a_leading_fence_is_stripped():
+    assert strip_fences("```json\n{}\n```") == "{}"
+    assert strip_fences('{"a": "```"}') == '{"a": "```"}'
+
+
+def test_trailing_commas_are_repaired():
+    assert parse_json('{"a": [1, 2,], "b": 3,}') == ({"a": [1, 2], "b": 3}, REPAIRED)
+
+
+@pytest.mark.parametrize("text, value", [
+    ('{"a": [1, 2, {"b": "c"', {"a": [1, 2, {"b": "c"}]}),
+    ('{"a": 1, "b": "unfinished', {"a": 1}),
+    ('{"a": 1, "b":', {"a": 1}),
+    ('```json\n[{"a": 1}, {"a": 2}, {"a"', [{"a": 1}, {"a": 2}, {}]),
+])
+def test_truncated_documents_keep_complete_values(text, value):
+    assert parse_json(text) == (value, TRUNCATED)
+
+
+@pytest.mark.parametrize("text", ["", None, "no json here", "```json\n```"])
+def test_nothing_usable_raises(text):
+    with pytest.raises(ValueError):
+        parse_json(text)
@@ -0,0 +1,119 @@
+import asyncio
+import json
+from types import SimpleNamespace
+import pytest
+from benchmarks.fakes import fake_roadmap_document
+from app.services import llm_gateway, roadmap_agent
+
+MESSAGES = [{"role": "user", "content": "hi"}]
+
+
+class SlowCompletions:
+    """Answers after `delay` seconds, counting how many calls overlap."""
+
+    def __init__(self, delay: float, failures: int = 0, content: str = "{}"):
+        self.delay = delay
+        self.failures = failures
+        self.content = content
+        self.running = 0
+        self.max_running = 0
+        self.calls = 0
+
+    async def create(self, messages, **kwargs):
+        self.calls += 1
+        self.running += 1
+        self.max_running = max(self.max_running, self.running)
+        try:
+            await asyncio.sleep(self.delay)
+            if self.calls <= self.failures:
+                raise ConnectionError("Groq is down")
+            return SimpleNamespace(
+                choices=[SimpleNamespace(message=SimpleNamespace(content=self.content))],
+                usage=SimpleNamespace(prompt_tokens=1, completion_tokens=1, total_tokens=2)
+            )
+        finally:
+            self.running -= 1
+
+
+@pytest.fixture
+def completions(monkeypatch):
+    completions = SlowCompletions(delay=0.05)
+    monkeypatch.setattr(llm_gateway, "client", SimpleNamespace(chat=SimpleNamespace(completions=completions)))
+    return completions
+
+
+def test_concurrency_is_bounded(completions, monkeypatch):
+    monkeypatch.setattr(llm_gateway, "_semaphore", asyncio.Semaphore(2))
+    monkeypatch.setattr(llm_gateway, "LLM_MAX_QUEUE_DEPTH", 0)
+
+    async def scenario():
+        return await asyncio.gather(*(llm_gateway.chat_completion(MESSAGES) for _ in range(6)))
+
+    assert len(asyncio.run(scenario())) == 6
+    assert completions.max_running == 2
+    assert llm_gateway.get_stats()["in_flight"] == 0
+
+
+def test_calls_do_not_block_the_event_loop(completions):
+    ticks = []
+
+    async def ticker():
+        while True:
+            ticks.append(1)
+            await asyncio.sleep(0.005)
+
+    async def scenario():
+        task = asyncio.create_task(ticker())
+        await llm_gateway.chat_completion(MESSAGES)
+        task.cancel()
+
+    asyncio.run(scenario())
+    assert len(ticks) >= 5
+
+
+def test_timeout_frees_the_slot(completions, monkeypatch):
+    monkeypatch.setattr(llm_gateway, "_semaphore", asyncio.Semaphore(1))
+    completions.delay = 1
+
+    async def scenario():
+        with pytest.raises(asyncio.TimeoutError):
+            await llm_gateway.chat_completion(MESSAGES, timeout=0.01)
+        completions.delay = 0
+        return await llm_gateway.chat_completion(MESSAGES, timeout=1)
+
+    assert asyncio.run(scenario()).choices[0].message.content == "{}"
+    assert llm_gateway.get_stats()["in_flight"] == 0
+
+
+def test_backoff_is_exponential_with_full_jitter(monkeypatch):
+    monkeypatch.setattr(llm_gateway, "LLM_BACKOFF_BASE_SECONDS", 1)
+    monkeypatch.setattr(llm_gateway, "LLM_BACKOFF_MAX_SECONDS", 10)
+
+    for attempt, ceiling in [(0, 1), (1, 2), (2, 4), (3, 8), (6, 10)]:
+        delays = [llm_gateway.backoff_delay(attempt) for _ in range(200)]
+        assert all(0 <= delay <= ceiling for delay in delays)
+        # Jittered, not a fixed schedule
+        assert len(set(delays)) > 1
+
+
+def test_generation_retries_a_failed_call(completions, monkeypatch):
+    completions.delay = 0
+    completions.failures = 1
+    completions.content = json.dumps(fake_roadmap_document(3, 1))
+    backoffs = []
+
+    async def backoff(attempt):
+        backoffs.append(attempt)
+
+    monkeypatch.setattr(llm_gateway, "backoff", backoff)
+
+    result = asyncio.run(roadmap_agent.generate_full_roadmap({"skills": "Python"}))
+    assert len(result["learning_roadmap"]["roadmap"]) == 3
+    assert completions.calls == 2
+    assert backoffs == [1]
+
+
+def test_health_reports_the_gateway(client):
+    llm = client.get("/health").json()["llm"]
+    assert llm["max_concurrency"] == llm_gateway.LLM_MAX_CONCURRENCY
+    assert llm["in_flight"] == 0 and llm["queue_depth"] == 0
@@ -0,0 +1,59 @@
+import json
+
+from app.services import career_catalog, roadmap_templates
+from app.services.matching_service import calculate_skill_match, rank_careers_by_skills
+
+PROFILE = {
+    "skills": "Python, SQL, REST APIs, Django",
+    "interests": "Backend development",
+    "goals": "Become a backend developer",
+    "education": "bachelors"
+}
+
+
+def test_batch_scores_agree_with_single_match():
+    careers = {"api": ["Python", "REST APIs", "Docker"], "web": ["JavaScript", "CSS"]}
+    ranked = rank_careers_by_skills(PROFILE["skills"], careers)
+
+    assert [item["career"] for item in ranked] == ["api", "web"]
+    for item in ranked:
+        single = calculate_skill_match(PROFILE["skills"], careers[item["career"]])
+        assert item["match_percentage"] == single["match_percentage"]
+
+
+def test_template_candidates_carry_their_skill_match():
+    candidates = roadmap_templates.candidate_templates(PROFILE)
+
+    assert candidates
+    for template in candidates:
+        outline = roadmap_templates.outline(template)
+        assert 0 <= outline["skill_match_percentage"] <= 100
+
+
+def test_career_index_ranks_the_closest_career_first():
+    index = career_catalog.CareerIndex.load(index_path="/nonexistent/careers.npy")
+    ranked = index.rank(PROFILE, top_k=3)
+
+    assert ranked[0]["career"] == "Python Developer"
+    assert [item["score"] for item in ranked] == sorted((item["score"] for item in ranked), reverse=True)
+    excluded = index.rank(PROFILE, top_k=3, exclude=["Python Developer"])
+    assert "Python Developer" not in [item["career"] for item in excluded]
+
+
+def test_career_index_rebuilds_when_the_catalog_changes(tmp_path):
+    catalog = tmp_path / "careers.json"
+    catalog.write_text(json.dumps({"careers": [
+        {"title": "Python Developer", "demand": "stable", "skills": ["Python", "Django"], "keywords": []},
+        {"title": "Designer", "demand": "stable", "skills": ["Figma"], "keywords": []}
+    ]}))
+    index_path = str(tmp_path / "index.npy")
+    career_catalog.write_index(str(catalog), index_path)
+    assert len(career_catalog.CareerIndex.load(str(catalog), index_path)) == 2
+
+    catalog.write_text(json.dumps({"careers": [
+        {"title": "Designer", "demand": "stable", "skills": ["Figma"], "keywords": []}
+    ]}))
+    index = career_catalog.CareerIndex.load(str(catalog), index_path)
+
+    assert len(index) == 1
+    assert index.matrix.shape[0] == 1
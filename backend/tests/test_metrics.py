@@ -0,0 +1,40 @@
+from app.utils.metrics import Counter, Histogram
+
+
+def test_counter_renders_per_label_set():
+    counter = Counter("test_events_total", "Events", ("kind",))
+    counter.inc(kind="a")
+    counter.inc(2, kind="a")
+    counter.inc(kind='b"c')
+
+    lines = counter.render()
+    assert "# TYPE test_events_total counter" in lines
+    assert 'test_events_total{kind="a"} 3' in lines
+    assert 'test_events_total{kind="b\\"c"} 1' in lines
+
+
+def test_histogram_buckets_are_cumulative():
+    histogram = Histogram("test_seconds", "Latency", ("stage",), buckets=(0.1, 1))
+    for value in (0.05, 0.5, 5):
+        histogram.observe(value, stage="x")
+
+    lines = histogram.render()
+    assert 'test_seconds_bucket{stage="x",le="0.1"} 1' in lines
+    assert 'test_seconds_bucket{stage="x",le="1"} 2' in lines
+    assert 'test_seconds_bucket{stage="x",le="+Inf"} 3' in lines
+    assert 'test_seconds_count{stage="x"} 3' in lines
+
+
+def test_metrics_endpoint_reports_routes_by_template(client, memory_storage):
+    client.get("/api/students/profile")
+    client.get("/api/career/jobs/some-job-id")
+
+    body = client.get("/metrics").text
+
+    assert "# TYPE skillroute_http_request_duration_seconds histogram" in body
+    # Paths are labelled by their route template, not the concrete path
+    assert 'route="/api/career/jobs/{job_id}"' in body
+    assert "some-job-id" not in body
+    assert 'skillroute_http_request_duration_seconds_count{method="GET",route="/api/students/profile",status="200"}' in body
+    # Internal stages are timed too
+    assert 'skillroute_stage_duration_seconds_count{stage="storage.get_student_profile"}' in body
@@ -0,0 +1,73 @@
+import asyncio
+import pytest
+from benchmarks.fakes import fake_roadmap_document
+from app.services import storage_backends, storage_service
+from app.services.storage_backends.memory_backend import MemoryBackend
+from app.services.storage_backends.sqlite_backend import SQLiteBackend
+
+USER_ID = "student-1"
+
+
+@pytest.fixture(params=["memory", "sqlite"])
+def backend(request, tmp_path):
+    previous = storage_backends.get_backend(), storage_backends.get_async_backend()
+    backend = MemoryBackend() if request.param == "memory" else SQLiteBackend(str(tmp_path / "test.db"))
+    storage_backends.set_backend(backend)
+    storage_service._active_roadmap_cache.clear()
+    try:
+        yield backend
+    finally:
+        storage_backends.set_backend(previous[0])
+        storage_backends.set_async_backend(previous[1])
+        storage_service._active_roadmap_cache.clear()
+
+
+def _seed():
+    document = fake_roadmap_document(4, 1)
+    return asyncio.run(storage_service.save_active_roadmap(
+        USER_ID, document["career_decision"], document["learning_roadmap"]
+    ))
+
+
+def _completed(data: dict) -> int:
+    return sum(1 for phase in data["learning_roadmap"]["roadmap"] if phase.get("status") == "completed")
+
+
+def test_concurrent_completes_count_once(backend):
+    _seed()
+
+    async def complete_three_times():
+        return await asyncio.gather(*(
+            storage_service.update_phase_status(USER_ID, 0, "completed") for _ in range(3)
+        ))
+
+    assert asyncio.run(complete_three_times()) == [True, True, True]
+
+    stored, _ = backend.get_active_roadmap(USER_ID)
+    assert _completed(stored) == 1
+    assert stored["progress"]["completed_phases"] == 1
+
+    cached = asyncio.run(storage_service.get_active_roadmap(USER_ID))
+    assert cached["progress"]["completed_phases"] == 1
+
+
+def test_stale_cached_snapshot_is_not_trusted(backend):
+    _seed()
+    asyncio.run(storage_service.get_active_roadmap(USER_ID))
+
+    # Another worker completes phase 0 behind this worker's cache
+    stored, version = backend.get_active_roadmap(USER_ID)
+    backend.update_phase(USER_ID, 0, {"status": "completed", "completed_at": None}, {}, 1, stored["updated_at"], version)
+
+    assert asyncio.run(storage_service.update_phase_status(USER_ID, 0, "completed"))
+
+    stored, _ = backend.get_active_roadmap(USER_ID)
+    assert stored["progress"]["completed_phases"] == 1
+    cached = asyncio.run(storage_service.get_active_roadmap(USER_ID))
+    assert cached["progress"]["completed_phases"] == 1
+
+
+def test_missing_phase_or_roadmap(backend):
+    assert asyncio.run(storage_service.update_phase_status(USER_ID, 0, "completed")) is False
+    _seed()
+    assert asyncio.run(storage_service.update_phase_status(USER_ID, 99, "completed")) is False
@@ -0,0 +1,101 @@
+import asyncio
+from types import SimpleNamespace
+import pytest
+from fastapi import HTTPException
+from app.services import llm_gateway
+from app.utils import rate_limit
+from app.utils.circuit_breaker import llm_unavailable
+from app.utils.rate_limit import MemoryBucketStore, RateLimiter, SQLiteBucketStore
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    now = [1000.0]
+    monkeypatch.setattr(rate_limit.time, "monotonic", lambda: now[0])
+    monkeypatch.setattr(rate_limit.time, "time", lambda: now[0])
+    return now
+
+
+def _check(limiter, key="alice"):
+    try:
+        asyncio.run(limiter.check(key))
+    except HTTPException as e:
+        return e
+    return None
+
+
+@pytest.mark.parametrize("store", ["memory", "sqlite"])
+def test_burst_then_refill(clock, tmp_path, store):
+    store = MemoryBucketStore(100) if store == "memory" else SQLiteBucketStore(str(tmp_path / "rate.db"))
+    limiter = RateLimiter("llm", per_minute=6, burst=2, store=store)
+
+    assert _check(limiter) is None
+    assert _check(limiter) is None
+    rejected = _check(limiter)
+    assert rejected.status_code == 429
+    assert rejected.headers["Retry-After"] == "10"
+    # Other users have their own bucket
+    assert _check(limiter, "bob") is None
+
+    clock[0] += 10
+    assert _check(limiter) is None
+    assert _check(limiter).status_code == 429
+
+
+def test_zero_rate_disables_the_limiter():
+    limiter = RateLimiter("llm", per_minute=0, burst=1, store=MemoryBucketStore(100))
+    assert all(_check(limiter) is None for _ in range(10))
+
+
+def test_sqlite_buckets_are_shared_between_processes(clock, tmp_path):
+    path = str(tmp_path / "rate.db")
+    first = RateLimiter("llm", per_minute=6, burst=2, store=SQLiteBucketStore(path))
+    second = RateLimiter("llm", per_minute=6, burst=2, store=SQLiteBucketStore(path))
+
+    assert _check(first) is None
+    assert _check(second) is None
+    assert _check(first).status_code == 429
+
+
+def test_llm_endpoints_answer_429_when_limited(client, monkeypatch):
+    monkeypatch.setattr(rate_limit, "llm_limiter", RateLimiter("llm", per_minute=6, burst=1, store=MemoryBucketStore(100)))
+
+    # No roadmap yet, so the admitted call is a 404
+    assert client.post("/api/progress/adapt").status_code == 404
+    response = client.post("/api/progress/adapt")
+    assert response.status_code == 429
+    assert int(response.headers["Retry-After"]) >= 1
+
+
+def test_llm_queue_is_bounded(monkeypatch):
+    release = None
+
+    async def create(messages, **kwargs):
+        await release.wait()
+        return SimpleNamespace(choices=[], usage=None)
+
+    monkeypatch.setattr(llm_gateway, "client", SimpleNamespace(chat=SimpleNamespace(completions=SimpleNamespace(create=create))))
+    monkeypatch.setattr(llm_gateway, "record_llm_usage", lambda operation, usage: None)
+    monkeypatch.setattr(llm_gateway, "_semaphore", asyncio.Semaphore(1))
+    monkeypatch.setattr(llm_gateway, "LLM_MAX_QUEUE_DEPTH", 1)
+
+    async def scenario():
+        nonlocal release
+        release = asyncio.Event()
+        running = asyncio.create_task(llm_gateway.chat_completion([]))
+        queued = asyncio.create_task(llm_gateway.chat_completion([]))
+        await asyncio.sleep(0.01)
+        assert llm_gateway.get_stats()["queue_depth"] == 1
+
+        with pytest.raises(llm_gateway.LLMOverloadedError) as error:
+            await llm_gateway.chat_completion([])
+        release.set()
+        await asyncio.gather(running, queued)
+        return error.value
+
+    error = asyncio.run(scenario())
+    response = llm_unavailable(error)
+    assert response.status_code == 503
+    assert response.headers["Retry-After"] == str(llm_gateway.BUSY_RETRY_AFTER_SECONDS)
+    # Rejections are about load, not Groq's health
+    assert llm_gateway.breaker.state == "closed"
@@ -0,0 +1,58 @@
+import logging
+import logging.handlers
+from datetime import datetime, timezone
+import numpy as np
+from pydantic import BaseModel
+from app.utils import log
+from app.utils.responses import ORJSONResponse, dumps
+
+
+class Timestamp(datetime):
+    """Like Firestore's DatetimeWithNanoseconds: a datetime subclass."""
+
+
+class Skill(BaseModel):
+    name: str
+
+
+def test_dumps_handles_storage_and_model_types():
+    value = {
+        "at": Timestamp(2026, 1, 2, 3, 4, 5, tzinfo=timezone.utc),
+        "score": np.float32(0.5),
+        "scores": np.array([1, 2]),
+        "skill": Skill(name="Python"),
+        1: "non-string key"
+    }
+    assert dumps(value) == (
+        b'{"at":"2026-01-02T03:04:05+00:00","score":0.5,"scores":[1,2],"skill":{"name":"Python"},"1":"non-string key"}'
+    )
+
+
+def test_response_is_json():
+    response = ORJSONResponse({"ok": True}, status_code=201)
+    assert response.status_code == 201
+    assert response.media_type == "application/json"
+    assert response.body == b'{"ok":true}'
+
+
+def test_routes_answer_with_orjson(client, memory_storage):
+    response = client.get("/health")
+    assert response.status_code == 200
+    assert response.headers["content-type"] == "application/json"
+    # orjson writes compact JSON
+    assert b": " not in response.content
+
+
+def test_app_logs_go_through_the_queue(capfd):
+    log.stop_logging()
+    log.setup_logging()
+    try:
+        logger = logging.getLogger("app.test")
+        logger.warning("queued %s", "record")
+        # The call only enqueued the record
+        assert isinstance(logging.getLogger("app").handlers[-1], logging.handlers.QueueHandler)
+    finally:
+        # Stopping flushes the queue
+        log.stop_logging()
+        log.setup_logging()
+    assert "WARNING app.test: queued record" in capfd.readouterr().err
@@ -0,0 +1,128 @@
+import asyncio
+import json
+from types import SimpleNamespace
+import pytest
+from benchmarks.fakes import fake_roadmap_document
+from app.services import roadmap_agent, storage_service
+from app.services.roadmap_output import RoadmapOutputError
+from app.services.roadmap_service import adapt_and_save_roadmap
+
+USER_ID = "student-1"
+
+
+@pytest.fixture(autouse=True)
+def delta_mode(monkeypatch):
+    monkeypatch.setattr(roadmap_agent, "ADAPT_MODE", "delta")
+
+
+@pytest.fixture
+def model(fake_groq, monkeypatch):
+    """
+    Records the JSON each adapt call sends. The fake's usual answer (the
+    phases it was sent) is replaced by `model.phases` when a test sets it.
+    """
+    completions = fake_groq.chat.completions
+    model = SimpleNamespace(requests=[], phases=None)
+    content = completions._content
+
+    def answer(messages):
+        model.requests.append(json.loads(messages[1]["content"]))
+        if model.phases is None:
+            return content(messages)
+        return json.dumps({"duration_months": 9, "roadmap": model.phases})
+
+    monkeypatch.setattr(completions, "_content", answer)
+    return model
+
+
+def _seed(completed: int, phases: int = 4) -> dict:
+    document = fake_roadmap_document(phases, 1)
+    asyncio.run(storage_service.save_active_roadmap(USER_ID, document["career_decision"], document["learning_roadmap"]))
+    for index in range(completed):
+        asyncio.run(storage_service.update_phase_status(USER_ID, index, "completed"))
+    return asyncio.run(storage_service.get_active_roadmap(USER_ID))
+
+
+def _new_phases(count: int) -> list:
+    phases = fake_roadmap_document(count, 1)["learning_roadmap"]["roadmap"]
+    return [dict(phase, phase=f"Adapted {i}") for i, phase in enumerate(phases)]
+
+
+def test_no_completed_phases_sends_and_replaces_everything(memory_storage, model):
+    _seed(completed=0)
+
+    adapted = asyncio.run(adapt_and_save_roadmap(USER_ID))
+
+    assert model.requests[0]["completed_phases"] == []
+    assert len(model.requests[0]["remaining_phases"]) == 4
+    assert all("status" not in phase for phase in model.requests[0]["remaining_phases"])
+    assert len(adapted["learning_roadmap"]["roadmap"]) == 4
+    assert adapted["progress"]["completed_phases"] == 0
+
+
+def test_completed_head_is_kept_verbatim(memory_storage, model):
+    before = _seed(completed=2)
+    head = before["learning_roadmap"]["roadmap"][:2]
+    model.phases = _new_phases(2)
+
+    adapted = asyncio.run(adapt_and_save_roadmap(USER_ID))
+
+    # Only summaries of the head go out; the tail goes out in full
+    assert [phase["phase"] for phase in model.requests[0]["completed_phases"]] == [phase["phase"] for phase in head]
+    assert set(model.requests[0]["completed_phases"][0]) == {"phase", "status", "focus_skills"}
+    assert [phase["phase"] for phase in model.requests[0]["remaining_phases"]] == ["Phase 3: Topic 3", "Phase 4: Topic 4"]
+
+    roadmap = adapted["learning_roadmap"]["roadmap"]
+    assert roadmap[:2] == head
+    assert [phase["phase"] for phase in roadmap[2:]] == ["Adapted 0", "Adapted 1"]
+    assert [phase["status"] for phase in roadmap] == ["completed", "completed", "pending", "pending"]
+    assert adapted["progress"]["completed_phases"] == 2
+    assert adapted["progress"]["total_phases"] == 4
+    assert adapted["learning_roadmap"]["duration_months"] == 9
+
+
+def test_all_phases_completed_keeps_the_roadmap(memory_storage, model):
+    before = _seed(completed=4)
+
+    adapted = asyncio.run(adapt_and_save_roadmap(USER_ID))
+
+    assert model.requests[0]["remaining_phases"] == []
+    assert adapted["learning_roadmap"]["roadmap"] == before["learning_roadmap"]["roadmap"]
+    assert adapted["progress"]["completed_phases"] == 4
+
+
+@pytest.mark.parametrize("returned", [1, 3])
+def test_replacement_may_have_a_different_length(memory_storage, model, returned):
+    _seed(completed=2)
+    model.phases = _new_phases(returned)
+
+    adapted = asyncio.run(adapt_and_save_roadmap(USER_ID))
+
+    roadmap = adapted["learning_roadmap"]["roadmap"]
+    assert len(roadmap) == 2 + returned
+    assert [phase["status"] for phase in roadmap[:2]] == ["completed", "completed"]
+    assert adapted["progress"]["total_phases"] == 2 + returned
+    assert adapted["progress"]["completed_phases"] == 2
+
+
+def test_echoed_completed_phases_are_not_duplicated(memory_storage, model):
+    before = _seed(completed=2)
+    # The whole roadmap back, completed phases included
+    model.phases = fake_roadmap_document(4, 1)["learning_roadmap"]["roadmap"]
+
+    adapted = asyncio.run(adapt_and_save_roadmap(USER_ID))
+
+    roadmap = adapted["learning_roadmap"]["roadmap"]
+    assert [phase["phase"] for phase in roadmap] == [phase["phase"] for phase in before["learning_roadmap"]["roadmap"]]
+    assert adapted["progress"]["completed_phases"] == 2
+
+
+def test_no_replacement_for_a_remaining_tail_fails(memory_storage, model, monkeypatch):
+    before = _seed(completed=2)
+    model.phases = []
+    monkeypatch.setattr(roadmap_agent.llm_gateway, "backoff", lambda attempt: asyncio.sleep(0))
+
+    with pytest.raises(RoadmapOutputError):
+        asyncio.run(adapt_and_save_roadmap(USER_ID))
+    # The stored roadmap is left alone
+    assert asyncio.run(storage_service.get_active_roadmap(USER_ID)) == before
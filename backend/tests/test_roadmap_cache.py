@@ -0,0 +1,44 @@
+import asyncio
+import json
+from types import SimpleNamespace
+import pytest
+from benchmarks.fakes import fake_roadmap_document
+from app.services import llm_gateway, roadmap_agent
+from app.services.roadmap_cache import education_bucket, profile_cache_key
+
+PROFILE = {
+    "name": "Ada Example",
+    "education": "bachelors",
+    "skills": "Python, SQL",
+    "interests": "Backend development",
+    "goals": "Become a backend developer",
+    "experience": None
+}
+
+
+@pytest.mark.parametrize("education, bucket", [
+    ("High School Diploma", "high_school"),
+    ("Secondary school", "high_school"),
+    ("Diploma in Web Development", "bootcamp"),
+    ("B.Tech Computer Science", "bachelors"),
+    ("MSc Data Science", "masters"),
+])
+def test_education_bucket(education, bucket):
+    assert education_bucket(education) == bucket
+
+
+def test_name_is_neither_keyed_nor_prompted(monkeypatch):
+    assert profile_cache_key(PROFILE) == profile_cache_key({**PROFILE, "name": "Someone Else"})
+
+    prompts = []
+
+    async def chat_completion(messages, **kwargs):
+        prompts.append(messages[-1]["content"])
+        content = json.dumps(fake_roadmap_document(3, 1))
+        return SimpleNamespace(choices=[SimpleNamespace(message=SimpleNamespace(content=content))])
+
+    monkeypatch.setattr(llm_gateway, "chat_completion", chat_completion)
+    asyncio.run(roadmap_agent.generate_full_roadmap(PROFILE))
+
+    assert prompts and all("Ada Example" not in prompt for prompt in prompts)
+    assert json.loads(prompts[0])["skills"] == PROFILE["skills"]
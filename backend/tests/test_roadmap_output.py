@@ -0,0 +1,94 @@
+import asyncio
+import json
+from types import SimpleNamespace
+import pytest
+from benchmarks.fakes import fake_roadmap_document
+from app.services import llm_gateway
+from app.services.roadmap_output import RoadmapOutputError, validate_learning_roadmap, validate_roadmap
+
+
+def completion(value) -> SimpleNamespace:
+    content = value if isinstance(value, str) else json.dumps(value)
+    return SimpleNamespace(choices=[SimpleNamespace(message=SimpleNamespace(content=content))])
+
+
+@pytest.fixture
+def repairs(monkeypatch):
+    """Records repair requests; the test sets `repairs.reply` to answer them."""
+    repairs = SimpleNamespace(sections=[], reply=lambda request: pytest.fail(f"unexpected repair of {request['section']}"))
+
+    async def chat_completion(messages, **kwargs):
+        request = json.loads(messages[-1]["content"])
+        repairs.sections.append(request["section"])
+        return completion(repairs.reply(request))
+
+    monkeypatch.setattr(llm_gateway, "chat_completion", chat_completion)
+    return repairs
+
+
+def test_valid_output_is_not_repaired(repairs):
+    document = fake_roadmap_document(3, 1)
+    result = asyncio.run(validate_roadmap(json.dumps(document), "generate"))
+
+    assert result["career_decision"]["career"] == "Backend Developer"
+    assert len(result["learning_roadmap"]["roadmap"]) == 3
+    assert repairs.sections == []
+
+
+def test_fence_inside_a_string_does_not_fail_validation(repairs):
+    document = fake_roadmap_document(2, 1)
+    document["learning_roadmap"]["roadmap"][0]["outcomes"] = ["Run ```pytest -q``` before every commit"]
+    result = asyncio.run(validate_roadmap(json.dumps(document), "generate"))
+
+    assert result["learning_roadmap"]["roadmap"][0]["outcomes"] == ["Run ```pytest -q``` before every commit"]
+    assert repairs.sections == []
+
+
+def test_only_the_invalid_phase_is_sent_for_repair(repairs):
+    document = fake_roadmap_document(3, 1)
+    good = dict(document["learning_roadmap"]["roadmap"][1])
+    del document["learning_roadmap"]["roadmap"][1]["phase"]
+    repairs.reply = lambda request: good
+
+    result = asyncio.run(validate_roadmap(json.dumps(document), "generate"))
+
+    assert repairs.sections == ["learning_roadmap.roadmap[1]"]
+    assert result["learning_roadmap"]["roadmap"][1]["phase"] == good["phase"]
+
+
+def test_truncated_last_phase_is_completed(repairs):
+    document = fake_roadmap_document(3, 1)
+    content = json.dumps(document)
+    last_phase = document["learning_roadmap"]["roadmap"][-1]
+    # Cut off inside the last phase's milestones
+    content = content[:content.rindex('"estimated_hours"')]
+    repairs.reply = lambda request: last_phase
+
+    result = asyncio.run(validate_roadmap(content, "generate"))
+
+    assert repairs.sections == ["learning_roadmap.roadmap[2]"]
+    assert result["learning_roadmap"]["roadmap"][-1] == last_phase
+
+
+def test_unrepairable_output_raises(repairs):
+    with pytest.raises(RoadmapOutputError):
+        asyncio.run(validate_roadmap("Sorry, I can't help with that.", "generate"))
+
+    document = fake_roadmap_document(2, 1)
+    del document["learning_roadmap"]["roadmap"][0]["phase"]
+    repairs.reply = lambda request: {"still": "broken"}
+    with pytest.raises(RoadmapOutputError):
+        asyncio.run(validate_roadmap(json.dumps(document), "generate"))
+
+
+def test_learning_roadmap_falls_back_to_the_given_duration(repairs):
+    learning_roadmap = fake_roadmap_document(2, 1)["learning_roadmap"]
+    del learning_roadmap["duration_months"]
+
+    result = asyncio.run(validate_learning_roadmap(json.dumps(learning_roadmap), "adapt", duration_months=6))
+    assert result["duration_months"] == 6
+
+    empty = asyncio.run(validate_learning_roadmap('{"roadmap": []}', "adapt", duration_months=6, allow_empty=True))
+    assert empty["roadmap"] == []
+    with pytest.raises(RoadmapOutputError):
+        asyncio.run(validate_learning_roadmap('{"roadmap": []}', "adapt", duration_months=6))
@@ -0,0 +1,100 @@
+import json
+import pytest
+from benchmarks.fakes import fake_roadmap_document
+from app.config import ROADMAP_TEMPLATES_ENABLED
+from app.services import llm_gateway, roadmap_agent
+from app.utils.json_stream import IncrementalJSONParser
+
+PROFILE = {
+    "name": "Test Student",
+    "education": "bachelors",
+    "skills": "Python, SQL, REST APIs",
+    "interests": "Backend development, databases",
+    "goals": "Become a backend developer"
+}
+
+
+@pytest.fixture
+def open_circuit():
+    llm_gateway.breaker._open()
+    try:
+        yield
+    finally:
+        llm_gateway.breaker._close()
+
+
+@pytest.mark.skipif(not ROADMAP_TEMPLATES_ENABLED, reason="needs roadmap templates")
+def test_stream_serves_degraded_roadmap_when_circuit_is_open(client, open_circuit):
+    response = client.post("/api/career/roadmap/stream?use_cache=false", json=PROFILE)
+
+    assert response.status_code == 200
+    assert "event: error" not in response.text
+    assert "event: complete" in response.text
+    assert '"degraded":true' in response.text
+
+
+def test_generate_and_stream_agree_when_circuit_is_open(client, open_circuit):
+    generated = client.post("/api/career/roadmap?use_cache=false", json=PROFILE)
+    streamed = client.post("/api/career/roadmap/stream?use_cache=false", json=PROFILE)
+
+    assert generated.status_code == 200
+    assert generated.json()["degraded"] is True
+    assert '"degraded":true' in streamed.text
+
+
+def _parse_in_chunks(text: str, size: int) -> list:
+    parser = IncrementalJSONParser(roadmap_agent._is_stream_section)
+    sections = []
+    for start in range(0, len(text), size):
+        sections += parser.feed(text[start:start + size])
+    return sections
+
+
+@pytest.mark.parametrize("size", [1, 7, 64, 100000])
+def test_parser_emits_each_section_once_whatever_the_chunking(size):
+    document = fake_roadmap_document(3, 1)
+    # Brackets, quotes and escapes inside strings are content
+    document["career_decision"]["reasoning"] = 'Likes {braces}, [brackets] and "quotes" \\ too'
+    text = "```json\n" + json.dumps(document) + "\n```"
+
+    sections = _parse_in_chunks(text, size)
+
+    assert sections == [
+        (("career_decision",), document["career_decision"]),
+        *((("learning_roadmap", "roadmap", i), phase) for i, phase in enumerate(document["learning_roadmap"]["roadmap"]))
+    ]
+
+
+def _sse_events(text: str) -> list:
+    events = []
+    for block in text.strip().split("\n\n"):
+        lines = dict(line.split(": ", 1) for line in block.splitlines())
+        events.append((lines["event"], json.loads(lines["data"])))
+    return events
+
+
+def test_stream_sends_sections_then_the_saved_result(client, memory_storage, fake_groq, monkeypatch):
+    monkeypatch.setattr(roadmap_agent, "ROADMAP_TEMPLATES_ENABLED", False)
+
+    response = client.post("/api/career/roadmap/stream?use_cache=false", json=PROFILE)
+
+    assert response.headers["content-type"].startswith("text/event-stream")
+    events = _sse_events(response.text)
+    assert [event for event, _ in events] == ["career_decision", "phase", "phase", "phase", "phase", "complete"]
+    assert [data["index"] for event, data in events if event == "phase"] == [0, 1, 2, 3]
+
+    complete = events[-1][1]
+    assert complete["degraded"] is False
+    assert complete["time_to_first_phase_ms"] is not None
+    saved = client.get("/api/career/roadmap").json()
+    assert saved["learning_roadmap"]["roadmap"] == complete["learning_roadmap"]["roadmap"]
+
+
+def test_stream_reports_unusable_output_as_an_error_event(client, memory_storage, fake_groq, monkeypatch):
+    monkeypatch.setattr(roadmap_agent, "ROADMAP_TEMPLATES_ENABLED", False)
+    monkeypatch.setattr(fake_groq.chat.completions, "_content", lambda messages: "I can't do that")
+
+    events = _sse_events(client.post("/api/career/roadmap/stream?use_cache=false", json=PROFILE).text)
+
+    assert [event for event, _ in events] == ["error"]
+    assert client.get("/api/career/roadmap").json() == {"message": "No active roadmap found"}
@@ -0,0 +1,98 @@
+import asyncio
+import pytest
+from benchmarks.fakes import fake_roadmap_document
+from app.config import ROADMAP_TEMPLATES_ENABLED
+from app.services import roadmap_agent, roadmap_cache, roadmap_templates
+from app.services.roadmap_templates import apply_patch, template_from_roadmap
+from app.utils.cache import TTLCache
+
+TEMPLATE = template_from_roadmap("Backend Developer", fake_roadmap_document(4, 1)["learning_roadmap"], version=3)
+PROFILE = {
+    "name": "Test Student",
+    "education": "bachelors",
+    "skills": "Python, SQL, REST APIs, Django",
+    "interests": "Backend development",
+    "goals": "Become a backend developer"
+}
+
+
+def _titles(learning_roadmap: dict) -> list:
+    return [phase["phase"] for phase in learning_roadmap["roadmap"]]
+
+
+def test_template_from_roadmap_strips_numbering_and_state():
+    roadmap = fake_roadmap_document(2, 1)["learning_roadmap"]
+    roadmap["roadmap"][0]["status"] = "completed"
+    template = template_from_roadmap("Backend Developer", roadmap)
+
+    assert template["id"] == "backend-developer"
+    assert [phase["title"] for phase in template["phases"]] == ["Topic 1", "Topic 2"]
+    assert "status" not in template["phases"][0]
+
+
+def test_empty_patch_keeps_the_template():
+    learning_roadmap = apply_patch(TEMPLATE, None)
+
+    assert _titles(learning_roadmap) == [f"Phase {i}: Topic {i}" for i in range(1, 5)]
+    assert learning_roadmap["duration_months"] == TEMPLATE["duration_months"]
+    assert learning_roadmap["template"] == {"id": "backend-developer", "version": 3}
+
+
+def test_patch_reorders_skips_and_retimes():
+    patch = {"order": [2, 0], "skip": [1], "durations": {"2": "1 week"}, "difficulty": {"0": "advanced"}, "duration_months": 4}
+    learning_roadmap = apply_patch(TEMPLATE, patch)
+
+    assert _titles(learning_roadmap) == ["Phase 1: Topic 3", "Phase 2: Topic 1", "Phase 3: Topic 4"]
+    assert learning_roadmap["roadmap"][0]["duration"] == "1 week"
+    assert learning_roadmap["roadmap"][1]["difficulty"] == "advanced"
+    assert learning_roadmap["duration_months"] == 4
+    # The template itself is untouched
+    assert TEMPLATE["phases"][2]["duration"] == "4-6 weeks"
+
+
+@pytest.mark.parametrize("patch", [
+    {"skip": [0, 1, 2, 3]},
+    {"order": ["x", 99, -1, None], "durations": {"0": 5}, "difficulty": {"0": "expert"}, "duration_months": True},
+])
+def test_invalid_patch_entries_are_ignored(patch):
+    learning_roadmap = apply_patch(TEMPLATE, patch)
+
+    assert len(learning_roadmap["roadmap"]) == 4
+    assert learning_roadmap["roadmap"][0]["duration"] == "4-6 weeks"
+    assert learning_roadmap["roadmap"][0]["difficulty"] == "intermediate"
+
+
+@pytest.mark.skipif(not ROADMAP_TEMPLATES_ENABLED, reason="needs roadmap templates")
+def test_generation_personalizes_a_template_in_one_small_call(fake_groq, monkeypatch):
+    monkeypatch.setattr(roadmap_cache, "_cache", TTLCache(maxsize=10, ttl=60))
+    candidates = roadmap_templates.candidate_templates(PROFILE)
+    assert candidates
+
+    result = asyncio.run(roadmap_agent.generate_roadmap(PROFILE, use_cache=False))
+
+    # The fake picks the first candidate and skips its first phase
+    chosen = candidates[0]
+    assert result["career_decision"]["career"] == chosen["career"]
+    assert result["learning_roadmap"]["template"]["id"] == chosen["id"]
+    assert len(result["learning_roadmap"]["roadmap"]) == len(chosen["phases"]) - 1
+    assert fake_groq.chat.completions.calls == 1
+
+
+@pytest.mark.skipif(not ROADMAP_TEMPLATES_ENABLED, reason="needs roadmap templates")
+def test_unknown_template_choice_falls_back_to_full_generation(fake_groq, monkeypatch):
+    monkeypatch.setattr(roadmap_cache, "_cache", TTLCache(maxsize=10, ttl=60))
+    completions = fake_groq.chat.completions
+    content = completions._content
+
+    def answer(messages):
+        if "Personalizer" in messages[0]["content"]:
+            return '{"career_decision": {"career": "X", "reasoning": "r", "confidence": 50}, "template_id": "nope"}'
+        return content(messages)
+
+    monkeypatch.setattr(completions, "_content", answer)
+
+    result = asyncio.run(roadmap_agent.generate_roadmap(PROFILE, use_cache=False))
+
+    assert "template" not in result["learning_roadmap"]
+    assert len(result["learning_roadmap"]["roadmap"]) == 4
+    assert completions.calls == 2
@@ -0,0 +1,96 @@
+import asyncio
+import pytest
+from benchmarks.fakes import fake_roadmap_document
+from app.services import storage_service
+from app.services.roadmap_service import adapt_and_save_roadmap, generate_and_save_roadmap
+from app.utils.singleflight import SingleFlight
+
+PROFILE = {
+    "name": "Test Student",
+    "education": "bachelors",
+    "skills": "Python, SQL",
+    "interests": "Backend development",
+    "goals": "Become a backend developer"
+}
+
+
+def test_concurrent_calls_with_one_key_run_once():
+    flights = SingleFlight("test")
+    runs = []
+
+    async def work(key):
+        runs.append(key)
+        await asyncio.sleep(0.01)
+        return f"result {key}"
+
+    async def scenario():
+        results = await asyncio.gather(*(flights.do(key, work, key) for key in ["a", "a", "a", "b"]))
+        assert flights.in_flight() == 0
+        # Finished calls aren't reused
+        await flights.do("a", work, "a")
+        return results
+
+    assert asyncio.run(scenario()) == ["result a", "result a", "result a", "result b"]
+    assert runs == ["a", "b", "a"]
+
+
+def test_errors_reach_every_caller():
+    flights = SingleFlight("test")
+
+    async def work():
+        await asyncio.sleep(0.01)
+        raise ValueError("boom")
+
+    async def scenario():
+        return await asyncio.gather(*(flights.do("key", work) for _ in range(3)), return_exceptions=True)
+
+    assert [type(result) for result in asyncio.run(scenario())] == [ValueError] * 3
+
+
+def test_a_cancelled_caller_does_not_cancel_the_others():
+    flights = SingleFlight("test")
+
+    async def work():
+        await asyncio.sleep(0.02)
+        return "done"
+
+    async def scenario():
+        first = asyncio.create_task(flights.do("key", work))
+        second = asyncio.create_task(flights.do("key", work))
+        await asyncio.sleep(0.005)
+        first.cancel()
+        return await second
+
+    assert asyncio.run(scenario()) == "done"
+
+
+def _calls(fake_groq) -> int:
+    return fake_groq.chat.completions.calls
+
+
+def test_duplicate_generations_share_one_completion(memory_storage, fake_groq):
+    async def scenario():
+        return await asyncio.gather(
+            *(generate_and_save_roadmap("student-1", PROFILE, use_cache=False) for _ in range(4)),
+            generate_and_save_roadmap("student-2", PROFILE, use_cache=False)
+        )
+
+    results = asyncio.run(scenario())
+
+    assert all(result == results[0] for result in results[:4])
+    # One call for student-1 and one for student-2 (a template choice or a
+    # full generation each)
+    assert _calls(fake_groq) == 2
+
+
+def test_duplicate_adapts_share_one_completion(memory_storage, fake_groq):
+    document = fake_roadmap_document(4, 1)
+    asyncio.run(storage_service.save_active_roadmap("student-1", document["career_decision"], document["learning_roadmap"]))
+
+    async def scenario():
+        return await asyncio.gather(*(adapt_and_save_roadmap("student-1") for _ in range(3)))
+
+    results = asyncio.run(scenario())
+
+    assert results[0] is not None and all(result == results[0] for result in results)
+    assert _calls(fake_groq) == 1
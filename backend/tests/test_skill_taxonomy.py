@@ -0,0 +1,75 @@
+import pytest
+from app.services.skill_taxonomy import SkillTaxonomy, get_taxonomy, parse_skills, skill_key
+
+DOCUMENT = {
+    "skills": [
+        {"id": "sql", "name": "SQL", "aliases": ["structured query language"]},
+        {"id": "postgresql", "name": "PostgreSQL", "aliases": ["postgres"]},
+        {"id": "mysql", "name": "MySQL"},
+        {"id": "nodejs", "name": "Node.js", "aliases": ["node"]},
+    ],
+    "related": [["sql", "postgresql", 0.8], ["postgresql", "mysql", 0.8], ["sql", "nodejs", 0.1]]
+}
+
+
+@pytest.fixture
+def taxonomy():
+    return SkillTaxonomy(DOCUMENT)
+
+
+@pytest.mark.parametrize("a, b", [("Node.js", "node js"), ("NodeJS", "nodejs"), ("C++", "c++")])
+def test_skill_keys_ignore_spelling(a, b):
+    assert skill_key(a) == skill_key(b)
+
+
+def test_c_variants_stay_distinct():
+    assert len({skill_key("C"), skill_key("C++"), skill_key("C#")}) == 3
+
+
+@pytest.mark.parametrize("skills, parsed", [
+    ("Python, React;SQL | Go", ["Python", "React", "SQL", "Go"]),
+    (["Python", " ", None], ["Python"]),
+    ({"Python": "advanced", "SQL": "beginner"}, ["Python", "SQL"]),
+    (None, []),
+])
+def test_parse_skills(skills, parsed):
+    assert parse_skills(skills) == parsed
+
+
+def test_aliases_resolve_to_the_canonical_skill(taxonomy):
+    assert taxonomy.canonical_name("postgres") == "PostgreSQL"
+    assert taxonomy.canonical_name("Structured Query Language") == "SQL"
+    assert taxonomy.resolve("Rust") is None
+
+
+def test_match_credits_transferable_skills(taxonomy):
+    result = taxonomy.match(["Postgres", "Rust"], ["SQL", "MySQL", "Node.js", "rust", "Go"])
+
+    assert result["matched_skills"] == ["rust"]
+    assert result["transferable_skills"] == [
+        {"skill": "SQL", "from": "PostgreSQL", "strength": 0.8},
+        {"skill": "MySQL", "from": "PostgreSQL", "strength": 0.8},
+    ]
+    # Links weaker than TRANSFER_MIN_STRENGTH don't count
+    assert result["missing_skills"] == ["Node.js", "Go"]
+    assert result["match_percentage"] == int((1 + 0.8 + 0.8) / 5 * 100)
+
+
+def test_duplicates_and_aliases_count_once(taxonomy):
+    result = taxonomy.match(["SQL"], ["SQL", "sql", "structured query language"])
+    assert result == {"match_percentage": 100, "matched_skills": ["SQL"], "missing_skills": [], "transferable_skills": []}
+
+
+def test_batch_score_agrees_with_match(taxonomy):
+    requirements = [["SQL", "MySQL"], ["Node.js", "Go"], []]
+    scores = taxonomy.score(["postgres", "go"], taxonomy.requirement_matrix(requirements))
+
+    assert [round(float(score)) for score in scores] == [
+        taxonomy.match(["postgres", "go"], required)["match_percentage"] for required in requirements
+    ]
+
+
+def test_shipped_taxonomy_loads():
+    taxonomy = get_taxonomy()
+    assert len(taxonomy) > 0
+    assert taxonomy.canonical_name("reactjs") == "React"
@@ -0,0 +1,18 @@
+import os
+import subprocess
+import sys
+
+BACKEND = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def test_importing_the_app_leaves_heavy_modules_to_warmup():
+    # A fresh interpreter: the test session has imported everything already
+    code = (
+        "import sys, app.main; "
+        "print(','.join(m for m in ('numpy', 'groq', 'firebase_admin') if m in sys.modules))"
+    )
+    result = subprocess.run(
+        [sys.executable, "-c", code], cwd=BACKEND, env={**os.environ, "STARTUP_WARMUP": "false"},
+        capture_output=True, text=True, check=True
+    )
+    assert result.stdout.strip() == ""
@@ -0,0 +1,57 @@
+import sqlite3
+import pytest
+from app.services.storage_backends.base import VersionConflict
+from app.services.storage_backends.memory_backend import MemoryBackend
+from app.services.storage_backends.sqlite_backend import SQLiteBackend
+
+USER_ID = "student-1"
+PHASE = {"status": "completed"}
+PROGRESS = {"overall_progress": 100}
+
+
+def _roadmap(career: str) -> dict:
+    return {
+        "career_decision": {"career": career},
+        "learning_roadmap": {"roadmap": [{"phase": "One"}]},
+        "progress": {"completed_phases": 0}
+    }
+
+
+@pytest.fixture(params=["memory", "sqlite"])
+def backend(request, tmp_path):
+    return MemoryBackend() if request.param == "memory" else SQLiteBackend(str(tmp_path / "test.db"))
+
+
+def test_versions_are_not_reused_after_delete(backend):
+    stale = backend.set_active_roadmap(USER_ID, _roadmap("Old"))
+    assert backend.delete_active_roadmap(USER_ID)
+    fresh = backend.set_active_roadmap(USER_ID, _roadmap("New"))
+
+    assert fresh != stale
+    # A client still holding the deleted roadmap's version must not win
+    with pytest.raises(VersionConflict):
+        backend.replace_active_roadmap(USER_ID, _roadmap("Old"), stale)
+    with pytest.raises(VersionConflict):
+        backend.update_phase(USER_ID, 0, PHASE, PROGRESS, 1, "now", stale)
+    assert backend.get_active_roadmap(USER_ID) == (_roadmap("New"), fresh)
+
+
+def test_every_write_moves_the_version(backend):
+    versions = [backend.set_active_roadmap(USER_ID, _roadmap("A"))]
+    versions.append(backend.replace_active_roadmap(USER_ID, _roadmap("B"), versions[-1]))
+    versions.append(backend.merge_active_roadmap(USER_ID, lambda data: data)[1])
+    versions.append(backend.update_phase(USER_ID, 0, PHASE, PROGRESS, 1, "now", versions[-1]))
+
+    assert len(set(versions)) == len(versions)
+    assert backend.get_active_roadmap(USER_ID)[1] == versions[-1]
+
+
+def test_sqlite_counter_continues_from_existing_rows(tmp_path):
+    path = str(tmp_path / "test.db")
+    # A database written before the counter table existed
+    with sqlite3.connect(path) as conn:
+        conn.execute("CREATE TABLE active_roadmaps (user_id TEXT PRIMARY KEY, data TEXT NOT NULL, version INTEGER NOT NULL)")
+        conn.execute("INSERT INTO active_roadmaps VALUES (?, '{}', 7)", (USER_ID,))
+
+    backend = SQLiteBackend(path)
+    assert backend.replace_active_roadmap(USER_ID, _roadmap("A"), 7) == 8